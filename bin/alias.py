@@ -8,7 +8,6 @@
 
 import os
 import sys
-import shutil as st
 import typing as ty
 
 # Add src\\core to sys.path
@@ -36,223 +35,56 @@ ERR_NOALIASFL       = 120
 ERR_NOSUCHALIAS     = 121
 
 
-def createAlias(aliasTxtFl: str, aliasTmpFl: str, args: dict[int, str],
-                cmd: str) -> int:
+def createAlias(args: dict[int, str]) -> int:
     """
-    Creates an alias.
-    > param aliasTxtFl: Path of alias file
-    > param aliasTmpFl: Path of temporary alias file
+    Creates an alias, or replaces the alias of the same name. Only the change
+    is written, to the alias journal (ref. AliasStore in
+    src\\core\\commons.py).
     > param args: Arguments suppiled to the command
-    > param opts: Options supplied to the command
     > return: Error code (ref. src\\errCodes.txt)
     """
-
-    # One of the most inefficient pieces of code I have ever written. Don't
-    # know how to make it better.
-
-    nm    = args[sorted(args)[0]]
-    cmd   = args[sorted(args)[1]]
-    ln    = ''
-    found = False, -1
+    nm  = args[sorted(args)[0]]
+    cmd = args[sorted(args)[1]]
 
     if not comm.PARAMOK(nm):
         comm.ERR(f"Invalid alias name: '{nm}'", sl=4)
         return ERR_INVALIASNM
 
-    # Try to locate alias if it already exists
-    with open(aliasTxtFl, 'r', buffering=1) as f:
-        for j, ln in enumerate(f):
-            if ln.isspace() or ln == '':
-                continue
-
-            parts = ln.removesuffix('\n').partition('=')
-            if not comm.PARAMOK(parts[0]):
-                comm.WARN(f"Invalid alias name in alias file: '{parts[0]}'",
-                          sl=4)
-                continue
-
-            if nm.lower() == parts[0].lower():
-                found = True, j
-                break
-
-    # If alias already exists, update it
-    if found[0]:
-        try:
-            st.copyfile(aliasTxtFl, aliasTmpFl)
-
-            with (open(aliasTmpFl, 'r', buffering=1) as g,
-                  open(aliasTxtFl, 'w', buffering=1) as f):
-                for i, ln in enumerate(g):
-                    if i != found[1]:
-                        f.write(ln)
-                    else:
-                        f.write(f"{nm}={cmd}\n")
-
-            os.remove(aliasTmpFl)
-
-        except PermissionError:
-            comm.ERR(f"Access is denied either to modify \"{aliasTxtFl}\" or read temporary file \"{aliasTmpFl}\"",
-                     sl=4)
-            return comm.ERR_PERMDENIED
-
-    # Else, create new alias (specified alias was not found in alias file)
-    else:
-        with open(aliasTxtFl, "a+", buffering=1) as f:
-            if isinstance((prevChar := comm.RDPREVCHAR(f)), Exception):
-                # Enna da inga ezutharathu
-                comm.UNERR(prevChar, str(Exception))
-                return comm.ERR_UNKNOWN
-            f.write("{}{}={}\n".format(
-                '\n' if prevChar not in ('\n', '') else '',
-                nm,
-                cmd
-            ))
-
-    return comm.ERR_SUCCESS
-
-
-def getAliases(aliasFl: str, args: dict[int, str]) -> int:
-    """
-    Gets an alias from the alias file.
-    > param aliasFl: Path of alias file
-    > param arg: Argument(s) supplied to the command
-    > return: Error code (ref. src\\errCodes.txt)
-    """
-    with open(aliasFl, 'r', buffering=1) as f:
-        for i, line in enumerate(f):
-            if not line or line.isspace():
-                continue
-
-            for arg in args.values():
-                res = extrAlias(arg, line)
-                if isinstance(res, tuple):
-                    print(f"'{res[0]}'={res[1]}'")
-                    break
-                elif res == '':
-                    continue
-                elif res == "invName":
-                    comm.WARN(f"Invalid alias name: '{arg}'", sl=4)
-                elif res == "invLn":
-                    comm.WARN(f"Cannot parse line {i + 1} in alias file", sl=4)
+    try:
+        comm.ALIASSTORE.set(nm, cmd)
+    except PermissionError:
+        comm.ERR(f"Access is denied: \"{comm.ALIASJNL}\"", sl=4)
+        return comm.ERR_PERMDENIED
 
     return comm.ERR_SUCCESS
 
 
-def rmAliases(aliasTxtFl: str, aliasTmpFl: str, args: dict[int, str]) -> int:
+def rmAliases(args: dict[int, str]) -> int:
     """
-    Removes an alias, given the arguments supplied to the function, and the
-    command name.
-    > param aliasTxtFl: Path of alias file
-    > param aliasTmpFl: Path of temporary alias file
+    Removes aliases, given the arguments supplied to the function.
     > param args: The arguments supplied to the command
     > return: Error code (ref. src\\errCodes.txt)
     """
+    err = comm.ERR_SUCCESS
+
     if not args:
         # Don't think this is ever going to execute :)
         comm.ERR("What do you want to remove? Your head?", sl=4)
         return ERR_NOALIASTORM
 
-    try:
-        st.copyfile(aliasTxtFl, aliasTmpFl)
-    except PermissionError:
-        comm.ERR(f"Access is denied: {aliasTmpFl}", sl=4)
-        return comm.ERR_PERMDENIED
-
-    try:
-        with open(aliasTxtFl, 'w') as g, open(aliasTmpFl, 'r') as f:
-            # TODO: Maybe can be improved by providing an error message
-            # when the alias is not found.
-            for i, line in enumerate(f):
-                if not line or line.isspace():
-                    continue
-
-                found = False
-                for arg in args.values():
-                    res = extrAlias(arg, line)
-                    if isinstance(res, tuple):
-                        found = True
-                        break
-                    elif res == '':
-                        continue
-                    elif res == "invName":
-                        comm.WARN(f"Invalid alias name: '{arg}'", sl=4)
-                    elif res == "invLn":
-                        comm.WARN(f"Invalid alias at line {i + 1}", sl=4)
-
-                g.write(line) if not found else None
-
-        os.remove(aliasTmpFl)
-
-    except FileNotFoundError:
-        pass
-
-    except PermissionError:
-        comm.ERR(f"Access is denied: Alias file \"{aliasTxtFl}\" or "
-                 f"temporary file \"{aliasTmpFl}\"", sl=4)
-        return comm.ERR_PERMDENIED
-
-    return comm.ERR_SUCCESS
-
-def rdAliases(aliasTxtFl: str) -> tuple[list[tuple[str, str]], int]:
-    """
-    Read aliases from alias file.
-    > param aliasTxtFl: Path of alias file
-    > return: Error code (ref. src\\errCodes.txt)
-    """
-    try:
-        allAliases = []
-
-        with open(aliasTxtFl, 'r', buffering=1) as f:
-            for i, line in enumerate(f):
-                if not line.removesuffix('\n'):
-                    continue
-
-                parts = line.partition('=')
-                res   = extrAlias(parts[0], line)
-
-                if isinstance(res, tuple):
-                    allAliases.append(res)
-                    continue
-                elif res == '':
-                    continue
-                elif res == "emptyLn":
-                    pass
-                elif res == "invLn":
-                    comm.WARN(f"Invalid alias line at line {i + 1}", sl=4)
-                elif res == "invName":
-                    comm.WARN(f"Invalid alias name at line {i + 1}: '{parts[0]}'",
-                              sl=4)
-
-        return allAliases, comm.ERR_SUCCESS
-
-    except FileNotFoundError:
-        comm.ERR("No alias file found", sl=4)
-        return [], ERR_NOALIASFL
-
-    except PermissionError:
-        comm.ERR(F"Access is denied to alias file: {aliasTxtFl}", sl=4)
-        return [], comm.ERR_PERMDENIED
-
+    for arg in args.values():
+        if not comm.PARAMOK(arg):
+            comm.WARN(f"Invalid alias name: '{arg}'", sl=4)
+            continue
+        try:
+            if not comm.ALIASSTORE.remove(arg):
+                comm.ERR(f"No such alias: '{arg}'", sl=4)
+                err = err or ERR_NOSUCHALIAS
+        except PermissionError:
+            comm.ERR(f"Access is denied: \"{comm.ALIASJNL}\"", sl=4)
+            return comm.ERR_PERMDENIED
 
-def extrAlias(word: str, line: str) \
-        -> tuple[str, str] | str:
-    """
-    Check if alias name is present in a string.
-    > param word: Alias to be searched for
-    > param line: String to conduct the search on
-    > return: True if alias name (param "word") is present in the string
-              (param "line"), else False
-    """
-    if line == '' or line.isspace():
-        return "emptyLn"
-    parts = line.removesuffix('\n').partition('=')
-    if parts[1] == '':
-        return "invLn"
-    if not comm.PARAMOK(parts[0]):
-        return "invName"
-    if parts[0].lower() == word.lower():
-        return parts[0], parts[2]
-    return ''
+    return err
 
 
 def ALIAS(varTable: dict[str, str], origPth: str, prevErr: int, cmd: str,
@@ -273,8 +105,6 @@ def ALIAS(varTable: dict[str, str], origPth: str, prevErr: int, cmd: str,
     > return: Error code (ref. src\\errCodes.txt)
     """
     try:
-        aliasTxtFl      = os.path.join(origPth, "_aliases.txt")
-        aliasTmpFl      = os.path.join(origPth, "bin", "_aliases.tmp")
         validOpts       = {'r', 's', 'h',
                            "-remove", "-set", "-help"}
         optVals         = comm.LOWERLT(opts.values())
@@ -308,24 +138,22 @@ def ALIAS(varTable: dict[str, str], origPth: str, prevErr: int, cmd: str,
             if not args:
                 comm.ERR("Incorrect format")
                 return comm.ERR_INCFORMAT
-            return rmAliases(aliasTxtFl, aliasTmpFl, args)
+            return rmAliases(args)
         elif setAlias:
             if len(args) != 2:
                 print(len(args), args)
                 comm.ERR("Incorrect format")
                 return comm.ERR_INCFORMAT
-            return createAlias(aliasTxtFl, aliasTmpFl, args, cmd)
+            return createAlias(args)
 
-        allAliases = rdAliases(aliasTxtFl)
-        if allAliases[1] != 0:
-            return allAliases[1]
+        allAliases = comm.ALIASSTORE.aliases
 
         # No arg: print all aliases
         if not args:
-            if allAliases[0]:
+            if allAliases:
                 print(
-                    *(f"{green}{alias[0]}{reset}='{alias[1]}'"
-                    for alias in allAliases[0]),
+                    *(f"{green}{alias}{reset}='{allAliases[alias]}'"
+                    for alias in allAliases),
                     sep='\n'
                 )
             return comm.ERR_SUCCESS
@@ -333,16 +161,12 @@ def ALIAS(varTable: dict[str, str], origPth: str, prevErr: int, cmd: str,
         # 1/more args: view specified aliases
         err = comm.ERR_SUCCESS
         for arg in args.values():
-            found = False
-            for alias in allAliases[0]:
-                if alias[0].lower() != arg.lower():
-                    continue
-                print(f"{green}{alias[0]}{reset}={alias[1]}")
-                found = True
-                break
-            if not found:
+            if (value := comm.ALIASSTORE.get(arg)) is None:
                 comm.ERR(f"No such alias: '{arg}'")
                 err = err or ERR_NOSUCHALIAS
+                continue
+            name = comm.ALIASSTORE.names[arg.lower()]
+            print(f"{green}{name}{reset}={value}")
 
         return err
 
@@ -8,7 +8,6 @@
 
 import os
 import sys
-import shutil as st
 import typing as ty
 
 # Add src\\core to sys.path
@@ -18,16 +17,18 @@ import commons as comm
 sys.path.pop(1)
 
 helpStr = (
-    b"x\x9cePMk\xc30\x0c=[\xbfB\xc7\r\xe6\xf4\xbe[\xd9J\xbb\xc3\xd2\xd1\xb4"
-    b"\xbd\x84\x1e\xb4Yi\x0cq\x1cl\xa7c\xb0\x1f?\xdb\t\x04\xd6\x8b\x8d\xde\x87"
-    b"\xf4\xa4\xb3\xe6\xef'$\xa5V\xact@\xea\x15:\xf6\xc1:\xc6\x17k8\xe0\x97\xed"
-    b"\x1b}\x1d\x1d\x05m{_\x00\x9c\xaa\xf5v\xf3<\xe3X\xcb\xf6\x82\xf5\x83T\xf8"
-    b"\x8bR?b=\x90#\x83EQ\\\x12\xe2q\xaao\xd4\x8d\x9c\x00\x87\x8b\x00`}\xd8\x9e"
-    b"\xde7\xe5\xb1\x82\x8c\x82(\xc90\xda\x06C\xcb\x93\x90\x03;\xc8n\x10\xe7"
-    b"\xdc\xe4\x8e\x85\xfd\xc7\xf1m_V\x10C\xacPJ\xc5\r\x8d]\x00q\x98\x17\x99"
-    b"\x81\xc52\xc5\x01\xd9f}\xcb\xdd\x00b\x17_4\xec=]#\xa33\xa3\xfb\xc6\x82x"
-    b"\xd5~\xe8\xe8\x07S\xe5L\xbe\x03\xd2\xa7\x1d\xc3\xbf\x1cq\xd9d\xf2\x1cGW"
-    b"\xf1rt?\xd0e\x85cco\x9c\xf2\xa5\x7fQ\xfd\x01R(\x80\xc6"
+    b"x\x9cePMo\xc20\x0c=\xd7\xbf\xc2\xc7MZ\xca};\xa1\r\xb1\x1d\x06\x13\x05."
+    b"\x88\x83G]\x1a)\x1f(qA\x93\xf6\xe3\x97\xa6\x9d\xd0F\x0e\x8e\xfc\x9e\xfd"
+    b"\xfc\xec\xad\xe6\xcb\x03R]O\xb8\xd6\x82\xe4j\x0c\x1c\xc5\x07\xc6goY\xf0"
+    b"\xe0]\xa3\x8f] \xd1\xde\xc5\x12`SM\xe7\xb3\xc7\x11\xc7\x9dj\xf7\xb8\xbbS"
+    b"5~\xa3\xd2\xf7\xb8;Q \x8beY\xee{$\xe2\x90\x9f\xc9t\xfcK\x0e\xc9P\x02\xf8"
+    b"\xe7\xa9\x80W\x01\x80\xe9j\xbey\x9f-\xd6\x15d\x14\x8a\x05YF\xdf\xa0\xb4<"
+    b"\x14\xb2p\x80,\x08\xc56\xeb\xde\xb0\xb0\xfcX\xbf-\x17\x15$\x93\x13T\xaa"
+    b"\xe6\x86:#P\xac\xc6EG\xe0\xda28\x04\xd5\xe6\xfa\x96\xcd\t\x8a\xd7\x14"
+    b"\xd1r\x8ctL\x8c\xce\x8cv\x8d\x87\xe2E\xc7\x93\xa1/\xec\xb3`\xf3\x9d\x90>"
+    b"}'\xff|\xa4c\xf4M\x91\xd3\xe8\x8ao\xc6\xc5'$cF\xfb\x16)\x19\xbb\x04-\xc2"
+    b"\x0e\xc5g\xa9\xd4)\xda\x1d#6\xda0\x92\xa0w\x87\xe4%d\xd9\xc0\xd6\x9f\xb9"
+    b"_\xaa\xff\xaf\xe2?I \x9b}"
 )
 
 ERR_NOSUCHPARAM = 122
@@ -78,21 +79,40 @@ class Info:
         "false/no/off - disabled"
     )
 
+    infoLOGSIZE = (
+        "Size (in MiB) past which the log file is archived.", '',
+        "SPECIAL VALUES", "0 - No limit"
+    )
+
+    infoLOGDAYS = (
+        "Age (in days) of the oldest record past which the log file is "
+        "archived.", '', "SPECIAL VALUES", "0 - No limit"
+    )
 
-def readSett(origPth: str) -> ty.Generator[str, None, int | None]:
+    infoLOGARCHIVES = (
+        "Number of compressed log archives to keep.", '', "SPECIAL VALUES",
+        "0 - No archives; the log file is emptied instead"
+    )
+
+    infoPROMPTASYNC = (
+        "Prompt codes (ref. prompt) computed in the background, so that a "
+        "slow one does not hold up the prompt; e.g. 'dt'.", '',
+        "SPECIAL VALUES", "[NONE] - Default (none)"
+    )
+
+
+def _flErr_CONFIG_HELPER(e: OSError) -> int:
     """
-    Read settings from the settings file.
-    > param origPth: Path to the interpreter
-    > return: Generator object yielding individual lines of the settings file
+    Helper function of CONFIG, to report an error reading or writing the
+    settings file. Changes not written are dropped (ref. SettStore.batch()).
+    > param e: The error
+    > return: Error code (ref. src\\errCodes.txt)
     """
-    try:
-        with open(os.path.join(origPth, "_settings.txt"),
-                  'r', buffering=1) as f:
-            for line in f:
-                yield line
-    except FileNotFoundError:
-        comm.ERR("\"_settings.txt\": The settings file was not found", sl=4)
-        return comm.ERR_NOFL
+    if isinstance(e, PermissionError):
+        comm.ERR("\"_settings.txt\": Access is denied", sl=5)
+        return comm.ERR_PERMDENIED
+    comm.ERR(f"\"_settings.txt\": {e.strerror or e}", sl=5)
+    return comm.ERR_OSERR
 
 
 def _def_AllParams_CONFIG_HELPER() -> int:
@@ -102,56 +122,77 @@ def _def_AllParams_CONFIG_HELPER() -> int:
           settings file
     > return: Error code (ref. src\\errCodes.txt)
     """
-    with open(comm.SETTFL, 'w') as f:
-        for defKey in comm.DFLTSETT:
-            if defKey == "path":
-                continue
-            elif defKey == "pathSett":
-                f.write(f"path={comm.DFLTSETT[defKey]}\n")
-                continue
-            f.write(f"{defKey}={comm.DFLTSETT[defKey]}\n")
+    pairs = []
+    for defKey in comm.DFLTSETT:
+        if defKey == "path":
+            continue
+        elif defKey == "pathSett":
+            pairs.append(("path", comm.DFLTSETT[defKey]))
+            continue
+        pairs.append((defKey, comm.DFLTSETT[defKey]))
+    try:
+        comm.SETTSTORE.replace(pairs)
+    except OSError as e:
+        return _flErr_CONFIG_HELPER(e)
     return comm.ERR_SUCCESS
 
 
-def _def_SpecParams_CONFIG_HELPER(origPth: str, args: dict[int, str],
-                                  data: dict[str, str | None]) -> int:
+def _def_SpecParams_CONFIG_HELPER(args: dict[int, str],
+                                  data: dict[str, str]) -> int:
     """
     Helper function of CONFIG, to set specified parameters to default values.
-    > param origPth: Path to the interpreter
+    Parameters without a default value are removed.
     > param args: Dictionary of arguments supplied to the command
-    > param data: Dictionary of data to be written to the settings file
+    > param data: Dictionary of data in the settings file
     > return: Error code (ref. src\\errCodes.txt)
     """
     err = comm.ERR_SUCCESS
 
-    for arg in args.values():
-        found = False
-        argL  = arg.lower()
-
-        for key in data:
-            if argL == key.lower() and arg != "path":
-                if comm.DICTSRCH(key, comm.DFLTSETT, caseIn=True):
-                    data[key] = comm.DFLTSETT[key.lower()]
+    try:
+        with comm.SETTSTORE.batch():
+            for arg in args.values():
+                argL = arg.lower()
+
+                if argL == "path":
+                    comm.SETTSTORE.set(arg, comm.DFLTSETT["pathSett"])
+                elif argL in comm.KNOWNSETTPARAMS:
+                    comm.SETTSTORE.set(arg, comm.DFLTSETT[argL])
+                elif comm.DICTSRCH(arg, data, caseIn=True):
+                    comm.SETTSTORE.remove(arg)
                 else:
-                    data[key] = None
-                found = True
-            elif argL == key.lower() and arg == "path":
-                data[key] = comm.DFLTSETT["pathSett"]
-                found     = True
-
-        if not found:
-            if argL not in comm.KNOWNSETTPARAMS:
-                comm.ERR(f"No such parameter: '{arg}'", sl=5)
-                err = err or ERR_NOSUCHPARAM
-            else:
-                data[arg] = comm.DFLTSETT[arg.lower()]
-
-    with open(os.path.join(origPth, "_settings.txt"), 'w') as f:
-        for key in data:
-            if data[key] is None:
-                continue
-            f.write(f"{key}={data[key]}\n")
+                    comm.ERR(f"No such parameter: '{arg}'", sl=4)
+                    err = err or ERR_NOSUCHPARAM
+    except OSError as e:
+        return _flErr_CONFIG_HELPER(e)
+
+    return err
 
+
+def _set_CONFIG_HELPER(args: dict[int, str]) -> int:
+    """
+    Helper function of CONFIG, to set parameters. All of them are written to
+    the settings file at once, and none are if any name is invalid.
+    > param args: Dictionary of arguments supplied to the command; parameter
+                  names and values, alternately
+    > return: Error code (ref. src\\errCodes.txt)
+    """
+    argVals = [args[pos] for pos in sorted(args)]
+
+    if not argVals or len(argVals) % 2:
+        comm.ERR("Incorrect format", sl=4)
+        return comm.ERR_INCFORMAT
+
+    for param in argVals[::2]:
+        if not comm.PARAMOK(param):
+            comm.ERR(f"Invalid parameter name: '{param}'", sl=4)
+            return ERR_INVPARAMNM
+
+    try:
+        with comm.SETTSTORE.batch():
+            for param, value in zip(argVals[::2], argVals[1::2]):
+                comm.SETSETT(param, value)
+    except OSError as e:
+        return _flErr_CONFIG_HELPER(e)
     return comm.ERR_SUCCESS
 
 
@@ -161,20 +202,16 @@ def _rm_CONFIG_HELPER(args: dict[int, str]) -> int:
     > param args: Dictionary of arguments supplied to the command
     > return: Error code (ref. src\\errCodes.txt)
     """
-    argVals = args.values()
-
     if not args:
         comm.ERR("Incorrect format", sl=4)
         return 1
 
-    st.copyfile(comm.SETTFL, comm.SETTTMP)
-    with open(comm.SETTTMP, 'r') as f, open(comm.SETTFL, 'w') as g:
-        for line in f:
-            parts = line.partition('=')
-            if parts[0].lower() not in comm.LOWERLT(argVals) or parts[1] == '':
-                g.write(line)
-
-    os.remove(comm.SETTTMP)
+    try:
+        with comm.SETTSTORE.batch():
+            for arg in args.values():
+                comm.SETTSTORE.remove(arg)
+    except OSError as e:
+        return _flErr_CONFIG_HELPER(e)
     return 0
 
 
@@ -189,7 +226,8 @@ def _info_CONFIG_HELPER(args: dict[int, str], data: dict[str, str | None]) \
     # TODO: COMPLETE THIS FEATURE!
     infoCls      = Info()
     recogdParams = {"prompt", "path", "title", "cdtodirs", "execscripts",
-                    "intro"}
+                    "intro", "logsize", "logdays", "logarchives",
+                    "promptasync"}
     err          = comm.ERR_SUCCESS
     argsLen      = len(args)
 
@@ -273,35 +311,27 @@ def CONFIG(varTable: dict[str, str], origPth: str, prevErr: int, cmd: str,
         return comm.ERR_INCOPTUSAGE
 
     # Get all (valid) configurations
-    for ln in readSett(origPth):
-        attr, value = comm.GETATTRFRMSETTFL(ln)
-        if attr is None or value is None:
-            continue
-        if not allData and attr.lower() not in comm.KNOWNSETTPARAMS:
-            continue
-        data[attr] = value[:-1]
+    try:
+        for attr, value in comm.SETTSTORE.items():
+            if not allData and attr.lower() not in comm.KNOWNSETTPARAMS:
+                continue
+            data[attr] = value
+    except PermissionError:
+        comm.ERR("\"_settings.txt\": Access is denied")
+        return comm.ERR_PERMDENIED
+    except OSError as e:
+        comm.ERR(f"\"_settings.txt\": {e.strerror or e}")
+        return comm.ERR_OSERR
 
     # -d option
     if defaultParam:
         if args == {}:
             return _def_AllParams_CONFIG_HELPER()
-        return _def_SpecParams_CONFIG_HELPER(origPth, args, data)
+        return _def_SpecParams_CONFIG_HELPER(args, data)
 
     # -s option
     elif setParam:
-        if len(args) != 2:
-            comm.ERR("Incorrect format")
-            return comm.ERR_INCFORMAT
-        param = args[sorted(args)[0]]
-        value = args[sorted(args)[1]]
-        tmp   = comm.SETSETT(param, value)
-        if tmp == 2:
-            comm.ERR(f"Invalid parameter name: '{param}'")
-            return ERR_INVPARAMNM
-        elif tmp == 5:
-            comm.ERR("Access is denied")
-            return comm.ERR_PERMDENIED
-        return comm.ERR_SUCCESS
+        return _set_CONFIG_HELPER(args)
 
     # -r option
     elif removeParam:
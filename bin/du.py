@@ -7,9 +7,13 @@
 #
 
 import os
+import sqlite3
 import sys
-import pathlib as pl
-import typing  as ty
+import time
+import collections as co
+import pathlib     as pl
+import threading   as th
+import typing      as ty
 
 # Add src\\core to sys.path
 srcDir = os.path.dirname(os.path.dirname(__file__))
@@ -18,37 +22,431 @@ import commons as comm
 sys.path.pop(1)
 
 helpStr = (
-    b"x\x9cU\x8f?o\xc20\x10\xc5g\xdf\xa7\xb8\x8d28$\xb0u\x83\x8aB\x07B\xd5\xc0"
-    b"\x8428\xc9%\xb6pb\xe4?\x95\x90\xfa\xe1k\x0f\xad`\xb8\'\xdd{O\xf7\xd3\xbd"
-    b"\t\xdd\x06-<9\xf4\x92\xb0S\xae\xc5\xe0\xc4@hz\xec\x95&\xb7\xe8\x94\xa5"
-    b"\xd6\x1b\xab\xc8e\x00\xe7j\xbd\xdb\xbeb\x17\xf0\xc2e\x1d\xc5^\n\xfc\xc1e"
-    b"\x9cU]\xe3Mx\x89Y\x16\x8b\xeb\xaf\xdd\xf9\xb0-O\x15$\x0f\xd8{<\xf6\x7f"
-    b"\xeb\x8e\xde`\xfb\xc7~\xc4\xf6\xc6\x02\x1c?O\x1f\xc7\xb2\x02.q\x81\x9cK"
-    b"\xd27`\xfb\xa88\x92K5x\xc2\x02\x9b\xed\xc3(&nIt\xa2\xd14\x8b\xbd1Q\xbe"
-    b"\x85\x0e\xe4\x80\x95f\"\xe4\xd8\x90\xf3\x18&\xe5\x81\x15q\xbd*m\x9a{\xfa"
-    b"\xfd\xa5\xc8\xf3\x1c7s`\xcb\xe8\x8f4\x88G\xff\x9a\x82U\x0c\x06\xf5\x1c"
-    b"\x1c6\xf3_\xff0a\xa1"
+    b"x\x9c]SKo\xdb0\x0c>[\xbf\x82\xb7&@\x9cG{[O\xe9\xd6\xb5;4\x1d\x9a\xf4\x14"
+    b"\x04\x03m\xd1\xb6\x10Y\n\xf4H\x96a?~\x94\xd26\xe9\x0e\x96\xcd\xc7\xf7"
+    b"\x91\xe2G\x7fE]G\x8d\x81<\x84\x8e@*_C\xf4\xd8\x12\xd8\x06\x1a\xa5\xc9O"
+    b"\xa4rT\x07\xeb\x14\xf91|;\x1b\x80\x8e\xc0\xd7h\x0cI\xb0Fx\xda\x93C\xcd<"
+    b"\x8eP\xfa\x11\xa0\x91'\n8\xa8\xd0\xc1{\xbcC'A+\xb3=1\xd46\x9a\x90\x19j"
+    b"\x1a\x8b\x157\xe1\xd5\x1f\xc6p}\xf9_\xb1-\xed\x02(\xc3\xc4|J\xfa\r\x83_2"
+    b"\x8ee5<\xd5\xbaH\x17\xd1\xd4\x1d\x9a\x96y\xbdb\xe2t\xb9#\x1c\x88I2\x92"
+    b"\xfd\x89\xd0\xd8\x00\xa9Y\xc0\x16\x95\x19\xc3\xfc\x83\xe3\x08'\xbc\x17"
+    b"\x87\x8e\xcc\xdb5\x12\x04\xa5dp\xb0#\x06\xf6v\xcf\xdf\x8d\xb3=X\xc7\xb6"
+    b"\xc1\x9emnP\x85\x11T1d\xfe\x8c\xc7\xcc r\x08\x14\x0f\xc4\xa9\x10\xd8\x1f"
+    b"\xec-\x8f\x9b\xa0l\x00\x9b@\xee\xadP\x87{\x82\x8a8\xa1\xb7R5\xea\xc4\xba"
+    b"\xd3\x98F$^\x97\xf3\x87\xfb/ #\xac\xcbn\xc3\x87[\xcf\xe0/\\\xf3s\xb3I"
+    b"\xb6\\/\xf2\xbb\xd9\xc0\x0ey\xf2\xe31\xa3\xe6/\x0f\xafO\xf7\x8b\xd5R$"
+    b"\x9f(\xbes\xa5\xc9\xf9\xba\xc1B\xfd\xbe\x0b\x97k\xd0X'\xc4\xf3\xcf\xd5"
+    b"\x8f\xe7\xc5RdfQ\xcc\xb5\xb7)\x87\x1b:\xe6\xb5\xf9\xd8\x18\xc2\x9a\x85"
+    b"\x8e\xd5\x99W\xdaC\xba&,@\xb3\xfe\xda\x8b\xa2\"m\x0f<\x91s\xce`\x06\xaa"
+    b"\xc9\xc3j\xd5\x9e\xccP\xf08&P\x96M\xd4Z\x14/I\xa0\xb4;\xc7\x0bH\x16,i"
+    b"\xd08\xf2\x9d2m\xee#k+\xca.\xa3;\xd2;Q<\xf2\t=\xf9\xd4\xa1\xf84)Q\\=\xc6"
+    b"\x1eM\x996\x00+MW\x9c\xd7'\xf2=\xea\xc8\xca\x17\x0bkX\x1a\x16\xc2\x07"
+    b"\x88F\x05Q\xcc\xd8\xdc*m\xabc\xfac\x06\xb3\xe9t\nwCQ\\\xb3\xbf\xa7\x16/"
+    b"\xfd\xdb\x14\xb8\xe1@\xab>\x07\x9e\xee\x86\xff\x00\xc5g'\xaf"
 )
 
+# Threads scanning directories; scanning is bound by the file system rather
+# than by the interpreter, so more threads than processors are used
+THREADS = min(32, (os.cpu_count() or 1) + 4)
+# Index of directory sizes, in the interpreter's directory (ref. DUIndex),
+# and nanoseconds before a scan within which a directory modified is not
+# trusted to be unchanged by its modification time, as it may be modified
+# again within the same tick of a coarse clock (e.g. 2 s on FAT)
+IDXFLNM = "_du.db"
+RACYNS  = 2_000_000_000
 
-def _calcDirDU_HELPER_DU(stream, path: str) -> tuple[int, bool]:
-    totalSz  = 0
-    snagsHit = False
 
-    for root, _, files in os.walk(path):
-        for file in files:
+class DUIndex:
+    """
+    On-disk index of the sizes of directories, kept in an SQLite database.
+    Each directory is stored with its modification time, the total size of
+    the files directly inside it, the names of its subdirectories, and the
+    identities (device and inode) and sizes of its files with several hard
+    links, which are left out of its size so that they are counted once. A
+    directory is changed when entries are added to, removed from or renamed
+    in it, but not when a file in it is written to, so files modified in
+    place are noticed only by a full rescan.
+    """
+
+    def __init__(self, path: str) -> None:
+        """
+        > param path: Path to the database
+        """
+        self.conn = sqlite3.connect(path, timeout=5)
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS dirs (path TEXT PRIMARY KEY, "
+            "mtime INTEGER, size INTEGER, subdirs TEXT, links TEXT)"
+        )
+
+    def _where(self, root: str) -> tuple[str, tuple[str, str, str]]:
+        """
+        Condition selecting a directory and the directories below it.
+        > param root: The directory
+        > return: The condition and its parameters
+        """
+        prefix = os.path.join(root, '')
+        return ("path = ? OR (path >= ? AND path < ?)",
+                (root, prefix, prefix[:-1] + chr(ord(prefix[-1]) + 1)))
+
+    def load(self, root: str) -> dict[str, tuple[int, int, str, str]]:
+        """
+        Load the directories indexed in a directory tree.
+        > param root: The directory
+        > return: Modification time, size, subdirectory names (NUL
+                  separated) and hard-linked files (space separated device,
+                  inode and size, comma separated) of each directory
+        """
+        cond, params = self._where(root)
+        return {
+            row[0]: row[1:] for row in self.conn.execute(
+                f"SELECT path, mtime, size, subdirs, links FROM dirs "
+                f"WHERE {cond}",
+                params
+            )
+        }
+
+    def save(self, changed: list[tuple[str, int, int, str, str]],
+             gone: ty.Iterable[str]) -> None:
+        """
+        Store directories rescanned, and drop those no longer present.
+        > param changed: Path, modification time, size, subdirectory names
+                         and hard-linked files of each directory rescanned
+        > param gone: Paths of directories no longer present
+        """
+        with self.conn:
+            self.conn.executemany("DELETE FROM dirs WHERE path = ?",
+                                  ((path,) for path in gone))
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO dirs VALUES (?, ?, ?, ?, ?)", changed
+            )
+
+    def close(self) -> None:
+        self.conn.close()
+
+
+class ScanTally:
+    """
+    What a thread has found while scanning directories; merged once the
+    scan is over, so that threads do not contend for it.
+    """
+    __slots__ = ("sizes", "parents", "snags", "changed", "visited")
+
+    def __init__(self) -> None:
+        # Sizes of files found, by the directory they are added to, parents
+        # of the directories reported, paths which could not be scanned with
+        # the reasons, directories rescanned (for the index) and directories
+        # found
+        self.sizes   = {}
+        self.parents = {}
+        self.snags   = []
+        self.changed = []
+        self.visited = []
+
+
+class DUScanner:
+    """
+    Disk usage of directory trees, scanned with os.scandir() on a pool of
+    threads. The sizes of files come from the directory entries, without a
+    further stat() of each file where the system provides them (Windows).
+    Each thread works through its own stack of directories, and takes from
+    the bottom of another thread's stack when its own runs out, so that
+    subdirectories found by one thread are shared out to idle ones.
+    Files with several hard links are counted once per scan. On Windows,
+    where directory entries carry no link counts, only files that are not
+    empty are looked up further for them.
+    With an index, directories whose modification time is unchanged are
+    not listed again; only their subdirectories are checked.
+    """
+
+    def __init__(self, depth: int = 0, nThreads: int = THREADS) -> None:
+        """
+        > param depth: Depth down to which the sizes of subdirectories are
+                       reported (0 reports only the total)
+        > param nThreads: Number of threads scanning
+        """
+        self.depth    = depth
+        self.nThreads = nThreads
+        self.lock     = th.Lock()
+        self.work     = th.Condition(self.lock)
+        self.stop     = th.Event()
+        self.cache    = None
+        self.racy     = 0
+
+    def scan(self, root: str, index: DUIndex | None = None,
+             full: bool = False) \
+            -> tuple[dict[str, int], list[tuple[str, str]]]:
+        """
+        Scan a directory tree.
+        > param root: The directory
+        > param index: Index of directory sizes to use and update
+        > param full: Rescan every directory, even if indexed as unchanged
+        > return: Sizes of the directories reported, in the order they are
+                  to be displayed (subdirectories before their parents,
+                  ending with the root), and the paths which could not be
+                  scanned, with the reasons
+        """
+        self.stacks  = [co.deque() for _ in range(self.nThreads)]
+        self.pending = 1
+        self.seen    = set()
+        self.cache   = None if index is None else index.load(root)
+        self.reuse   = not full
+        self.racy    = time.time_ns() - RACYNS
+        self.stop.clear()
+        self.stacks[0].append((root, 0, root))
+
+        tallies = [ScanTally() for _ in range(self.nThreads)]
+        threads = [th.Thread(target=self._worker, args=(i, tallies[i]),
+                             daemon=True) for i in range(self.nThreads)]
+        for thread in threads:
+            thread.start()
+        try:
+            for thread in threads:
+                # Joining with a timeout lets ^C through on Windows
+                while thread.is_alive():
+                    thread.join(0.2)
+        except KeyboardInterrupt:
+            self.stop.set()
+            with self.work:
+                self.work.notify_all()
+            raise
+
+        sizes    = co.Counter()
+        children = co.defaultdict(list)
+        snags    = []
+        for tally in tallies:
+            sizes.update(tally.sizes)
+            for path, parent in tally.parents.items():
+                children[parent].append(path)
+            snags += tally.snags
+        sizes[root] += 0
+
+        if index is not None:
+            visited = set()
+            for tally in tallies:
+                visited.update(tally.visited)
+            index.save([row for tally in tallies for row in tally.changed],
+                       self.cache.keys() - visited)
+            self.cache = None
+
+        # Totals are built up from the deepest directories, and displayed
+        # in the same order
+        order = []
+        stack = [(root, False)]
+        while stack:
+            path, expanded = stack.pop()
+            if expanded:
+                order.append(path)
+                continue
+            stack.append((path, True))
+            stack += ((sub, False) for sub in
+                      sorted(children[path], reverse=True))
+        totals = {}
+        for path in order:
+            totals[path] = sizes[path] + sum(totals[sub] for sub in
+                                             children[path])
+        return totals, sorted(snags)
+
+    def _take(self, idx: int) -> tuple[str, int, str] | None:
+        """
+        Take a directory to scan, from the top of the thread's own stack,
+        or else from the bottom of another thread's.
+        > param idx: Index of the thread
+        > return: The directory, its depth and the path its size is added
+                  to; None if there is none to take
+        """
+        try:
+            return self.stacks[idx].pop()
+        except IndexError:
+            pass
+        for i in range(1, self.nThreads):
+            try:
+                return self.stacks[(idx + i) % self.nThreads].popleft()
+            except IndexError:
+                pass
+        return None
+
+    def _worker(self, idx: int, tally: ScanTally) -> None:
+        """
+        Scan directories until none are left in the tree.
+        > param idx: Index of the thread
+        > param tally: What the thread has found
+        """
+        own = self.stacks[idx]
+        while True:
+            task = self._take(idx)
+            if task is None:
+                with self.work:
+                    if not self.pending or self.stop.is_set():
+                        return
+                    self.work.wait(0.05)
+                continue
+            if self.stop.is_set():
+                return
+
+            subDirs = self._scanDir(*task, tally)
+            with self.work:
+                self.pending += len(subDirs) - 1
+                own.extend(subDirs)
+                if subDirs:
+                    self.work.notify(len(subDirs))
+                elif not self.pending:
+                    self.work.notify_all()
+
+    def _scanDir(self, path: str, depth: int, key: str, tally: ScanTally) \
+            -> list[tuple[str, int, str]]:
+        """
+        Add up the sizes of the files directly inside a directory, from the
+        index if it is unchanged since it was indexed.
+        > param path: The directory
+        > param depth: Its depth below the root
+        > param key: The path its size is added to: itself if it is
+                     reported, else its nearest reported ancestor
+        > param tally: What the thread has found
+        > return: Its subdirectories, as directories to scan
+        """
+        subDirs = None
+        if self.cache is not None:
             try:
-                totalSz += os.stat(os.path.join(root, file)).st_size
+                mtime = os.stat(path).st_mtime_ns
             except FileNotFoundError:
-                comm.WARN(f"Skipping \"{os.path.join(root, file)}\"; "
-                          "non-existant file", sl=4)
-                snagsHit = True
-            except PermissionError:
-                comm.WARN(f"Skipping: \"{os.path.join(root, file)}\"; "
-                          "access is denied", sl=4)
-                snagsHit = True
+                tally.snags.append((path, "non-existant directory"))
+                return []
+            except OSError:
+                mtime = None
+            else:
+                tally.visited.append(path)
+                hit = self.cache.get(path)
+                if self.reuse and hit is not None and hit[0] == mtime:
+                    total   = hit[1]
+                    subDirs = [os.path.join(path, nm) for nm in
+                               hit[2].split('\0')] if hit[2] else []
+                    links   = [tuple(map(int, link.split())) for link in
+                               hit[3].split(',')] if hit[3] else []
 
-    return totalSz, snagsHit
+        if subDirs is None:
+            total, subDirs, links, whole = self._listDir(path, tally)
+            if self.cache is not None and mtime is not None and whole:
+                tally.changed.append((
+                    path, mtime if mtime < self.racy else -1, total,
+                    '\0'.join(os.path.basename(sub) for sub in subDirs),
+                    ','.join(f"{dev} {ino} {sz}" for dev, ino, sz in links)
+                ))
+
+        if links:
+            with self.lock:
+                for dev, ino, sz in links:
+                    if (dev, ino) not in self.seen:
+                        self.seen.add((dev, ino))
+                        total += sz
+        tally.sizes[key] = tally.sizes.get(key, 0) + total
+        depth += 1
+        if depth > self.depth:
+            return [(sub, depth, key) for sub in subDirs]
+        for sub in subDirs:
+            tally.parents[sub] = path
+        return [(sub, depth, sub) for sub in subDirs]
+
+    def _listDir(self, path: str, tally: ScanTally) \
+            -> tuple[int, list[str], list[tuple[int, int, int]], bool]:
+        """
+        List a directory.
+        > param path: The directory
+        > param tally: What the thread has found
+        > return: Total size of the files directly inside it (but for those
+                  with several hard links), its subdirectories, the device,
+                  inode and size of its files with several hard links, and
+                  whether it was listed in full (only then is it indexed)
+        """
+        total   = 0
+        subDirs = []
+        links   = []
+        whole   = True
+        try:
+            with os.scandir(path) as entries:
+                for entry in entries:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            subDirs.append(entry.path)
+                            continue
+                        st = entry.stat(follow_symlinks=False)
+                        # Directory entries carry no link counts or file IDs
+                        # on Windows (they are 0); those are had from the
+                        # file itself. Empty files add nothing either way
+                        if not st.st_nlink and st.st_size:
+                            try:
+                                st = os.stat(entry.path,
+                                             follow_symlinks=False)
+                            except OSError:
+                                # Counted as not linked, e.g. when in use
+                                pass
+                    except FileNotFoundError:
+                        tally.snags.append((entry.path, "non-existant file"))
+                        whole = False
+                        continue
+                    except PermissionError:
+                        tally.snags.append((entry.path, "access is denied"))
+                        whole = False
+                        continue
+                    except OSError:
+                        tally.snags.append((entry.path, "cannot be read"))
+                        whole = False
+                        continue
+
+                    if st.st_nlink > 1:
+                        links.append((st.st_dev, st.st_ino, st.st_size))
+                    else:
+                        total += st.st_size
+        except FileNotFoundError:
+            tally.snags.append((path, "non-existant directory"))
+            return total, subDirs, links, False
+        except PermissionError:
+            tally.snags.append((path, "access is denied"))
+            return total, subDirs, links, False
+        except OSError:
+            tally.snags.append((path, "cannot be read"))
+            return total, subDirs, links, False
+        return total, subDirs, links, whole
+
+
+def _fmtSz_HELPER_DU(sz: int | float, num: int) -> str:
+    """
+    Format a size in bytes.
+    > param sz: The size
+    > param num: Unit: 0 to 3 for B, kB, MB and GB, or 4 for the best one
+    > return: The formatted size
+    """
+    alpha = ''
+    if num == 4:
+        szLen  = len(str(sz))
+        lens_  = [9, 6, 3]
+        alphas = ['G', 'M', 'k']
+        for i, len_ in enumerate(lens_):
+            if szLen > len_:
+                sz    /= 10 ** len_
+                alpha  = alphas[i]
+                break
+    else:
+        sz    /= 10 ** (num * 3)
+        alpha  = ('', 'k', 'M', 'G')[num]
+
+    sz = round(sz, 3)
+    if sz == int(sz):
+        sz = int(sz)
+    return f"{sz}{alpha}B"
+
+
+def _openIdx_HELPER_DU(origPth: str) -> DUIndex | None:
+    """
+    Open the index of directory sizes.
+    > param origPth: Path to the interpreter
+    > return: The index; None if it cannot be opened
+    """
+    path = os.path.join(origPth, IDXFLNM)
+    try:
+        return DUIndex(path)
+    except sqlite3.Error:
+        comm.WARN(f"Cannot open index \"{path}\"; scanning in full", sl=4)
+        return None
 
 
 def DU(varTable: dict[str, str], origPth: str, prevErr: int, cmd: str,
@@ -70,19 +468,20 @@ def DU(varTable: dict[str, str], origPth: str, prevErr: int, cmd: str,
     """
     toPrn: list[tuple[str, str]]
     optVals      = comm.LOWERLT(opts.values())
-    validOpts    = {'r', "r1", "r2", "r3", 'h', "-help"}
-    szAlphas     = ('', 'k', 'M', 'G')
+    validOpts    = {'r', "r1", "r2", "r3", 'd', 'f', "-full", 'h', "-help"}
     toPrn        = []
     toPrnApp     = toPrn.append
-    maxSz        = 0
     formatChosen = False
     num          = 0
+    depth        = 0
+    full         = False
     err          = comm.ERR_SUCCESS
     green        = comm.ANSIGREEN if op == '' else ''
     reset        = comm.ANSIRESET  if op == '' else ''
 
     if opts:
-        if tmp := (set(optVals) - validOpts):
+        if tmp := {opt for opt in optVals if opt not in validOpts and
+                   not (opt[0] == 'd' and opt[1:].isdigit())}:
             comm.ERR(f"Unknown option(s): {comm.OPTSJOIN(tmp)}")
             return comm.ERR_UNKNOPTS
         if 'h' in optVals or "-help" in optVals:
@@ -96,56 +495,59 @@ def DU(varTable: dict[str, str], origPth: str, prevErr: int, cmd: str,
                     return comm.ERR_INCOPTUSAGE
                 num          = int(rem if (rem := opt[1:]) != '' else 4)
                 formatChosen = True
+            elif opt[0] == 'd':
+                depth = int(rem if (rem := opt[1:]) != '' else 1)
+            elif opt in ('f', "-full"):
+                full = True
 
     if not args:
         comm.ERR("Incorrect format")
         return comm.ERR_INCFORMAT
 
-    snagsHit = False
-    for arg in args.values():
-        if os.path.isdir(arg):
-            sz, snagsHit = _calcDirDU_HELPER_DU(stream, arg)
-        elif os.path.isfile(arg):
-            try:
-                sz = os.stat(arg).st_size
-            except FileNotFoundError:
-                comm.WARN(f"Skipping \"{arg}\"; non-existant file", sl=4)
-                snagsHit = True
+    scanner = DUScanner(depth)
+    index   = None
+    if any(os.path.isdir(arg) for arg in args.values()):
+        index = _openIdx_HELPER_DU(origPth)
+    try:
+        for arg in args.values():
+            path = str(pl.Path(arg).resolve())
+            if os.path.isdir(arg):
+                try:
+                    sizes, snags = scanner.scan(path, index, full)
+                except sqlite3.Error as e:
+                    comm.WARN(f"Index unusable ({e}); scanning in full",
+                              sl=4)
+                    index.close()
+                    index        = None
+                    sizes, snags = scanner.scan(path)
+            elif os.path.isfile(arg):
+                try:
+                    sizes, snags = {path: os.stat(arg).st_size}, []
+                except FileNotFoundError:
+                    comm.WARN(f"Skipping \"{arg}\"; non-existant file",
+                              sl=4)
+                    continue
+                except PermissionError:
+                    comm.WARN(f"Skipping: \"{arg}\"; access is denied",
+                              sl=4)
+                    continue
+            else:
+                comm.ERR(f"No such file/directory: \"{arg}\"")
+                err = err or comm.ERR_NOFLDIR
                 continue
-            except PermissionError:
-                comm.WARN(f"Skipping: \"{arg}\"; access is denied", sl=4)
-                snagsHit = True
-                continue
-        else:
-            comm.ERR(f"No such file/directory: \"{arg}\"")
-            err = err or comm.ERR_NOFLDIR
-            continue
-
-        alpha = ''
-        if num == 4:
-            szLen  = len(str(sz))
-            lens_  = [9, 6, 3]
-            alphas = ['G', 'M', 'k']
-            for i, len_ in enumerate(lens_):
-                if szLen > len_:
-                    sz    /= 10 ** len_
-                    alpha  = alphas[i]
-                    break
-        else:
-            sz    /= 10 ** (num * 3)
-            alpha  = szAlphas[num]
-
-        sz = round(sz, 3)
-        if sz == int(sz):
-            sz = int(sz)
-
-        maxSz = max(maxSz, len(str(sz) + alpha) + 1)
-
-        toPrnApp((f"{sz}{alpha}B", str(pl.Path(arg).resolve())))
-        if snagsHit:
-            comm.WARN(f"Issues encountered while processing \"{arg}\"; "
-                      "may be incorrect")
+
+            for snag, reason in snags:
+                comm.WARN(f"Skipping \"{snag}\"; {reason}", sl=4)
+            for dirNm, sz in sizes.items():
+                toPrnApp((_fmtSz_HELPER_DU(sz, num), dirNm))
+            if snags:
+                comm.WARN(f"Issues encountered while processing \"{arg}\"; "
+                          "may be incorrect")
+    finally:
+        if index is not None:
+            index.close()
 
     if toPrn:
+        maxSz = max(len(i[0]) for i in toPrn)
         print('\n'.join(f"{green}{i[0]:<{maxSz}}{reset} {i[1]}" for i in toPrn))
     return err
@@ -6,10 +6,15 @@
 # Licensed under the Apache-2.0 License.
 #
 
+import mmap
 import os
 import re
 import sys
-import typing as ty
+import collections        as co
+import concurrent.futures as cf
+import queue              as qu
+import threading          as th
+import typing             as ty
 
 # Add "src\\core" to sys.path
 srcDir = os.path.dirname(os.path.dirname(__file__))
@@ -18,22 +23,473 @@ import commons as comm
 sys.path.pop(1)
 
 helpStr = (
-    b"x\x9ce\x8e\xb1\x0e\x820\x10\x86g\xee)\xee\x05\xaa\xbb\x1bQB\x1c\x14Ca2"
-    b"\x0c\x15\x0e\xda\x04\n\xe9U\x83oo\xcb\xa2\x89\xcb\r_\xee\xff\xfe?'\xcf8)"
-    b"\xdfjb\xecg\x87\n\x1d\r\xcfQ9\xa4uq\xc4lf\x8b\xc6\x06\xce\xde\x19;\xec"
-    b"\x00j\x99\xe6\xd9\x01{c;\xbc\x0b\xdd\x84\xd361Fk|\x02H\xcb\xbc\xbed\xd7J"
-    b"\xc2\x06!)\xff\x95\xb1k\xeb\rN\x88\xa9Dn~\xf43>\x08\x99\x94\x0b\x9b\xbaP"
-    b"\rP\xdc\xaasq\x95 Z\xdc\xa3\x10\xadb2\x96\xc9\xb2\xf1\xe6E\x90\x1c\x03"
-    b"\x10?\xe4+\x16zKh\x1a\x17HN\x86\x97Q\xbd\xd1k\xc2Hp\n[\xd4@\x1f\xc2\xf3W"
-    b"\xa1"
+    b"x\x9cmS=o\xdb0\x10\x9d\xc5_q\xa3\x03H\xea\xee-m\xd3\xa0C\x93\"J\xd0!\xf0"
+    b"@Kg\x93\xa8D\n$\x1d\xc7@\x7f|\xdfQRl \x16 \x82\"y\xef\xde\x07\xd5\xb0"
+    b"\x0e\xad\xe1H;\x1fHS<lc\n\xd6\xedK\x1at\xca\x1b~\x87\xf5\xc0\xfbC\xaf"
+    b"\x03\xf1\xfb\x188F\xeb\x1d\xc9yw\xc2\xb6\x8a\xfc\xc6A\xf7\xe7\xe2X\x92u"
+    b"\x82\x96\xbf\xe4$>\x93a\xda\xd9~A\xecl\xe06\xf9p\xa2\x14\x98K\xa5]\x87"
+    b"\xb58\xf6\xfa\x14\xf3\xd9\xde:\x9cm\xbdK\xda:\x81\xc1\xe2P\xd2\xd1&\x93"
+    b"\xf7\x17~\xc6\xeeM\x8f7qW+\xf5\xd2\xdc\xde\xdf\xad\xd1\x08p\xaf\x95\xd9`"
+    b"\xb02\xb0\x0c\x9e\xfeQ\xd5\xca,\xc8\xb0\xcb|64\xea\x9488z]&u]o\x14]<+(A-"
+    b"\xf6\xcd\x8dR\xb7O\xf7/\xbf\xee\x1e\x9e\x1b5\x17\xa8\xa2Y\xa4S\xf2\xb4e"
+    b"\x8a\x93\xad]\xb6uu\xd5\xbf,\xa4\xe2\x9b\x9a\xfe`\xa6\x8a\xc5\xc5\x19"
+    b"\x13\x1e~r`\xf2;\x1bA:\xf0\xe2\x17w%\xe9\x1d\x8aT!\xc6,\x00\xe8}\x80\x0b"
+    b"\x93\xf5\x83\x02?\xf0\xbcJ\xd2:Q\x02\x0e?\xe0G)y\x9d\xd39\x1a\x1f\x97"
+    b"\xe0\xa4\xe7G\xd1j\x12\x10`\xc8\xe3\xef\xe7\x9f\x8f\x0f\x8d\xaaZ\xfaBU"
+    b"\xd5\xa2oR\xc5\xf7\x89\x1dy\xd7\x9frb\xee0l9\x88\x82\x9c\x9d\x10\x99$"
+    b"\xae\xb0\xc4\xba5\xb9\xcd\x1c\xb1\x00W\x9c\xf1`\x1e\xbf\xab\xe2\x89uG"
+    b"\x17\x02I\xc7\xab7S!X)\x13\xb0\xb9\xealI\xf0\xb0n\xee\xe3\x1d\xb0@HH\xa8"
+    b"\xca\xe6\"\xbbw\x1e\xd2uD\xe97\x8c\x95u\x91]\xb4\xc9\xbe\xf1\x07m\x85"
+    b"\x9b$\x87E\xd9\x15\x9d\xf3\xcd,'M\x88\xda&\\\xfa\xa3\x9b\x1b\x85YT{\x08"
+    b"\x11\xa8\x08%[z\xf1\x83 6\x0e\x97\xffH\xb9D-\x9eITk\x81Z\xe7F\xb5*\xbeZ"
+    b"\xa7\x11\xd5EH\x7f\xed8r\xa7*\x93{\x19\xee\xc73O\xe9#+4\xc0/\xbd\xe7\xff"
+    b"\xa9\xd5[\xa8"
 )
 
+ERR_INVREGEX = 140
+
+# Bytes at the start of a file in which a NUL marks it as binary, size past
+# which files are memory-mapped instead of read, and files being searched or
+# waiting to be searched at a time, while searching directories
+SNIFFSZ  = 1 << 13
+MMAPSZ   = 1 << 20
+INFLIGHT = 256
+# What is reported for files and directories that cannot be searched
+FLERRS   = {
+    comm.ERR_NOFL      : "No such file",
+    comm.ERR_PERMDENIED: "Access is denied",
+    comm.ERR_UNKNOWN   : "Cannot be read"
+}
+
+
+class AhoCorasick:
+    """
+    Aho-Corasick automaton over a set of literal patterns (text or bytes),
+    built once; a line is scanned in one pass for all of them. Transitions
+    that go through failure links are resolved the first time they are
+    taken and remembered, so that scanning costs one dictionary lookup per
+    character. Remembering them from several threads at once is safe, as
+    each resolves to the same state.
+    """
+    def __init__(self, patterns: ty.Sequence[str] | ty.Sequence[bytes]) \
+            -> None:
+        self.lens  = [len(pattern) for pattern in patterns]
+        self.goto  : list[dict[str | int, int]] = [{}]
+        # Patterns ending at each state, directly or through failure links
+        self.out   : list[list[int]] = [[]]
+        for i, pattern in enumerate(patterns):
+            if not pattern:
+                continue
+            state = 0
+            for sym in pattern:
+                if (nxt := self.goto[state].get(sym)) is None:
+                    nxt = self.goto[state][sym] = len(self.goto)
+                    self.goto.append({})
+                    self.out.append([])
+                state = nxt
+            self.out[state].append(i)
+
+        # Failure links, breadth first: the state of the longest proper
+        # suffix of a state's text that is also in the automaton
+        self.fail = [0] * len(self.goto)
+        queue     = co.deque(self.goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for sym, nxt in self.goto[state].items():
+                queue.append(nxt)
+                fail = self.fail[state]
+                while fail and sym not in self.goto[fail]:
+                    fail = self.fail[fail]
+                self.fail[nxt] = self.goto[fail].get(sym, 0)
+                self.out[nxt] += self.out[self.fail[nxt]]
+
+        self.delta = [dict(edges) for edges in self.goto]
+
+    def _step(self, state: int, sym: str | int) -> int:
+        """
+        > param state: A state
+        > param sym: The next character
+        > return: The state after it, through failure links if needed
+        """
+        prev = state
+        while state and sym not in self.goto[state]:
+            state = self.fail[state]
+        nxt = self.delta[prev][sym] = self.goto[state].get(sym, 0)
+        return nxt
+
+    def scan(self, txt: str | bytes) -> list[tuple[int, int, int]]:
+        """
+        > param txt: A line
+        > return: Start, end and index of the pattern of every occurrence
+                  of every pattern, overlapping ones included
+        """
+        hits  = []
+        delta = self.delta
+        out   = self.out
+        state = 0
+        for i, sym in enumerate(txt):
+            if (nxt := delta[state].get(sym)) is None:
+                nxt = self._step(state, sym)
+            state = nxt
+            for idx in out[state]:
+                hits.append((i + 1 - self.lens[idx], i + 1, idx))
+        return hits
+
+
+class Searcher:
+    """
+    A search, set up once per invocation, and how matches are displayed. A
+    single pattern is compiled as a regular expression. A literal one is
+    compiled for raw bytes as well, so that files are searched without
+    decoding them (only matching lines are decoded), unless it is matched
+    case-insensitively and is not ASCII; bytes are only case-folded in
+    ASCII. Files are decoded for any other pattern, as regular expressions
+    match bytes differently ('.' matches a byte, '\\w' only ASCII, etc.).
+    Several patterns are literals, searched for all at once through an
+    Aho-Corasick automaton (again for text and for bytes); the patterns
+    found in a line are displayed before it.
+    """
+    def __init__(self, patterns: list[str], isRegex: bool, ignCase: bool,
+                 only: bool, count: bool, green: str, reset: str) -> None:
+        self.patterns = patterns
+        self.ignCase  = ignCase
+        self.only     = only
+        self.count    = count
+        self.green    = green
+        self.reset    = reset
+        self.ac       = None
+        self.bAc      = None
+
+        if len(patterns) > 1:
+            keys     = [pattern.lower() if ignCase else pattern
+                        for pattern in patterns]
+            self.ac  = AhoCorasick(keys)
+            # Bytes are only case-folded in ASCII
+            if not ignCase or all(key.isascii() for key in keys):
+                self.bAc = AhoCorasick([key.encode() for key in keys])
+            return
+
+        flags        = re.IGNORECASE if ignCase else 0
+        src          = patterns[0] if isRegex else re.escape(patterns[0])
+        self.pttrn   = re.compile(src, flags)
+        # Files are searched whole, as many lines at once
+        self.flPttrn = re.compile(src, flags | re.MULTILINE)
+        self.bPttrn  = None
+        if not isRegex and (not ignCase or patterns[0].isascii()):
+            self.bPttrn = re.compile(src.encode(), flags | re.MULTILINE)
+
+    def _lower(self, ln: str) -> str:
+        """
+        > param ln: A line
+        > return: The line in lowercase, character for character, so that
+                  positions in it are those in the line
+        """
+        lower = ln.lower()
+        if len(lower) == len(ln):
+            return lower
+        return ''.join(char if len(low := char.lower()) != 1 else low
+                       for char in ln)
+
+    def matches(self, ln: str) -> tuple[list[tuple[int, int]], list[str]]:
+        """
+        > param ln: A line
+        > return: Tuple of the sorted, non-overlapping start and end of each
+                  match, and the patterns found (when there are several),
+                  in the order they were found in
+        """
+        if self.ac is None:
+            return [match.span() for match in self.pttrn.finditer(ln)], []
+
+        hits  = self.ac.scan(self._lower(ln) if self.ignCase else ln)
+        spans = []
+        found = {}
+        pos   = 0
+        # Leftmost, then longest, matches are highlighted
+        for start, end, idx in sorted(hits, key=lambda hit: (hit[0], -hit[1])):
+            found.setdefault(self.patterns[idx])
+            if start >= pos:
+                spans.append((start, end))
+                pos = end
+        return spans, list(found)
+
+    def show(self, ln: str, prefix: str = '') -> list[str]:
+        """
+        > param ln: A line
+        > param prefix: Put before each line displayed
+        > return: What is displayed for the line: the line with its matches
+                  highlighted, or the matches alone; empty if it does not
+                  match
+        """
+        spans, found = self.matches(ln)
+        if not spans:
+            return []
+        if self.only:
+            return [prefix + self.green + ln[start:end] + self.reset
+                    for start, end in spans if start != end]
+        if found:
+            prefix += ','.join(found) + ':'
+        return [prefix + _hilite_HELPER_FIND(ln, spans, self.green,
+                                             self.reset)]
+
+    def srchStr(self, string: str) -> list[str]:
+        """
+        > param string: String to be searched in
+        > return: Lines to be displayed
+        """
+        toPrn = []
+        nLns  = 0
+        for ln in string.split('\n'):
+            if shown := self.show(ln):
+                nLns += 1
+                if not self.count:
+                    toPrn += shown
+        return [str(nLns)] if self.count else toPrn
+
+    def srchFl(self, path: str) -> list[str] | int | None:
+        """
+        Search a file, as path:line:match. Large files are memory-mapped.
+        > param path: Path to the file
+        > return: Lines to be displayed, None if the file is binary or an
+                  integer error code (ref. src\\errCodes.txt)
+        """
+        try:
+            with open(path, 'rb') as f:
+                size = os.fstat(f.fileno()).st_size
+                if not size:
+                    return []
+                if self.ac is not None:
+                    return self._srchLns(path, f)
+                if size < MMAPSZ:
+                    return self._srchBuf(path, f.read())
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buf:
+                    return self._srchBuf(path, buf)
+        except FileNotFoundError:
+            return comm.ERR_NOFL
+        except PermissionError:
+            return comm.ERR_PERMDENIED
+        except OSError:
+            return comm.ERR_UNKNOWN
+
+    def _srchBuf(self, path: str, buf: bytes | mmap.mmap) \
+            -> list[str] | None:
+        """
+        Search the contents of a file. Each match found in them only marks
+        a line to be matched again on its own (ref. show()), as a match may
+        run on into the lines after it.
+        > param path: Path to the file
+        > param buf: Contents of the file
+        > return: Lines to be displayed, or None if the file is binary
+        """
+        if b'\0' in buf[:SNIFFSZ]:
+            return None
+
+        if self.bPttrn is not None:
+            pttrn, nl = self.bPttrn, b'\n'
+        else:
+            buf = str(buf, "utf-8", "replace")
+            # So that '$' matches at the end of every line
+            if '\r' in buf:
+                buf = buf.replace("\r\n", '\n')
+            pttrn, nl = self.flPttrn, '\n'
+
+        toPrn = []
+        nLns  = 0
+        pos   = 0
+        lnNo  = 1
+        while pos < len(buf) and \
+                (match := pttrn.search(buf, pos)) is not None:
+            start   = match.start()
+            lnStart = buf.rfind(nl, 0, start) + 1
+            lnEnd   = buf.find(nl, start)
+            lnEnd   = len(buf) if lnEnd == -1 else lnEnd
+            lnNo   += buf[pos:lnStart].count(nl)
+
+            ln = buf[lnStart:lnEnd]
+            if nl == b'\n':
+                ln = ln.decode("utf-8", "replace")
+            shown = self.show(ln.removesuffix('\r'), f"{path}:{lnNo}:")
+            if shown:
+                nLns += 1
+                if not self.count:
+                    toPrn += shown
+            pos   = lnEnd + 1
+            lnNo += 1
+
+        if self.count:
+            return [f"{path}:{nLns}"] if nLns else []
+        return toPrn
+
+    def _srchLns(self, path: str, f: ty.BinaryIO) -> list[str] | None:
+        """
+        Search a file a line at a time, for several patterns. Lines are
+        decoded only if they contain one as bytes, where that can be told.
+        > param path: Path to the file
+        > param f: The file, opened in binary mode
+        > return: Lines to be displayed, or None if the file is binary
+        """
+        if b'\0' in f.read(SNIFFSZ):
+            return None
+        f.seek(0)
+
+        toPrn = []
+        nLns  = 0
+        for lnNo, ln in enumerate(f, 1):
+            if self.bAc is not None and \
+                    not self.bAc.scan(ln.lower() if self.ignCase else ln):
+                continue
+            ln    = ln.decode("utf-8", "replace").rstrip("\r\n")
+            shown = self.show(ln, f"{path}:{lnNo}:")
+            if shown:
+                nLns += 1
+                if not self.count:
+                    toPrn += shown
+
+        if self.count:
+            return [f"{path}:{nLns}"] if nLns else []
+        return toPrn
+
+
+def _hilite_HELPER_FIND(ln: str, spans: list[tuple[int, int]], green: str,
+                        reset: str) -> str:
+    """
+    Highlight the matches in a line, by slicing the line between them.
+    > param ln: The line
+    > param spans: Sorted, non-overlapping start and end of each match
+    > param green: Colour code of matches ('' if not highlighted)
+    > param reset: Reset code
+    > return: The highlighted line
+    """
+    if not green:
+        return ln
+
+    parts = []
+    pos   = 0
+    for start, end in spans:
+        parts += (ln[pos:start], green, ln[start:end], reset)
+        pos    = end
+    parts.append(ln[pos:])
+    return ''.join(parts)
+
+
+def _rdPttrns_HELPER_FIND(fl: str) -> list[str] | int:
+    """
+    Read patterns from a file, one per line; empty lines are skipped.
+    > param fl: Path to the file
+    > return: List of patterns or integer error code (ref.
+              src\\errCodes.txt)
+    """
+    try:
+        with open(fl, encoding="utf-8") as f:
+            return [ln for ln in f.read().splitlines() if ln]
+    except (FileNotFoundError, IsADirectoryError):
+        comm.ERR(f"No such file: \"{fl}\"", sl=4)
+        return comm.ERR_NOFL
+    except PermissionError:
+        comm.ERR(f"Access is denied: \"{fl}\"", sl=4)
+        return comm.ERR_PERMDENIED
+    except UnicodeDecodeError:
+        comm.ERR(f"Does not appear to contain text: \"{fl}\"", sl=4)
+        return comm.ERR_CANTDECODE
+
+
+def _walk_HELPER_FIND(root: str, errs: qu.Queue, stop: th.Event) \
+        -> ty.Generator[str, None, None]:
+    """
+    Walk a directory tree with os.scandir(). Links to directories are not
+    followed, so that the walk cannot loop.
+    > param root: The directory
+    > param errs: Queue on which directories that cannot be read are put,
+                  with the error code
+    > param stop: Stops the walk when set
+    > return: Generator of the paths of the files in the tree
+    """
+    dirs = [root]
+    while dirs and not stop.is_set():
+        dirNm = dirs.pop()
+        try:
+            with os.scandir(dirNm) as entries:
+                subDirs = []
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        subDirs.append(entry.path)
+                    elif entry.is_file():
+                        yield entry.path
+        except PermissionError:
+            errs.put((dirNm, comm.ERR_PERMDENIED))
+            continue
+        except OSError:
+            errs.put((dirNm, comm.ERR_UNKNOWN))
+            continue
+        # Popped in the order they were listed
+        dirs += reversed(subDirs)
+
+
+def _srchTree_HELPER_FIND(root: str, srch: Searcher) -> int:
+    """
+    Search the files of a directory tree on a thread pool, displaying the
+    results of each file, in order, as soon as it has been searched.
+    > param root: The directory
+    > param srch: The search
+    > return: Error code (ref. src\\errCodes.txt)
+    """
+    err     = comm.ERR_SUCCESS
+    results = qu.Queue()
+    slots   = th.BoundedSemaphore(INFLIGHT)
+    stop    = th.Event()
+
+    def done(fut: cf.Future) -> None:
+        slots.release()
+        results.put(fut)
+
+    def walk() -> None:
+        pool = cf.ThreadPoolExecutor()
+        try:
+            for path in _walk_HELPER_FIND(root, results, stop):
+                slots.acquire()
+                if stop.is_set():
+                    break
+                fut      = pool.submit(srch.srchFl, path)
+                fut.path = path
+                fut.add_done_callback(done)
+        finally:
+            pool.shutdown(cancel_futures=stop.is_set())
+            results.put(None)
+
+    th.Thread(target=walk, daemon=True).start()
+    try:
+        while True:
+            # Waiting with a timeout lets ^C through on Windows
+            try:
+                item = results.get(timeout=0.2)
+            except qu.Empty:
+                continue
+            if item is None:
+                break
+
+            if isinstance(item, tuple):
+                path, res = item
+            else:
+                path, res = item.path, item.result()
+            if isinstance(res, int):
+                comm.ERR(f"{FLERRS[res]}: \"{path}\"", sl=4)
+                err = err or res
+            elif res:
+                print('\n'.join(res))
+                sys.stdout.flush()
+
+    except KeyboardInterrupt:
+        stop.set()
+        raise
+
+    return err
+
 
 def FIND(varTable: dict[str, str], origPth: str, prevErr: int, cmd: str,
          args: dict[int, str], opts: dict[int, str], fullCmd: str,
          stream: ty.TextIO, op: str, debug: bool) -> int:
     """
-    Searches for a substring in a string given.
+    Searches for a substring, or matches of a regular expression, in a
+    string given, or in the files of a directory tree.
     > param varTable: Variable table
     > param origPth: Path to the interpreter
     > param prevErr: Previous error code
@@ -46,13 +502,16 @@ def FIND(varTable: dict[str, str], origPth: str, prevErr: int, cmd: str,
     > param debug: Is debugging enabled?
     > return: Error code (ref. src\\errCodes.txt)
     """
-    toPrn: list[str]
-    reqLn: list[str]
+    patterns : list[str] | None
     optVals   = comm.LOWERLT(opts)
-    validOpts = {'c', 'h', "-casesensitive", "-help"}
-    caseIn    = False
-    toPrn     = []
-    toPrnApp  = toPrn.append
+    validOpts = {'c', 'e', 'f', 'i', 'o', 'r', 'h', "-count", "-regex",
+                 "-file", "-ignorecase", "-only", "-recursive", "-help"}
+    patterns  = None
+    ignCase   = False
+    isRegex   = False
+    only      = False
+    count     = False
+    recursive = False
     green     = comm.ANSIGREEN if op == '' else ''
     reset     = comm.ANSIRESET if op == '' else ''
 
@@ -63,44 +522,66 @@ def FIND(varTable: dict[str, str], origPth: str, prevErr: int, cmd: str,
         if 'h' in optVals or "-help" in optVals:
             print(comm.DECOMPSTR(helpStr))
             return comm.ERR_SUCCESS
-        for opt in optVals:
-            if opt == 'c' or opt == "-casesensitive":
-                caseIn = True
+        for pos in opts:
+            opt = opts[pos].lower()
+            if opt == 'f' or opt == "-file":
+                if patterns is not None:
+                    comm.ERR("Cannot accept multiple pattern files")
+                    return comm.ERR_INCOPTUSAGE
+                if pos + 1 not in args:
+                    comm.ERR(f"Missing argument for -{opts[pos]}: file")
+                    return comm.ERR_INCOPTUSAGE
+                patterns = _rdPttrns_HELPER_FIND(args.pop(pos + 1))
+                if isinstance(patterns, int):
+                    return patterns
+            elif opt == 'i' or opt == "-ignorecase":
+                ignCase   = True
+            elif opt == 'e' or opt == "-regex":
+                isRegex   = True
+            elif opt == 'o' or opt == "-only":
+                only      = True
+            elif opt == 'c' or opt == "-count":
+                count     = True
+            elif opt == 'r' or opt == "-recursive":
+                recursive = True
 
-    if len(args) != 2:
+    # The last argument is searched in; the rest are patterns
+    argVals = [args[pos] for pos in sorted(args)]
+    if patterns is None:
+        patterns = argVals[:-1]
+    elif len(argVals) > 1:
+        patterns += argVals[:-1]
+    if not argVals or not patterns:
         comm.ERR("Incorrect format")
         return comm.ERR_INCFORMAT
+    if isRegex and len(patterns) > 1:
+        comm.ERR("Only a single pattern can be a regular expression")
+        return comm.ERR_INCOPTUSAGE
 
-    argVals   = tuple(args.values())
-    regex     = re.escape(argVals[0])
-    string    = argVals[1]
-    pattern   = re.compile(regex) if not caseIn else regex
-    regexfunc = re.finditer
-    regexflag = re.IGNORECASE if caseIn else 0
-
-    lns = string.split('\n')
-    for ln in lns:
-        allSpans = []
-        spans    = []
-
-        for match in regexfunc(pattern, ln, regexflag):
-            allSpans.append(match.span())
-
-        if allSpans == []:
-            continue
-
-        for i in allSpans:
-            spans += list(range(*i))
-
-        reqLn    = []
-        reqLnApp = reqLn.append
-        for idx, char in enumerate(ln):
-            colour = idx in spans
-            reqLnApp((green if colour else '') + char + (reset if colour else ''))
+    # Compiled once, for all the lines
+    try:
+        srch = Searcher(patterns, isRegex, ignCase, only, count, green,
+                        reset)
+    except re.error as e:
+        comm.ERR(f"Invalid regular expression: '{patterns[0]}' ({e})")
+        return ERR_INVREGEX
 
-        toPrnApp(''.join(reqLn))
+    if not recursive:
+        if toPrn := srch.srchStr(argVals[-1]):
+            print('\n'.join(toPrn))
+        return comm.ERR_SUCCESS
 
-    if toPrn:
-        print('\n'.join(toPrn))
+    path = argVals[-1]
+    if os.path.isdir(path):
+        return _srchTree_HELPER_FIND(path, srch)
+    if not os.path.isfile(path):
+        comm.ERR(f"No such file/directory: \"{path}\"")
+        return comm.ERR_NOFL
 
+    res = srch.srchFl(path)
+    if isinstance(res, int):
+        comm.ERR(f"{FLERRS[res]}: \"{path}\"")
+        return res
+    if res:
+        print('\n'.join(res))
     return comm.ERR_SUCCESS
@@ -6,8 +6,14 @@
 # Licensed under the Apache-2.0 License.
 #
 
+import codecs
+import io
+import locale
 import os
+import select
 import sys
+import time
+import ctypes as ct
 import typing as ty
 
 # Add src\\core to sys.path
@@ -16,16 +22,252 @@ sys.path.insert(1, os.path.join(srcDir, "core"))
 import commons as comm
 sys.path.pop(1)
 
-helpStr = b"x\x9cm\x8e=\x0e\xc20\x0cF\xe7\xfa\x14\xbe@`g\xabD)\x0c\xa4\x88\xb6\x13\xea\x90\xaa\x0e\x89\x94\xfe\xa8\x0eBpz\x92\xc0\xc8\xf2\xc9\xb6\xec\xf7\xbc\xb7\xbc8\xf5b\xf4\x86\xd0)\xf6\xa8\xe9\x89\xceN\xc48kT\xa8\xad\xa3\r@[\xe7e\xb1C\xaf\xac\xc3\x9b0]\x08F\xb6o\xea\xd2\x06@~-\xdbs!\x9b\x1aR\x9f\x1dB\xa2\x9f\xb1'\x1c\xbe\x0e\x1a\x00\xaaKs\xaad\r\xe1x\x8bBD\x00d\xf21\xf6\xb4F\xddO\xac\xd7yL\x0f\xd14\xc4q,\xf5?\x9e0\tc\xc8-\x90\x1dC\xe2H\xcc\xeaN\x1f\x08KD\xb4"
+helpStr = (
+    b"x\x9c\x95\x90AO\xc30\x0c\x85\xcf\xf5\xaf\xf0\x11\xa45\xdc\xb9M0\x06Bt"
+    b"\x88m\xa7iHn\xeb\xb4\x91\xb2\xa6J2UC\xfcx\x9cT\x08\xc4\x8d\x8b\x15\xd9~"
+    b"\x9f_\xde\xbd\t\xa3\xa5K\xc0\xd83Z\n\x115Oh\xcd\xc0a\x81\xcec}\x89\xf9"
+    b"\xa5Q\x1b\xcbA\x01\xec\xb7\xcb\xf5\xea\x16#\x19\x8b\x87\xb2?J\t\x18\xcc"
+    b"\x07\xe3'\x96\xcd,HM}\xcc\x12<\xe4\xaa\x94:\x02,\xdf\xd6\xfb\x97U\xb5"
+    b"\xdbBjB\xf1\x90F\xd1a\xcd\xd8\xceF\xb8\x05\xd8\xbc\xee\x9e6\xd5\x16\x84{"
+    b"\x83e\x99\xd8PT\xe7S\xcd>\x19\xc9\xe6P{w\xca\xa6yhS\x97\xa9\xe9\xe7\x83"
+    b"\x7fyb*a\xb2\xb1\xdf\x9c\xdc\xf8\x0fGg\x8ev\xd6\xba\t\x8ag\xe6\xf1{j\x86"
+    b"\x0e\xa7\x9e\"\x9a\x804\x8e\x82\xe26\xe9\x137\xe7\xb6\xc0\xf3\x10%\xb0"
+    b"\xf7\xbb\xb42z\x0e\x81[5\x07\x90\xb2\x17)y9\xe9\xcfCCQ\xc4\x12\xbdgA7"
+    b"\xf2\xbeb\xd5)\xf4.\xe6\x89u]\xb8\xce\xdb\x9e\xa9\x85\x82:2\xc3\xcf7B$"
+    b"\x1f\xa1\xec\xb3\xd7\x9e\xed\x08\xc5\xa3T<\xc9I\xea\xf8\x0b\xceT\xa3^"
+)
 
 ERR_INVPEEKSZ = 134
 
+# Bytes read at a time, backwards from the end of the file and while
+# writing out its tail
+BLKSZ       = 1 << 16
+# Encoding files are read in, as by open()
+ENCODING    = locale.getpreferredencoding(False)
+# Seconds between checks of followed files when they are polled, and when
+# change notifications are used (in case one is missed, e.g. on network
+# drives)
+POLLINTVL   = 0.5
+NOTIFYINTVL = 5.0
+
+
+class TailedFl:
+    """
+    A file whose tail is displayed, and which may then be followed: its
+    handle, its identity (device and inode) and the decoder of its text.
+    The decoder is kept across reads, so that characters and line endings
+    split between two reads are decoded whole.
+    """
+    def __init__(self, path: str, raw: bool) -> None:
+        self.path = path
+        self.raw  = raw
+        self.f    = open(path, 'rb')
+        st        = os.fstat(self.f.fileno())
+        self.id   = (st.st_dev, st.st_ino)
+        self.size = st.st_size
+        self.dec  = None if raw else io.IncrementalNewlineDecoder(
+            codecs.getincrementaldecoder(ENCODING)(), True
+        )
+
+    def chunks(self) -> ty.Generator[bytes | str, None, None]:
+        """
+        Read the file from the current position to its end, a block at a
+        time.
+        > return: Generator of the bytes read, or their text
+        """
+        while blk := self.f.read(BLKSZ):
+            yield blk if self.dec is None else self.dec.decode(blk)
+
+    def end(self) -> str:
+        """
+        > return: Text still held by the decoder, at the end of the file
+        """
+        return '' if self.dec is None else self.dec.decode(b'', True)
+
+    def check(self) -> str | None:
+        """
+        Check whether the file was replaced (e.g. when a log is rotated) or
+        truncated since it was last read, and if so, start reading it again
+        from the beginning. A file that was moved away and not yet replaced
+        is still read through the old handle.
+        > return: What happened to the file, if anything
+        """
+        try:
+            st = os.stat(self.path)
+        except OSError:
+            return None
+
+        if (st.st_dev, st.st_ino) != self.id:
+            try:
+                f = open(self.path, 'rb')
+            except OSError:
+                return None
+            self.f.close()
+            self.f  = f
+            st      = os.fstat(f.fileno())
+            self.id = (st.st_dev, st.st_ino)
+            what    = "replaced"
+        elif st.st_size < self.f.tell():
+            self.f.seek(0)
+            what    = "truncated"
+        else:
+            return None
+
+        if self.dec is not None:
+            self.dec.reset()
+        return what
+
+    def close(self) -> None:
+        self.f.close()
+
+
+class Notifier:
+    """
+    Waits for followed files to change. Their directories are watched
+    through inotify where it is available, so that appends, truncation and
+    files being replaced all wake it; elsewhere, it waits for a fixed
+    interval, after which the files are checked again (stat polling).
+    """
+    # IN_MODIFY | IN_ATTRIB | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE |
+    # IN_DELETE | IN_DELETE_SELF | IN_MOVE_SELF
+    INMASK = 0x002 | 0x004 | 0x040 | 0x080 | 0x100 | 0x200 | 0x400 | 0x800
+
+    def __init__(self, paths: list[str]) -> None:
+        self.fd = None
+        if not sys.platform.startswith("linux"):
+            return
+
+        try:
+            libc = ct.CDLL(None, use_errno=True)
+            fd   = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        except (OSError, AttributeError):
+            return
+        if fd < 0:
+            return
+
+        dirs = {os.path.dirname(os.path.abspath(path)) for path in paths}
+        if any(libc.inotify_add_watch(fd, os.fsencode(dirNm), self.INMASK) < 0
+               for dirNm in dirs):
+            os.close(fd)
+            return
+        self.fd = fd
+
+    def wait(self) -> None:
+        if self.fd is None:
+            time.sleep(POLLINTVL)
+            return
+
+        if select.select([self.fd], [], [], NOTIFYINTVL)[0]:
+            # Only whether something happened matters; every file is checked
+            try:
+                while os.read(self.fd, 1 << 12):
+                    pass
+            except BlockingIOError:
+                pass
+
+    def close(self) -> None:
+        if self.fd is not None:
+            os.close(self.fd)
+            self.fd = None
+
+
+def _lnsStart_HELPER_TAIL(f: ty.BinaryIO, size: int, peekSz: int) -> int:
+    """
+    Find where the last lines of a file start, reading it backwards from the
+    end, a block at a time.
+    > param f: The file, opened in binary mode
+    > param size: Size of the file
+    > param peekSz: Number of lines
+    > return: Offset of the first of the lines
+    """
+    if not peekSz:
+        return size
+
+    # A newline at the very end ends the last line; it does not start one
+    pos = size - 1
+    while pos > 0:
+        start = max(pos - BLKSZ, 0)
+        f.seek(start)
+        blk   = f.read(pos - start)
+
+        if (count := blk.count(b'\n')) < peekSz:
+            peekSz -= count
+            pos     = start
+            continue
+
+        idx = len(blk)
+        for _ in range(peekSz):
+            idx = blk.rfind(b'\n', 0, idx)
+        return start + idx + 1
+    return 0
+
+
+def _write_HELPER_TAIL(data: bytes | str) -> None:
+    """
+    Write out part of a file: bytes as they are, text as text.
+    > param data: The bytes or text
+    """
+    if isinstance(data, bytes):
+        sys.stdout.buffer.write(data)
+    else:
+        sys.stdout.write(data)
+
+
+def _follow_HELPER_TAIL(tailed: list[TailedFl], headers: bool) -> int:
+    """
+    Keep displaying what is appended to files, until interrupted (^C).
+    > param tailed: The files, read up to their ends
+    > param headers: Display the name of a file before its output
+    > return: Error code (ref. src\\errCodes.txt)
+    """
+    err      = comm.ERR_SUCCESS
+    notifier = Notifier([tf.path for tf in tailed])
+    last     = tailed[-1]
+    try:
+        while tailed:
+            notifier.wait()
+            for tf in tailed[:]:
+                try:
+                    # What was written before the file was replaced or
+                    # truncated comes first
+                    for _ in range(2):
+                        for data in tf.chunks():
+                            if not data:
+                                continue
+                            if headers and tf is not last:
+                                print(f"\n==> {tf.path} <==")
+                            last = tf
+                            _write_HELPER_TAIL(data)
+                        if (what := tf.check()) is None:
+                            break
+                        sys.stdout.flush()
+                        comm.WARN(f"File {what}; reading it from the start: "
+                                  f"\"{tf.path}\"", sl=4)
+                except UnicodeDecodeError:
+                    comm.ERR("Does not appear to contain text: "
+                             f"\"{tf.path}\"", sl=4)
+                    err = err or comm.ERR_CANTDECODE
+                    tailed.remove(tf)
+                    tf.close()
+            sys.stdout.flush()
+
+    except KeyboardInterrupt:
+        # Stops only the follow
+        print(comm.ANSIBLUE + "^C" + comm.ANSIRESET)
+
+    finally:
+        notifier.close()
+
+    return err
+
 
 def TAIL(varTable: dict[str, str], origPth: str, prevErr: int, cmd: str,
          args: dict[int, str], opts: dict[int, str], fullCmd: str,
          stream: ty.TextIO, op: str, debug: bool) -> int:
     """
-    Displays the last few lines of a file.
+    Displays the last few lines, or bytes, of files, and optionally keeps
+    displaying what is appended to them. The files are read backwards from
+    their ends, so that only the part displayed is read.
     > param varTable: Variable table
     > param origPth: Path to the interpreter
     > param prevErr: Previous error code
@@ -38,9 +280,13 @@ def TAIL(varTable: dict[str, str], origPth: str, prevErr: int, cmd: str,
     > param debug: Is debugging enabled?
     > return: Error code (ref. src\\errCodes.txt)
     """
+    tailed   : list[TailedFl]
     optVals   = comm.LOWERLT(opts.values())
-    validOpts = {'s', 'h', "-size", "-help"}
+    validOpts = {'s', 'c', 'f', 'h', "-size", "-bytes", "-follow", "-help"}
     peekSz    = None
+    byteMode  = False
+    follow    = False
+    tailed    = []
     err       = comm.ERR_SUCCESS
 
     if opts:
@@ -55,7 +301,7 @@ def TAIL(varTable: dict[str, str], origPth: str, prevErr: int, cmd: str,
             opt      = opts[pos]
             optLower = opt.lower()
 
-            if optLower == 's' or optLower == "-size":
+            if optLower in ('s', "-size", 'c', "-bytes"):
                 if peekSz is not None:
                     comm.ERR("Cannot specify peek size multiple times")
                     return comm.ERR_INCOPTUSAGE
@@ -73,38 +319,58 @@ def TAIL(varTable: dict[str, str], origPth: str, prevErr: int, cmd: str,
                 if peekSz < 0:
                     comm.ERR(f"Invalid peek size: '{peekSz}'")
                     return ERR_INVPEEKSZ
+                byteMode = optLower in ('c', "-bytes")
+
+            elif optLower == 'f' or optLower == "-follow":
+                follow = True
 
     # ! Size argument is already removed
-    if not args or len(args) > 1:
+    if not args:
         comm.ERR("Incorrect format")
         return comm.ERR_INCFORMAT
 
     if peekSz is None:
         peekSz = 5
 
-    fl = args[sorted(args)[0]]
+    fls = [args[pos] for pos in sorted(args)]
 
     try:
-        with open(fl, 'r', buffering=1) as f:
-            noOfLns = 1
-            for ln in f:
-                noOfLns += 1
-            f.seek(0)
-            for i, ln in enumerate(f):
-                if i < noOfLns - peekSz - 1:
-                    continue
-                print(ln, end='')
-
-    except FileNotFoundError:
-        comm.ERR(f"No such file: \"{fl}\"")
-        err = err or comm.ERR_NOFL
-
-    except UnicodeDecodeError:
-        comm.ERR(f"Does not appear to contain text: \"{fl}\"")
-        err = err or comm.ERR_CANTDECODE
-
-    except PermissionError:
-        comm.ERR(f"Access is denied: \"{fl}\"")
-        err = err or comm.ERR_PERMDENIED
+        for fl in fls:
+            try:
+                tf = TailedFl(fl, byteMode)
+            except FileNotFoundError:
+                comm.ERR(f"No such file: \"{fl}\"")
+                err = err or comm.ERR_NOFL
+                continue
+            except PermissionError:
+                comm.ERR(f"Access is denied: \"{fl}\"")
+                err = err or comm.ERR_PERMDENIED
+                continue
+            tailed.append(tf)
+
+            if len(fls) > 1:
+                print(('\n' if len(tailed) > 1 else '') + f"==> {fl} <==")
+            try:
+                if byteMode:
+                    tf.f.seek(max(tf.size - peekSz, 0))
+                else:
+                    tf.f.seek(_lnsStart_HELPER_TAIL(tf.f, tf.size, peekSz))
+                for data in tf.chunks():
+                    _write_HELPER_TAIL(data)
+                if not follow:
+                    _write_HELPER_TAIL(tf.end())
+            except UnicodeDecodeError:
+                comm.ERR(f"Does not appear to contain text: \"{fl}\"")
+                err = err or comm.ERR_CANTDECODE
+                tailed.pop().close()
+
+        if follow and tailed:
+            sys.stdout.flush()
+            tmp = _follow_HELPER_TAIL(tailed, len(fls) > 1)
+            err = err or tmp
+
+    finally:
+        for tf in tailed:
+            tf.close()
 
     return err
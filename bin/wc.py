@@ -6,9 +6,11 @@
 # Licensed under the Apache-2.0 License.
 #
 
+import codecs
 import os
 import sys
-import typing  as ty
+import concurrent.futures as cf
+import typing             as ty
 
 # Add src\\core to sys.path
 srcDir = os.path.dirname(os.path.dirname(__file__))
@@ -16,33 +18,170 @@ sys.path.insert(1, os.path.join(srcDir, "core"))
 import commons as comm
 sys.path.pop(1)
 
-helpStr = b"x\x9c]\x90\xbb\x0e\x820\x14\x86g\xceS\x9cQ\x13\xab\xbb\x1b!x\x19\x04ca2\x0c\xa5\x94KR\xc1\xb4%\x84\xc4\x87\xb7\xad\xca\xe0\xf2\xe5\xfc\xfd\x9a\xbf\x97\x88I>Jf\x04N\x83\xaa\x90\x0fco6(\xbb^\xfcf\xd6WX\xce\xe6\x9b\xb7\x009\r\x8f\xf1\x1e\'\x8ew\xd2\x16\x16\xdcar\x90\x05\xae\xb4Q\xf8BRc\xddI\xb1\x06\x08o\xc7\xfc\x12\'\x19\x05k \xa0Fu}\x83f\xc0R\xd8n&g-*p{!8X\xfe\x1bH\xaf\xd99M(\x10\x8e;$\x84\xb7Li\x08\"w\x19t\x81q#\xec\x8a=\xd0i_DZ?\xb7B>!8Y\xe2Ch\xcd\x1ak\xa47\xee}K\xc9\'\x90\xc9\x1b\xf7\x0b\x8b\xf1\xe1\r2\x8bZt"
+helpStr = (
+    b"x\x9c]Q=k\xc30\x14\x9c\xfd~\xc5\x8d-X\xee\xde\xcd\x844\xe9\xd0\xa4\xd4\t"
+    b"\x1dB\x069\x96#\x81\"\x19KA\x18\xfa\xe3\xab\x0f\x02\xa5\xcb!q\xef\xf4"
+    b"\xeeN+{7\xde\xc1K\x81~\xf1\xc2\xd5\x08v\x1e\x1c\xb8\x19\xa0\x95\x11\x0ev"
+    b"\x04\x87\xf3\xb32\xd7\x1a\x93\x9a\xc4\x00e\xa6\xbb\x87\x9d1*-\\Ct\xec"
+    b"\xda\xcd\xfa\x15\xe1\x82\x13\x93\xe7\x08}\x82\x90@\x9f\xf1\x14\xd5\xf8"
+    b"\x01\x1b\xf3<N\x19\x9b\xa69?\x13\xb5_\x9b\xe3\xc7zw\xe8(\x0eQ\xd5\xe5="
+    b"\xf0\x16\xbd\x88\x1e\xb8^\x9c\x18(\t\xa8zK\xb2\x7f\x0c\xed?\x0f\xef\xfb]"
+    b"G\xac\xc7\x0b\x18\xcb\x19\xa8Z\xa5T%\x10\xc5\xb5\x89)o\xb4EX\x8c\xc7\x1c"
+    b"\xce\x0b>\xfc\x8d\xd8\xe0[y\x89\x9b\x9d\xe3.\xc9\r\xac)\xd35\x04\xbfH"
+    b"\xaa\xb2y\xe5\xe0\xa4\r\x89\x85\x8a\xf5\xa5\xe3lC\x8d\xd1jmC\xac\xa8_r"
+    b"\xa7\xdez\xae\xa3\x07\x99=H\xa1'\xaa\xb6\x11q\x13\xce\xf1\xab \xa63\x93"
+    b"\xab~\xf8.\x17\x162\x93\xbf\xe3\xc1\xe4\xcb/\x98\xd9\x8cB"
+)
 
+# Bytes counted at a time, and the size past which files are counted on a
+# thread pool, while smaller ones are counted on the calling thread
+CHUNKSZ = 1 << 20
+PARSZ   = 1 << 24
+# Maps ASCII whitespace (as str.split() sees it) to ' ' and every other byte
+# to 'x', so that words in ASCII chunks are counted by where they start
+# without decoding them (ref. _count_HELPER_WC())
+WORDTBL = bytes(0x20 if chr(i).isspace() and i < 0x80 else 0x78
+                for i in range(256))
 
-def HELPER_WC(data: str, chars: bool, words: bool, lines: bool) -> list[str]:
+
+def HELPER_WC(counts: tuple[int, int, int], chars: bool, words: bool,
+              lines: bool) -> list[str]:
     """
-    Helper function to calculate word count, line count, and byte count.
-    > param data: String to be analysed
-    > param bytes_: Count bytes
-    > param words: Count words
-    > param lines: Count lines
+    Helper function to format word count, line count, and byte count.
+    > param counts: Tuple of the number of bytes, words and newlines (ref.
+                    _count_HELPER_WC())
+    > param chars: Show the byte count
+    > param words: Show the word count
+    > param lines: Show the line count
     > return: List of strings containing word count, line count, and byte count
     """
     toPrint = []
     if chars:
-        toPrint.append(f"b: {len(data.encode())}")
+        toPrint.append(f"b: {counts[0]}")
     if words:
-        toPrint.append(f"w: {len(data.split())}")
+        toPrint.append(f"w: {counts[1]}")
     if lines:
-        toPrint.append(f"l: {len(data.split('\n'))}")
+        toPrint.append(f"l: {counts[2] + 1}")
     return toPrint
 
 
+def _count_HELPER_WC(chunks: ty.Iterable[bytes], words: bool) \
+        -> tuple[int, int, int]:
+    """
+    Counts bytes, whitespace-separated words and newlines in data given a
+    chunk at a time, so that only one chunk is held at once. Words are split
+    on Unicode whitespace, as str.split() does; chunks that are not ASCII
+    are decoded as UTF-8 for it, a character split across chunks being
+    carried over to the next one.
+    > param chunks: The chunks (none of them empty)
+    > param words: Count words (the most expensive count)
+    > return: Tuple of the number of bytes, words and newlines
+    """
+    nBytes    = 0
+    nWords    = 0
+    newlines  = 0
+    prevSpace = True
+    decoder   = codecs.getincrementaldecoder("utf-8")("replace")
+
+    for chunk in chunks:
+        nBytes   += len(chunk)
+        newlines += chunk.count(b'\n')
+        if not words:
+            continue
+
+        if chunk.isascii() and not decoder.getstate()[0]:
+            mapped  = chunk.translate(WORDTBL)
+            nWords += mapped.count(b" x")
+            first   = mapped[0] == 0x78
+            last    = mapped[-1] == 0x20
+        else:
+            text = decoder.decode(chunk)
+            if not text:
+                continue
+            nWords += len(text.split())
+            # Counted above as a word starting the chunk
+            first   = not text[0].isspace()
+            nWords -= first
+            last    = text[-1].isspace()
+
+        # A word starting the chunk starts there only if the previous chunk
+        # did not end in the middle of it
+        if prevSpace and first:
+            nWords += 1
+        prevSpace = last
+
+    # An incomplete character at the end is a word character
+    if words and prevSpace and decoder.decode(b'', True):
+        nWords += 1
+
+    return nBytes, nWords, newlines
+
+
+def _countFl_HELPER_WC(fl: str, words: bool, lines: bool) \
+        -> tuple[int, int, int]:
+    """
+    Counts a file, read in binary a chunk at a time. When only bytes are
+    counted, the file is not read at all.
+    > param fl: Path to the file
+    > param words: Count words
+    > param lines: Count lines
+    > return: Tuple of the number of bytes, words and newlines
+    """
+    with open(fl, 'rb') as f:
+        if not words and not lines:
+            return os.fstat(f.fileno()).st_size, 0, 0
+        return _count_HELPER_WC(iter(lambda: f.read(CHUNKSZ), b''), words)
+
+
+def _countFls_HELPER_WC(fls: list[str], words: bool, lines: bool) \
+        -> list[tuple[int, int, int] | int]:
+    """
+    Counts files. Files of PARSZ bytes or more are counted on a thread pool,
+    in parallel with the rest, which are counted on this thread.
+    > param fls: Paths to the files
+    > param words: Count words
+    > param lines: Count lines
+    > return: List of the counts of each file (ref. _count_HELPER_WC()) or
+              integer error codes, in order
+    """
+    results: list[tuple[int, int, int] | int | cf.Future]
+    results = []
+    big     = []
+    for fl in fls:
+        try:
+            if os.path.getsize(fl) >= PARSZ:
+                big.append(len(results))
+        except OSError:
+            pass
+        results.append(fl)
+
+    with cf.ThreadPoolExecutor(min(len(big), os.cpu_count() or 1) or 1) \
+            as pool:
+        for i in big:
+            results[i] = pool.submit(_countFl_HELPER_WC, fls[i], words, lines)
+
+        for i, fl in enumerate(fls):
+            try:
+                if isinstance(results[i], cf.Future):
+                    results[i] = results[i].result()
+                else:
+                    results[i] = _countFl_HELPER_WC(fl, words, lines)
+            except (FileNotFoundError, IsADirectoryError):
+                comm.ERR(f"No such file: \"{fl}\"", sl=4)
+                results[i] = comm.ERR_NOFL
+            except PermissionError:
+                comm.ERR(f"Access is denied: \"{fl}\"", sl=4)
+                results[i] = comm.ERR_PERMDENIED
+
+    return results
+
+
+@comm.RAWPIPE
 def WC(varTable: dict[str, str], origPth: str, prevErr: int, cmd: str,
        args: dict[int, str], opts: dict[int, str], fullCmd: str,
        stream: ty.TextIO, op: str, debug: bool) -> int:
     """
-    Checks for the existance of a path.
+    Counts the bytes, words and lines of a string, piped input or files.
     > param varTable: Variable table
     > param origPth: Path to the interpreter
     > param prevErr: Previous error code
@@ -62,7 +201,7 @@ def WC(varTable: dict[str, str], origPth: str, prevErr: int, cmd: str,
     words      = False
     lines      = False
     isFl       = False
-    toPrint    = []
+    err        = comm.ERR_SUCCESS
 
     if opts:
         if tmp := (set(optVals) - validOpts):
@@ -81,44 +220,47 @@ def WC(varTable: dict[str, str], origPth: str, prevErr: int, cmd: str,
             elif opt == 'w' or opt == "-words":
                 words = True
             elif opt == 'f' or opt == "-file":
-                if isFl:
-                    comm.ERR(f"Cannot accept multiple files")
-                    return comm.ERR_INCOPTUSAGE
                 if pos + 1 not in args:
                     comm.ERR(f"Missing argument for -{opt}: file")
                     return comm.ERR_INCOPTUSAGE
-                txtOrFl = args[pos + 1]
-                isFl    = True
+                isFl = True
 
     if not bytes_ and not words and not lines:
         bytes_ = True
         words  = True
         lines  = True
 
-    if not args or len(args) != 1:
+    if not args or (not isFl and len(args) != 1):
         comm.ERR("Incorrect format")
         return comm.ERR_INCFORMAT
 
-    if 'f' not in optVals and "-file" not in optVals:
-        txtOrFl = args[sorted(args)[0]]
+    if not isFl:
+        data = args[sorted(args)[0]]
+        if isinstance(data, comm.PipeData):
+            # Piped payloads are counted on the raw bytes; nothing is decoded
+            view   = data.bytes()
+            chunks = (bytes(view[i:i + CHUNKSZ])
+                      for i in range(0, len(view), CHUNKSZ))
+        else:
+            chunks = [data.encode()] if data else []
+        print("; ".join(HELPER_WC(_count_HELPER_WC(chunks, words), bytes_,
+                                  words, lines)))
+        return comm.ERR_SUCCESS
 
-    if isFl:
-        if not os.path.isfile(txtOrFl):
-            comm.ERR(f"No such file: \"{txtOrFl}\"")
-            return comm.ERR_NOFL
-        try:
-            with open(txtOrFl, buffering=1) as f:
-                data = f.read()
-        except PermissionError:
-            comm.ERR(f"Access is denied: \"{txtOrFl}\"")
-            return comm.ERR_PERMDENIED
-        except UnicodeDecodeError:
-            comm.ERR(f"Cannot decode file: \"{txtOrFl}\"")
-            return comm.ERR_CANTDECODE
-
-    else:
-        data = txtOrFl
-
-    toPrint = HELPER_WC(data, bytes_, words, lines)
-    print("; ".join(toPrint))
-    return comm.ERR_SUCCESS
+    fls    = [args[pos] for pos in sorted(args)]
+    total  = [0, 0, 0]
+    nFls   = 0
+    for fl, counts in zip(fls, _countFls_HELPER_WC(fls, words, lines)):
+        if isinstance(counts, int):
+            err = err or counts
+            continue
+        row = "; ".join(HELPER_WC(counts, bytes_, words, lines))
+        print(row if len(fls) == 1 else f"{fl}: {row}")
+        total  = [total[i] + counts[i] for i in range(3)]
+        nFls  += 1
+
+    if len(fls) > 1:
+        # Each file's line count includes its last, unterminated line
+        total[2] += nFls - 1
+        print(f"total: {'; '.join(HELPER_WC(total, bytes_, words, lines))}")
+    return err
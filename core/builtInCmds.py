@@ -11,17 +11,22 @@
 #
 
 import os
+import re
+import bisect
 import sys
 import ctypes     as ct
 import datetime   as dt
+import gzip
 import importlib  as il
 import pathlib    as pl
+import logging    as lg
 import msvcrt     as ms
 import subprocess as sp
 import timeit     as ti
 import typing     as ty
 import zlib       as zl
 import commons    as comm
+import parser     as par
 if ty.TYPE_CHECKING:
     import comet
 
@@ -115,6 +120,43 @@ class HelpTxts:
             b"f\xa4\xe6\x14p)\x00\x81\x07\x90\xa1\x90\x9bZ\\\x9c\x98\x9e\n\x00"
             b"U\x15\x16("
         )
+        self.helpFOR         = (
+            b"x\x9c]\x91\xc1j\xc30\x10D\xef\xfb\x15sl!v\xef\xcd%\xa1\x844\x87:"
+            b"%qN!\x07\xd9Y\xdb\xa2\xb6d$\xdb\x10J\xff\xbd\xbbN\xa1\xa5>\x08"
+            b"\xa1\x9dy\x9a\x91\x0f\xa3\x8b0(Z_~\xc0\xbb\x92Q\xf9\x00\x9e8\xdc"
+            b"`\x07\xeeP\xdb\x89\xdd\x02r\xf8;h\xadc\xf4\xb6\xe7+\x06/\xb2\x94"
+            b"\xe8t\\o7\xcf\xb3\xe6\x9c4\x178\xd31\xce\xd6\xdd!i\x9a^\xf0Y\xf8"
+            b"\xeb\xed\x8bh}\xd8\x9e\xde6Y~$\x15\x11\xe4\xcbT\xed+\x0c\r\xa3"
+            b"\xf5\xbe\xc7d\x825E\xcbK\x98\xb2\xe4\x18\x05\x03\x13\xb1R\xc7\n"
+            b"\x82U\xa5\xf2H\xf93c\xa7\x17I\x9c\xd9\xef%\xe7\xf2'\xa2\xa6\x95"
+            b"\x8e\xe1\x8e\x96\x03\x1d\xc2T\x83\xac\x8aQB\xbc\xf7\xa4\x19\xa9"
+            b"\xb4\x17\xdfu\xc6]\xa3\x12\xc3\xe8\x84eBT\xaf<\xd1\x02\x05KQ\x9e"
+            b"\xdd\x95\rqPF0\x83\xf5\x8eh\xff\x9e\xef\xf6\xd9\x91\x92\x06OH"
+            b"\x92\x86\xdb~&\xbe\xca\x06\x9dt15\x13e\xfb|C\xf9\xff\xba\xa8y"
+            b"\x88(\x8c\xfc\x0b+\x9b>\xf0d\xfd\x18e\xde\x8e\x8c\x07[\xc1\xb8"
+            b"\xdb\xe3\x9f\xec\xeaN\xbf\x01\xcf%\x96\x85"
+        )
+        self.helpFUNC        = (
+            b"x\x9c]R\xc1N\x1b1\x10\xbd\xfb+\xde\x11\xa4\xecr/\x17\x10\x8d\x80"
+            b"C\x13D\x828\xa0\xa8\x9a\xec\xcef\xadz\xed\x95\xc7\x1b\x8a\xda"
+            b"\xfe{\xc7\xa6M\x08>\x8cF\xf3\xec7o\xde\xf8+w\xd6\xb3\xcc\xe0\xac"
+            b"$\x01\xf9\x16\x91\x87\xb0g\xc1$\x1c\xab\xb6\xe0-\xba\xc97\xc9"
+            b"\x06/\xb51O\xab\xeb\xdb\xf9\x97R\xc2K\xd5o4\x88\x06O\x03\xe3e"
+            b"\xa4H\x03\xea\xba\xde\xe0\xd76\xb4o\x7f6\xf8\x8d*\xa2\xa0Z6\xe6"
+            b"\xfa\xf1\xf6\xe9\xdb|\xb1^\x99\\3\xd0\xb3\xc8`\xe8\x90z>t2\x85"
+            b"\xe9\x04&\x94\x1a'\x8e\x97\xa0\xa6a\x11\xd8\x04\x12\\\x15\xe0\n"
+            b"\xd6\x17\x8e\xdc\xd8\x94\x90\x9f\xdf\x84a\xd0\xc1\x04) N\xfe2"
+            b"\xb3\x88\xce\x14|\xc33\xbc\xf6\xecO\x1a\xc3\n\xfe\x8dm\xcc\xf2a}"
+            b"\xbf\\\xacL\xd5\xe3\x02U\xd5\xb3\x1b\x0b\xe7\x9d&\x18T\x00\xed"
+            b"\xd8TR@\xa1\xfd\xfb8+MN)\xb5\xf3\xf7\xa3\x85\xe9g\x9a\xe5\xd2"
+            b"\x96\xe1\x02\xb5*\x85\x12$QL\xd3h\xd4\xabL\xf6\xbe\x85B\xf7X\xd2"
+            b"\xe3\np\xd6\xc50|\"\xcc.\xbc\xb2s3\xd8\x0eYI{n\xccb\xb9\x9e\x9bg"
+            b"\x9bz\xf8\x00\x8a\xbbi`\x9ft\xd9\x1f\xb5\x1d\x86\xd5\x0b\\\xbe"
+            b"\x01\xb7\xb5y\xb0\xa3V\xac\x1f\xa7\x94\xfd\x18I\xb2c\xaa\x99\x8e"
+            b"CQv_\xe0H\xd2\x81\\_\xfe_\x91`\xc7\t[j~\xe4~6b\x8c\xbc\xb7a\x12"
+            b"\xec\xc9M\xfa\xc1\xceT)\xf9\xb7sP\xa7\xd7\x95\xb9!\xe7\xea\xbf\r"
+            b"/\xdc-"
+        )
         self.helpGET         = (
             b"x\x9c-\x8b\xb1\x0e\x820\x18\x84\xf7\xff)ns\xaa\xeen\x0c\xa4:\x08"
             b"\xc6\x82\x0ba(x\x01\x92\x8a\xa4\xad>\xbf\x7f\x8c7\\\xee\x92\xef"
@@ -124,12 +166,18 @@ class HelpTxts:
             b"\xca\x89\x99q\x8013\xc3\xf6\x13N:\xf0T\xc8O\xfc\x02\xa8\n+\xee"
         )
         self.helpHELP        = (
-            b"x\x9cs\xc9,.\xc8I\xac,V(\xc9HU\xc8H\xcd)P\xc8M\xcd+\xd5\xe3\xe2"
-            b"\n\rvtw\xb5\x82\x08E\xebf\xc4*D\'\xe7\xe7\xe6&\xe6\xa5(\xe8\xe9"
-            b"\xe9\xc5rq9\x06\xb9\x87\xfa\xba\xfa\x85\x04sA\xc5\xb9\x14\x80\xc0"
-            b"\x19\xaa\xa6$_!\x05b2\xc4\x84\x92\xd4\x8a\x12\x85\xb4\xfc\"..\xff"
-            b"\x80\x10O\x7f\xbf`.\xdd\x0c\x05}\x05]]\x90,X\xa7\x07\xc4\xee\xe2"
-            b"\xe2\xc4\xf4T\x00\xd3h.d"
+            b"x\x9ce\x90Mj\x031\x0c\x85\xf7:\x85.\xe0\xe9\xbe\xbb\x90\x84\xb4"
+            b"\xd0&\xa5\x93\xacJ\x16n\xac\x89\r3\xb6\xb1<\xf9\x81\x1e\xbe\x1e"
+            b"\xdb\x03\r\xf5B\xa0\x87\xf4\xbd'\xaf\x0c\xfb^\xde\x19\xa3&\xd4"
+            b"\xd4{\x1c\xc8\x8e\r\xc0\xa1]l\xd6\xcfE\xfa\x12\xfa\x98\xca\x98"
+            b"\xca\xc9\r\x83\xb4\n\x9b\xa6\xc1\x1f\x14\x1e}\xa0\xce\xdc\xa6"
+            b"\xfe\x08\xb0\xf8\xdc\x1c\xde\xd7\xdb}\x0bu\x0e0\xbde\xdd\x89\x0e"
+            b"U\xb1+\xd8H\xb7\x88\x9d\x0bP\x18y\xb6\x8d2Dt]\xcec\xe5@<7\x95"
+            b"\xc8\x13\xe6\x9b\xb07\x1cI\x01\xec>\xf6\xaf\xbbm\x0b)\xca\x13\n"
+            b"\xf1\x07\xf5\x96&\x1e7\xaf\xda\xf1L\xe5lt5Q\xa3\xb4\xf7\xd9\xe4l"
+            b".d\xebM\xc4 \xc6\x0c\x1dY\x9e\xe9\x91\x99\xa5\x7f\xd1\x8cM\xa1"
+            b"\xa4\xaa\xba\t\xa8\x88O\xc1\xf8h\x9cM4\x9di\xd3\xed\x19\xf6R\xbe"
+            b"\x9b'\xd4/9\x1c\x806"
         )
         self.helpINTRO       = (
             b"x\x9cs\xc9,.\xc8I\xac,V(\xc9HU(.I,*)-\x00\xd2E\x99y\xe9z\\\\\xa1"
@@ -138,12 +186,31 @@ class HelpTxts:
             b"\xe4\xa6\x16\x17'\xa6\xa7\x02\x00\xb6\xc3\x1a\xa8"
         )
         self.helpLOG         = (
-            b"x\x9c\xf3M\xccKLOU(\xc9HU\xc8\xc9OWH\xcb\xccI\xd5\xe3\xe2\n\rvtw"
-            b"\xb5\x02\x8bD\xebf\xc4\x02\x89d\x85\x1a\x05\xdd\xe2X..\xff\x80"
-            b"\x10O\x7f\xbf`.\xa0\x88\xbe\x82\xaenrNjb\x11\x97\x02\x10\x84\x14"
-            b"\x95\xe6%'\x96\xa0\x9a\xc5\xa5[\x0cVV\x9cY\x95\nV\xe5\x92Y\\\x90"
-            b"\x93X\tV\x04\x12T\xc8OC\xd3\x90\x01\xd6\x90\x91\x9aS\x00\xd6\xe0"
-            b"\x01d(\xe4\xa6\x16\x17\x03\x9d\t\x00d\xd33\xb9"
+            b"x\x9c\x8dTQo\xda0\x10~\xf7\xaf\xb8G\x90p\x80v\x9d&\xde\x90\x16mH"
+            b"-T#\xddK\xc5\x83I.\x895\xc7\x8elCG\xb5\x1f\xbf\xb3CJ\xe8Ti<X>"
+            b"\xdb\xdf\xdd}\xdfw\xe1AhQ!\xf8\x1aA\x99\nJ\xa90a\xeci\xbb\xfc"
+            b"\x96.\xe2\xc93\xafw\xb4\xe4\xf0\x07\xb8\xa3\xe5\x99s'u\x8e\x90"
+            b"\xad\x1e\xd2p\xc3\x0f\xdaKu\t\x15\x1eQ\xc1}\xfa3\xbd\xdf1\xb8"
+            b"\xfc\xe8\xaa\xb2\xd8\xc2\xe32\xcb\xd2\x1f\xeb\xdd\x8e\xb1\xcdc"
+            b"\xb6\xda\xac\xb7\x8c\xb2O\x81\xf3\\\xa1\xb0\x11\x926\xad?]5\x05B"
+            b"\x17`\xb11G\x04\xe9\x1d\x08\x9b\xd7\xf2\x88\x8eQS\x01\xeb\xe4+F"
+            b"\xe8W\xe9Z%:\xb07^(\x08W`\xca\x7f\xd3]\xe7\x19\xd0\xbaJd\xb4:Q"
+            b"\xe5\xdc\xd8\xc2\x05|\x85\x05\x08\x0f\xc6\x82(=\xda\x0e0T\xe1?"
+            b"\xd1{,\x8d\xc5\x1e>P\xedc<\x91\x18\xbc\x83Q\x81\xfbC5\x01\xa9K3"
+            b"\x81\x17a\xb5\xd4\x14\xa2\xb5\x94\xdetJ\xe6Vz\x99\x0b5\x0e%kY"
+            b"\xd5h\xd9\xb5\x11\x1f\x97\xcb\x8d\xf6B\x86\xa4 \xa0\x11>\xaf{"
+            b"\x19-V\x07%,\xe0\xef\xd6\xa2s\xd2\xe8\x98\xe5\x9c\x11F\xb9p\xc8"
+            b"\x1djG\xc5\x8f8f\xbc\x8e&\xd5\xa8\xda\xf8\xf0;m\xa0!$\xcd\x1ec"
+            b"\xebM\x96\xb2l\xe8\x8e|3\xa6\x80Q\xf5*[\x9e\x9b&\x96\xc2\x82\x98"
+            b"\x04\x9f\xa4\x87\xca\x9a\x17\x07\xadp>6\x15}v\xe8\xd9\xfemt\xfa#"
+            b"\x1f\x85!\x05\x82\xe5F\x15H\x90\x8e%Tx>\xb2\x04\x12:\xa0\nqr\x10"
+            b"\x96\x84Q\xd4O\x08\x0c6\x08\xbf\xb0\xf5\t\xf4M\xbf\x9f\xa6\xf8"
+            b"\xa4\xe84\xc5\x82\x9d+\x96\xd2:\x9f\xb0\xe0xd\xa8a\xb5\xdd\xc0"
+            b"\x97\xcf\xb39U\xf3q&\xa7\xd4\xa3\x97\r\xd1\x0b\x9d\x90o1\x9a\x80"
+            b";\x90\xf8\xc2\xc1\xcd\xec\xe6\x8e\xcf\xe6\xfcv>a\x97}6\xbf]|\xba"
+            b"[\xccf\x81b\xdc\xc3\xc8\x1bb0N`\xd9\xb7d\x0e\xde\xc9\xa2\xfb\xd4"
+            b"\xcf\xc3>=\x8f-\xb3B\xd3\x9f@hZ\x9b\xa0\x8c(&\x91\x93\x7fg\xca^j"
+            b"aO\xa4h J\xde\xd0\x04\xf7\xb9\x92\xbf\xa8\xc3d\x88"
         )
         self.helpOOPS        = (
             b"x\x9c=\xcc1\x0e\xc20\x0cF\xe1\xdd\xa7\xf8\x0f@9\x00L\x0cU7\x90"
@@ -179,6 +246,17 @@ class HelpTxts:
             b"\x10O\x7f\xbf`.\xdd\x0c\x05}\x05]\xdd\x8c\xd4\x9c\x02.\x05 \xf0"
             b"\x002\x14rS\x8b\x8b\x13\xd3S\x017\xd2\x1e\xb5"
         )
+        self.helpREPEAT      = (
+            b"x\x9cU\x8d\xbd\n\xc2@\x10\x84\xfb}\x8ay\x00\xa3\xbdV\"\xa2\x16F1"
+            b"Z\x89\xc5%\xd9\xe4\x0e\xcdm\xb8\x1fA\xc4w79\xb0p\x8b\xdda\x98"
+            b"\xf9\xf6\x14\xad\x87B\xf9\x90\xea>\xdc\xd6<\xd9\xc2\xc6\xaed\x07"
+            b"i\x10L\xc7~Jt)\x96\x9b\xf5\x1c\x8e{V\x01\xd7L\xdfPI\xb4\x01\xefR"
+            b"\xea\xd7\x87hy\xda\\\xf6\xeb\xfc\\P\xf2\t\xc3\xe4\xff\x18\x04"
+            b"\x81\x8b\x16A3\xc6\x16\xa55\x06W\xd2u\xca\xd6\xbf\xc4\x02\xbdr"
+            b"\x9ek\x88\xadx\x82\x92\x1bq\x9cj\x8dq>\xc0\x04v*\x18\xb1D\x87"
+            b"\xe3yw\xc8\x0b\xca4f\xc82\xcd\x8f>\x11\xb7\x83\xc0\xf0\xd3\xab"
+            b"\x96\xbf^[J\x16"
+        )
         self.helpRUNPATH     = (
             b"x\x9c\x0b(\xca\xcc+Q(\xc9HU(H,\xc9PH+\xca\xcfU(\xcfH-J\x05\x8b"
             b"\x01\xe5R\x8b\n\x8aR\x81\xa4Bf\xb1BQi^^f^\xba\x1e\x17Wh\xb0\xa3"
@@ -218,6 +296,13 @@ class HelpTxts:
             b"\x98I\xdc\xa3g\x07\x89\x1d\x96\x0b\xd9^\"\x97dg9j\x9a9\xcf\x0c"
             b"\x9a\xc0\"Ic\xdb\xff\x00\xac\xf5\xbcB"
         )
+        self.helpSYNC        = (
+            b"x\x9c\x0b/\xca,I-V\xc8/-QH\xccKQH\xce\xc9/\x06r\xd32s\x80dvjA"
+            b"\x89B~Aj\x9eBR%HE\x01PQQjJfQjrIf~\x9e\x1e\x17Wh\xb0\xa3\xbb\xab"
+            b"\x95Bqe^\xb2B\xb4nF,\x17\x97\x7f@\x88\xa7\xbf_0\x97n\x86\x82\xbe"
+            b"\x82\xaenFjN\x01\x97\x02\x10x\x00\x19\n\xb9\xa9\xc5\xc5\x89\xe9"
+            b"\xa9\x002\xfc%\xf4"
+        )
         self.helpTIME        = (
             b"x\x9cs\xc9,.\xc8I\xac,V(\xc9HUH.-*J\xcd+Q(\xae,.I\xcdU(\xc9\xcc"
             b"M\xd5\xe3\xe2\n\rvtw\xb5\x02\xf3\x14\xa2u3b\xb9\xb8\xfc\x03B<\xfd"
@@ -257,6 +342,173 @@ class HelpTxts:
             b"\x17\x97\x7f@\x88\xa7\xbf_0\x97n\x86\x82\xbe\x82\xaenFjN\x01X\xb1"
             b"KfqANb\xa5\x02H@!7\xb5\xb881=\x15\x00\x98\xde*{"
         )
+        self.helpWHILE       = (
+            b"x\x9cU\x8eAO\x021\x10\x85\xef\xf3+\xdeQ\x13W=\xcb\x89\x18\x82"
+            b"\x1e\x04\xc3\xc2\xc9x(\xdda\xdb\xb8\xdb\xd9t\xba\x1aB\xf8\xef"
+            b"\xb6\x88\x18\xe7\xd2\xc9\xf4\xe5}\xdfj\x0c\n\x83m'\xf6\x03;\x890"
+            b"\x8aNB[^\x03+\xa1\xf1\xc9K8\x07t\xb4\x96\xb9\xd1[\xa2M=\x9d\xcf"
+            b"\x1e\xf0\xe5|\xc7x\xab\xdc;\x0e\x97\xf4\x11\x87\xad4\xfb#\xd1t5"
+            b"\xdf\xbc\xcc\x16\xeb\x9a.\x9f\x84<\x8f\xd2\xf7&4\x8a8\xe6n\xce`"
+            b"\x06\x7fr\xdc\xc3'\x8e\xa6\xe4&H\x8e\xb3\x8b\x0ch\x85\x15Y\xe2"
+            b"\x07\x96\xcf\xca\xa7\x96\xb3\x0e\xae8\xc6\xacn\xa5a\xdc_Sa\xff"
+            b"\xa7$)\xa0\t\x06\x135\xe7%X\xbe\xf9\xc5\x16\xca\xceGM\x7fh\xa2"
+            b"\xe5\xeb\xfay\xb9\xa8\xa9r\xb8CU9\xee\x86S\xe3S^\xd0\xb3\xaai"
+            b"\xf9\x1b2JiU"
+        )
+
+
+class HelpIndex:
+    """
+    Index of the commands and their help strings, for the help command. The
+    built-in commands are indexed once; commands in src\\bin are indexed
+    again only when their files change. The first and usage lines of every
+    help string are kept, and the full text is decompressed only when it is
+    asked for, once.
+    """
+    # Built-in commands left out of the index
+    HIDDEN = {"ABIRAM", "AMIT", "NABHAN"}
+
+    def __init__(self, bltIns: "BuiltInCmds") -> None:
+        self.bltIns  = bltIns
+        self.entries : dict[str, tuple[str, str, bytes | None]] = {}
+        self.stamps  : dict[str, int] = {}
+        self.names   : list[str] | None = None
+        self.texts   : dict[str, str] = {}
+        self.maxLen  = 0
+
+        for attr in dir(bltIns):
+            if not attr.isupper() or attr.startswith("ERR_") \
+                    or attr in self.HIDDEN:
+                continue
+            self._add(attr.lower(), getattr(bltIns, "help" + attr, None))
+        self.bltInNms = set(self.entries)
+
+    def _add(self, name: str, helpBytes: ty.Any) -> None:
+        """
+        Add a command to the index.
+        > param name: Name of the command (lowercase)
+        > param helpBytes: Compressed help string of the command, if any
+        """
+        self.texts.pop(name, None)
+        if helpBytes is None:
+            self.entries[name] = '-', '-', None
+            return
+        if not isinstance(helpBytes, bytes):
+            comm.ERR(f"Invalid help string: '{name}'", sl=6)
+            self.entries[name] = "[INVALID]", "[INVALID USAGE STR]", None
+            return
+
+        lines = self._head(helpBytes).split('\n')
+        usage = next((ln for ln in lines if ln.upper().startswith("USAGE: ")),
+                     "[INVALID USAGE STR]")
+        self.entries[name] = lines[0], usage[7:], helpBytes
+
+    def _head(self, helpBytes: bytes) -> str:
+        """
+        Decompress a help string only as far as its usage line.
+        > param helpBytes: Compressed help string
+        > return: Start of the help string
+        """
+        dcmp = zl.decompressobj()
+        head = b''
+        data = helpBytes
+        try:
+            while data:
+                head += dcmp.decompress(data, comm.HELPHEADSZ)
+                data  = dcmp.unconsumed_tail
+                if (i := head.upper().find(b"\nUSAGE: ")) != -1 \
+                        and b'\n' in head[i + 1:]:
+                    break
+        except zl.error:
+            comm.CRIT(f"Decompression failed: \"{helpBytes}\"",
+                      comm.GETEXC())
+        return head.decode("utf-8", "replace")
+
+    def refresh(self) -> None:
+        """
+        Re-index the commands in src\\bin that were added, changed or
+        removed since the last refresh.
+        """
+        found: dict[str, int] = {}
+        try:
+            for fl in os.scandir(comm.BINDIR):
+                nm, ext = os.path.splitext(fl.name)
+                if ext.lower() in (".py", ".pyd") and fl.is_file():
+                    found[nm.lower()] = fl.stat().st_mtime_ns
+        # Dir "bin" does not exist
+        except FileNotFoundError:
+            pass
+
+        if found == self.stamps:
+            return
+
+        for nm in self.stamps.keys() - found.keys():
+            if nm not in self.bltInNms:
+                self.entries.pop(nm, None)
+                self.texts.pop(nm, None)
+
+        for nm, stamp in found.items():
+            if self.stamps.get(nm) == stamp or nm in self.bltInNms:
+                continue
+            self.entries.pop(nm, None)
+            try:
+                mod, err = comm.LDBINMOD(nm)
+                if err:
+                    if err == -1:
+                        comm.UNERR(f"Failed to import module: '{nm}'")
+                    continue
+                # Module MUST have a func with cmd name in uppercase to be
+                # recognised as a cmd
+                if hasattr(mod, nm.upper()):
+                    self._add(nm, getattr(mod, "helpStr", None))
+
+            except FileNotFoundError:
+                comm.INFO("Whoa. Command file was pulled out right from "
+                          f"under the interpreter! \"{nm}\"")
+
+            except (AttributeError, ImportError):
+                comm.INFO("Filename suggests a command file, but necessary "
+                          "conditions to be a command were not satisfied. "
+                          "Please check")
+
+        self.stamps = found
+        self.names  = None
+
+    def sortedNames(self) -> list[str]:
+        """
+        The names of all indexed commands, sorted.
+        > return: List of command names
+        """
+        if self.names is None:
+            self.names  = sorted(self.entries)
+            self.maxLen = max(map(len, self.names), default=0)
+        return self.names
+
+    def search(self, prefix: str) -> list[str]:
+        """
+        The names of the indexed commands starting with a prefix.
+        > param prefix: The prefix (case-insensitive)
+        > return: Sorted list of command names
+        """
+        names  = self.sortedNames()
+        prefix = prefix.lower()
+        lo     = bisect.bisect_left(names, prefix)
+        hi     = bisect.bisect_left(names, prefix + chr(0x10ffff), lo)
+        return names[lo:hi]
+
+    def text(self, name: str) -> str | None:
+        """
+        The full help string of a command.
+        > param name: Name of the command (case-insensitive)
+        > return: The help string, or None if the command has none
+        """
+        name = name.lower()
+        if (txt := self.texts.get(name)) is None:
+            entry = self.entries.get(name)
+            if entry is None or entry[2] is None:
+                return None
+            txt = self.texts[name] = comm.DECOMPSTR(entry[2])
+        return txt
 
 
 class BuiltInCmds(HelpTxts):
@@ -286,6 +538,15 @@ class BuiltInCmds(HelpTxts):
         self.ERR_CANTSORT    = 115
         self.ERR_DIDNTFAIL   = 116
         self.ERR_OOPSRERUN   = 117
+        self.ERR_INVREPCNT   = 135
+        self.ERR_NOSUCHFUNC  = 136
+        self.ERR_INVLOGTIME  = 137
+        self.ERR_INVLOGLVL   = 138
+        self.ERR_INVLOGPTTRN = 139
+
+        self.logIdx  = comm.LogIndex()
+        # Built on first use (ref. HELP)
+        self.helpIdx : HelpIndex | None = None
 
     def ABOUT(self, varTable: dict[str, str], origPth: str, prevErr: int,
               cmd: str, args: dict[int, str], opts: dict[int, str],
@@ -586,6 +847,160 @@ class BuiltInCmds(HelpTxts):
         # Blarghhh
         raise EOFError
 
+    def _loopVar_HELPER(self, name: str) -> tuple[str, str | None]:
+        """
+        Helper function for the loop commands; gets the key of the loop
+        variable in the variable table.
+        > param name: Name of the loop variable
+        > return: Key of the variable, and its value before the loop (None
+                  if it did not exist)
+        """
+        if keys := comm.DICTSRCH(name, self.intrp.varTable, caseIn=True,
+                                 returnMode="keys"):
+            return keys[0], self.intrp.varTable[keys[0]]
+        return name, None
+
+    def _items_FOR_HELPER(self, items: list[str],
+                          piped: list[comm.PipeData]) -> ty.Iterator[str]:
+        """
+        Helper function for the for command; yields the items given, then
+        the piped lines, decoding each line only when it is reached.
+        > param items: Items given as arguments
+        > param piped: Piped input
+        > return: Generator of items
+        """
+        yield from items
+        for data in piped:
+            for line in data.lines():
+                yield line.text()
+
+    @comm.RAWPIPE
+    def FOR(self, varTable: dict[str, str], origPth: str, prevErr: int,
+            cmd: str, args: dict[int, str], opts: dict[int, str],
+            fullCmd: str, stream: ty.TextIO, op: str, debug: bool) -> int:
+        "Runs a block once for every item given, or for every piped line."
+        optVals   = comm.LOWERLT(opts.values())
+        validOpts = {'h', "-help"}
+        # All entries must be in lowercase
+        protected = {"error", "ud"}
+        err       = comm.ERR_SUCCESS
+
+        if opts:
+            if tmp := (set(optVals) - validOpts):
+                comm.ERR(f"Unknown option(s): {comm.OPTSJOIN(tmp)}")
+                return comm.ERR_UNKNOPTS
+            if 'h' in optVals or "-help" in optVals:
+                print(comm.DECOMPSTR(self.helpFOR))
+                return comm.ERR_SUCCESS
+
+        argVals = [args[pos] for pos in sorted(args)]
+        blocks  = [pos for pos, arg in enumerate(argVals)
+                   if isinstance(arg, par.Block)]
+        if len(blocks) != 1:
+            comm.ERR("Incorrect format")
+            return comm.ERR_INCFORMAT
+
+        head  = argVals[:blocks[0]]
+        piped = argVals[blocks[0]+1:]
+        if not head or (len(head) > 1 and head[1].lower() != "in") \
+                or not all(isinstance(i, comm.PipeData) for i in piped):
+            comm.ERR("Incorrect format")
+            return comm.ERR_INCFORMAT
+
+        if head[0].lower() in protected:
+            comm.ERR(f"Operation not allowed; cannot edit var '{head[0]}'")
+            return self.ERR_PROTVAREDIT
+
+        compiled = self.intrp.compile(argVals[blocks[0]])
+        if isinstance(compiled, int):
+            return compiled
+
+        key, prevVal = self._loopVar_HELPER(head[0])
+        try:
+            for item in self._items_FOR_HELPER(head[2:], piped):
+                self.intrp.varTable[key] = item
+                tmp = self.intrp.runCompiled(compiled)
+                err = err or tmp
+        finally:
+            if prevVal is None:
+                self.intrp.varTable.pop(key, None)
+            else:
+                self.intrp.varTable[key] = prevVal
+
+        return err
+
+    def FUNC(self, varTable: dict[str, str], origPth: str, prevErr: int,
+             cmd: str, args: dict[int, str], opts: dict[int, str],
+             fullCmd: str, stream: ty.TextIO, op: str, debug: bool) -> int:
+        "Defines, lists and removes user-defined functions."
+        optVals   = comm.LOWERLT(opts.values())
+        validOpts = {'s', 'r', 'h', "-save", "-remove", "-help"}
+        save      = False
+        remove    = False
+        err       = comm.ERR_SUCCESS
+
+        if opts:
+            if tmp := (set(optVals) - validOpts):
+                comm.ERR(f"Unknown option(s): {comm.OPTSJOIN(tmp)}")
+                return comm.ERR_UNKNOPTS
+            if 'h' in optVals or "-help" in optVals:
+                print(comm.DECOMPSTR(self.helpFUNC))
+                return comm.ERR_SUCCESS
+            for opt in optVals:
+                if opt in ('s', "-save"):
+                    save = True
+                elif opt in ('r', "-remove"):
+                    remove = True
+
+        if save and remove:
+            comm.ERR("Options -s and -r cannot be used together")
+            return comm.ERR_INCOPTUSAGE
+
+        argVals = [args[pos] for pos in sorted(args)]
+
+        if remove:
+            if not argVals:
+                comm.ERR("Incorrect format")
+                return comm.ERR_INCFORMAT
+            saved = False
+            for arg in argVals:
+                if (func := self.intrp.rmFunc(arg)) is None:
+                    comm.ERR(f"No such function: '{arg}'")
+                    err = err or self.ERR_NOSUCHFUNC
+                    continue
+                saved = saved or func.saved
+            if saved:
+                tmp = self.intrp.saveFuncs()
+                err = err or tmp
+            return err
+
+        if not argVals:
+            if save:
+                comm.ERR("Incorrect format")
+                return comm.ERR_INCFORMAT
+            for func in sorted(self.intrp.funcs.values(),
+                               key=lambda func: func.name.lower()):
+                print(func.definition())
+            return comm.ERR_SUCCESS
+
+        if len(argVals) < 2:
+            comm.ERR("Incorrect format")
+            return comm.ERR_INCFORMAT
+
+        prevFunc = self.intrp.funcs.get(argVals[0].lower())
+        if err := self.intrp.defFunc(argVals[0], argVals[1:-1], argVals[-1],
+                                     saved=save):
+            if err == comm.ERR_INVFUNCDEF:
+                comm.ERR("Invalid function definition; the name and "
+                         "parameters should have only letters, and be "
+                         "followed by a block")
+            return err
+
+        # A saved function redefined without -s is dropped from the file
+        if save or (prevFunc is not None and prevFunc.saved):
+            return self.intrp.saveFuncs()
+        return comm.ERR_SUCCESS
+
     def GET(self, varTable: dict[str, str], origPth: str, prevErr: int,
             cmd: str, args: dict[int, str], opts: dict[int, str],
             fullCmd: str, stream: ty.TextIO, op: str, debug: bool) -> int:
@@ -622,253 +1037,43 @@ class BuiltInCmds(HelpTxts):
 
         return err
 
-    def _builtIn_gen_HELP_HELPER(self, usageInfo: bool) \
-            -> tuple[list[str], list[str], int]:
+    def _gen_HELP_HELPER(self, names: list[str], usageInfo: bool,
+                         green: str, reset: str) -> int:
         """
-        Helper function of _gen_HELP_HELPER(). Gets the built-in commands and
-        their help strings.
+        Displays commands and their help strings.
+        > param names: Names of the commands, sorted
         > param usageInfo: True if the user had asked for usage to be displayed
-        > return: Tuple of commands, their help strings and the maximum
-                  length of the command strings
-        """
-        cmds       : list[str]
-        cmdHelpStrs: list[str]
-        maxLen      = 0
-        cmds        = []
-        cmdHelpStrs = []
-        cmdApp      = cmds.append
-        cmdHelpApp  = cmdHelpStrs.append
-
-        for attr in dir(self):
-            forbiddenCmds = {"ABIRAM", "AMIT", "NABHAN"}
-            if not attr.isupper() or attr.startswith("ERR_") or attr in forbiddenCmds:
-                continue
-
-            maxLen = max(maxLen, len(attr))
-            cmdApp(attr.lower())
-
-            if not hasattr(self, "help" + attr):
-                cmdHelpApp('-')
-                continue
-
-            helpBytes = getattr(self, "help" + attr)
-            if not isinstance(helpBytes, bytes):
-                comm.ERR(f"Invalid help string: '{attr.lower()}'", sl=5)
-                cmdHelpApp("[INVALID]")
-                continue
-
-            helpStr      = zl.decompress(helpBytes).decode()
-            helpStrSplit = helpStr.split('\n')
-
-            if not usageInfo:
-                cmdHelpApp(helpStrSplit[0])
-            else:
-                usageStr = next(
-                    (i for i in helpStrSplit if i.startswith("USAGE: ")),
-                    "[INVALID USAGE STR]"
-                )
-                cmdHelpApp(usageStr.removeprefix("USAGE: "))
-
-        return cmds, cmdHelpStrs, maxLen
-
-    def _ext_gen_HELP_HELPER(self, usageInfo: bool) \
-            -> tuple[list[str], list[str], int]:
-        """
-        Helper function of _gen_HELP_HELPER(). Gets the external commands and
-        their help strings.
-        > param origPth: Path of the interpreter
-        > return: Tuple of commands, their help strings and the maximum
-                  length of the command strings
-        """
-        cmds       : list[str]
-        cmdHelpStrs: list[str]
-        maxLen      = 0
-        cmds        = []
-        cmdHelpStrs = []
-        cmdApp      = cmds.append
-        cmdHelpApp  = cmdHelpStrs.append
-
-        try:
-            for fl in os.scandir(comm.BINDIR):
-                nm, ext = os.path.splitext(fl.name)
-                if not (ext.lower() == ".py" or ext.lower() == ".pyd"):
-                    continue
-
-                try:
-                    mod, err = comm.LDBINMOD(nm)
-                    if err:
-                        if err == -1:
-                            comm.UNERR(f"Failed to import module: '{nm}'")
-                        continue
-
-                    if not hasattr(mod, nm.upper()):
-                        continue
-                    maxLen = max(maxLen, len(nm))
-                    cmdApp(nm)
-
-                    if hasattr(mod, "helpStr"):
-                        helpStr = getattr(mod, "helpStr")
-
-                        if not isinstance(helpStr, bytes):
-                            comm.ERR(f"Invalid help string: '{nm.lower()}'",
-                                     sl=5)
-                            continue
-
-                        helpStr = comm.DECOMPSTR(helpStr)
-
-                        if not usageInfo:
-                            cmdHelpApp(helpStr.split('\n')[0])
-                        else:
-                            usageStr = next(
-                                (i for i in helpStr if i.upper().startswith("USAGE: ")),
-                                "[INVALID USAGE STR]"
-                            )
-                            cmdHelpApp(usageStr.removeprefix(usageStr[8:]))
-
-                    else:
-                        cmdHelpApp('-')
-
-                except FileNotFoundError:
-                    comm.INFO("Whoa. Command file was pulled out right from "
-                              f"under the interpreter! \"{nm}\"")
-
-                except (AttributeError, ImportError):
-                    comm.INFO("Filename suggests a command file, but necessary "
-                              "conditions to be a command were not satisfied. "
-                              "Please check")
-
-        # Dir "bin" does not exist
-        except FileNotFoundError:
-            pass
-
-        return cmds, cmdHelpStrs, maxLen
-
-    def _gen_HELP_HELPER(self, origPth: str, usageInfo: bool, green: str,
-                         reset: str, op: str) -> int:
-        """
-        Displays all commands and their help strings.
-        > param origPth: Path of the interpreter
         > return: Error code (ref. src\\errCodes.txt)
         """
-        toPrn: list[str]
-        toPrn      = []
-        toPrnApp   = toPrn.append
-        err        = comm.ERR_SUCCESS
-
-        bltInComms = self._builtIn_gen_HELP_HELPER(usageInfo)
-        extComms   = self._ext_gen_HELP_HELPER(usageInfo)
-        maxLen     = max(bltInComms[2], extComms[2])
-
-        cmds        = bltInComms[0] + extComms[0]
-        cmdHelpStrs = bltInComms[1] + extComms[1]
-
-        cmds, cmdHelpStrs, err = comm.SORTTWOARRS(cmds, cmdHelpStrs)
-        if err == 1:
-            comm.CRIT("Unable to sort commands; arrays were of different lengths",
-                      raiser='c', sl=5)
-            err = self.ERR_CANTSORT
-
-        for i, name in enumerate(cmds):
-            toPrnApp(f"{green}{name.lower():<{maxLen}}{reset} {cmdHelpStrs[i]}")
-
-        if toPrn:
-            print('\n'.join(toPrn))
-        return err
-
-    def _ext_spec_HELP_HELPER(self, origPth: str, arg: str) \
-            -> tuple[str, int]:
-        """
-        Helper function for _spec_HELP_HELPER(). Displays the help message
-        for a specific external command.
-        > param origPth: Path of the interpreter
-        > return: Tuple of help string and error code (ref. src\\errCodes.txt)
-        """
-        try:
-            binPth  = os.path.join(origPth, "bin")
-            pyNm    = str(pl.Path(os.path.join(binPth, arg + ".py")).resolve())
-            pydNm   = str(pl.Path(os.path.join(binPth, arg + ".pyd")).resolve())
-            pyBase  = os.path.basename(pyNm)
-            pydBase = os.path.basename(pydNm)
-            nm, _   = os.path.splitext(pyBase if os.path.isfile(pyNm) else pydBase)
-
-            for item in os.scandir(binPth):
-                if os.path.isdir(item):
-                    continue
-                if not (item.name.endswith(".py") or item.name.endswith(".pyd")):
-                    continue
-
-                itemNm, _ = os.path.splitext(item.name)
-                if itemNm.lower() != nm.lower():
-                    continue
-
-                try:
-                    mod = il.import_module("bin." + nm, package="bin")
-                    il.reload(mod)
-
-                    # Module MUST have a func with cmd name in uppercase to
-                    # be recognised as a cmd
-                    if not hasattr(mod, nm.upper()):
-                        continue
-                    if hasattr(mod, "helpStr"):
-                        tmp = getattr(mod, "helpStr")
-                        break
-                    else:
-                        comm.ERR(f"No help string available: \"{arg}\"")
-                        return '', self.ERR_NOHELPSTR
-
-                except FileNotFoundError:
-                    pass
-
-            else:
-                comm.ERR(f"No such command: \"{arg}\"", sl=5)
-                return '', self.ERR_NOSUCHCMD
+        entries = self.helpIdx.entries
+        maxLen  = self.helpIdx.maxLen
 
-        # Directory "bin" was not found
-        except FileNotFoundError:
-            comm.ERR(f"No such command: \"{arg}\"", sl=5)
-            return '', self.ERR_NOSUCHCMD
-
-        return tmp, comm.ERR_SUCCESS
+        if names:
+            print('\n'.join(
+                f"{green}{name:<{maxLen}}{reset} {entries[name][usageInfo]}"
+                for name in names
+            ))
+        return comm.ERR_SUCCESS
 
-    def _spec_HELP_HELPER(self, origPth: str, arg: str) -> int:
+    def _spec_HELP_HELPER(self, arg: str) -> int:
         """
         Displays the help message for a specific command.
-        > param origPth: Path of the interpreter
         > param arg: A string to fetch the help string for
         > return: Error code (ref. src\\errCodes.txt)
         """
-        cmdFound  = False
-        helpFound = False
-
         if arg.lower() == "please":
             print(";)")
             return 0
 
-        if hasattr(self, arg.upper()):
-            cmdFound = True
-        if hasattr(self, "help" + arg.upper()):
-            helpFound = True
-
-        if cmdFound and helpFound:
-            print(f"COMMAND: {arg.lower()}")
-            print('\n'.join(
-                line.expandtabs(4)
-                for line in getattr(self, "help" + arg.upper())
-            ))
-            return comm.ERR_SUCCESS
-
-        tmp = self._ext_spec_HELP_HELPER(origPth, arg)
-        if tmp[1] != 0:
-            if cmdFound and not helpFound:
-                comm.INFO(f"Built-in command found but help string was not: '{arg}'",
-                          sl=4)
-            elif not cmdFound and helpFound:
-                comm.INFO(f"Command not found; but built-in help string found: '{arg}'",
-                          sl=4)
-            return tmp[1]
+        if (txt := self.helpIdx.text(arg)) is None:
+            if arg.lower() in self.helpIdx.entries:
+                comm.ERR(f"No help string available: \"{arg}\"", sl=4)
+                return self.ERR_NOHELPSTR
+            comm.ERR(f"No such command: \"{arg}\"", sl=4)
+            return self.ERR_NOSUCHCMD
 
         print(f"COMMAND: {arg.lower()}")
-        print('\n'.join(line.expandtabs(4) for line in tmp[0]))
+        print(txt.expandtabs(4))
         return comm.ERR_SUCCESS
 
     def HELP(self, varTable: dict[str, str], origPth: str, prevErr: int,
@@ -876,9 +1081,10 @@ class BuiltInCmds(HelpTxts):
              fullCmd: str, stream: ty.TextIO, op: str, debug: bool) -> int:
         "Displays the main help messages, and command-specific help messages."
         optVals   = comm.LOWERLT(opts.values())
-        validOpts = {'s', 'u', 'h',
-                     "-syntax", "-usage", "-help"}
+        validOpts = {'s', 'u', 'p', 'h',
+                     "-syntax", "-usage", "-prefix", "-help"}
         usageInfo = False
+        prefix    = False
         err       = comm.ERR_SUCCESS
         green     = comm.ANSIGREEN if op == '' else ''
         reset     = comm.ANSIRESET if op == '' else ''
@@ -890,19 +1096,34 @@ class BuiltInCmds(HelpTxts):
             if 'h' in optVals or "-help" in optVals:
                 print(comm.DECOMPSTR(self.helpHELP))
                 return comm.ERR_SUCCESS
+            for opt in optVals:
+                if opt == 'p' or opt == "-prefix":
+                    prefix = True
             for opt in optVals:
                 if opt == 's' or opt == "-syntax" or opt == 'u' or opt == "-usage":
-                    if args:
+                    if args and not prefix:
                         comm.ERR(f"Cannot use -{opt} when supplying arguments")
                         return 3
                     usageInfo = True
 
-        if not args:
-            err = self._gen_HELP_HELPER(origPth, usageInfo, green, reset, op)
+        if self.helpIdx is None:
+            self.helpIdx = HelpIndex(self)
+        self.helpIdx.refresh()
+
+        if prefix:
+            if not args:
+                comm.ERR("Incorrect format")
+                return comm.ERR_INCFORMAT
+            names = sorted({name for arg in args.values()
+                            for name in self.helpIdx.search(arg)})
+            err   = self._gen_HELP_HELPER(names, usageInfo, green, reset)
+        elif not args:
+            err = self._gen_HELP_HELPER(self.helpIdx.sortedNames(), usageInfo,
+                                        green, reset)
         else:
             argsFinIdx = len(args) - 1
             for i, arg in enumerate(args.values()):
-                tmp2 = self._spec_HELP_HELPER(origPth, arg)
+                tmp2 = self._spec_HELP_HELPER(arg)
                 err  = err or tmp2
                 print() if i < argsFinIdx and not err else None
 
@@ -927,14 +1148,135 @@ class BuiltInCmds(HelpTxts):
         print(self.intrp.introTxt)
         return comm.ERR_SUCCESS
 
+    def _rd_LOG_HELPER(self) -> ty.Iterator[str]:
+        """
+        Helper function for the log command; yields the lines of the log
+        archives and the log file, oldest first, reading them only as they
+        are needed.
+        > return: Generator of lines
+        """
+        for pth in comm.FLHDLER.segments():
+            if pth.endswith(".gz"):
+                f = gzip.open(pth, "rt", encoding="utf-8")
+            else:
+                f = open(pth, 'r', buffering=1, encoding="utf-8")
+            with f:
+                yield from f
+
+    def _time_LOG_HELPER(self, val: str) -> float | None:
+        """
+        Helper function for the log command; parses the value of the since
+        and until options: an ISO 8601 date and/or time in local time, a bare
+        time being taken as today.
+        > param val: The value
+        > return: POSIX timestamp, or None if the value is invalid
+        """
+        try:
+            return dt.datetime.fromisoformat(val).timestamp()
+        except ValueError:
+            pass
+        try:
+            tm = dt.time.fromisoformat(val)
+        except ValueError:
+            return None
+        return dt.datetime.combine(dt.date.today(), tm).timestamp()
+
+    def _recs_LOG_HELPER(self, f: ty.BinaryIO) \
+            -> ty.Iterator[tuple[float, bytes]]:
+        """
+        Helper function for the log command; yields the records of a log
+        segment from its current position on.
+        > param f: The log segment, opened in binary mode
+        > return: Generator of the time and the text of each record
+        """
+        rec  : list[bytes]  = []
+        stamp: float | None = None
+        for ln in f:
+            if ln[:1] == b'[' and (tmp := comm.LOGRECTIME(
+                    ln.decode("utf-8", "replace"))) is not None:
+                if rec:
+                    yield stamp, b''.join(rec)
+                rec   = []
+                stamp = tmp
+            if stamp is not None:
+                rec.append(ln)
+        if rec:
+            yield stamp, b''.join(rec)
+
+    def _first_LOG_HELPER(self, pth: str) -> float | None:
+        """
+        Helper function for the log command; gets the time of the first
+        record of a log segment.
+        > param pth: Path of the log segment
+        > return: POSIX timestamp, or None if the segment is empty
+        """
+        with (gzip.open(pth, "rb") if pth.endswith(".gz")
+              else open(pth, "rb")) as f:
+            return comm.LOGRECTIME(f.readline().decode("utf-8", "replace"))
+
+    def _filt_LOG_HELPER(self, since: float | None, until: float | None,
+                         level: int | None, pttrn: re.Pattern[str] | None) \
+            -> None:
+        """
+        Helper function for the log command; displays the records matching
+        the given filters. The log file is binary searched for the first
+        record from the since time on, and archives wholly outside the time
+        range are not opened.
+        > param since: Earliest time of the records, if any
+        > param until: Latest time of the records, if any
+        > param level: Least level of the records, if any
+        > param pttrn: Pattern the records must contain, if any
+        """
+        segs   = comm.FLHDLER.segments()
+        firsts = [self._first_LOG_HELPER(pth) for pth in segs]
+
+        for i, pth in enumerate(segs):
+            nxt = next((tm for tm in firsts[i + 1:] if tm is not None), None)
+            if since is not None and nxt is not None and nxt <= since:
+                continue
+            if until is not None and firsts[i] is not None \
+                    and firsts[i] > until:
+                return
+
+            if pth.endswith(".gz"):
+                f = gzip.open(pth, "rb")
+            else:
+                f = open(pth, "rb")
+                if since is not None:
+                    f.seek(self.logIdx.seek(f, since))
+
+            with f:
+                for stamp, rec in self._recs_LOG_HELPER(f):
+                    if since is not None and stamp < since:
+                        continue
+                    if until is not None and stamp > until:
+                        return
+                    if level is not None:
+                        # Second line of a record starts with its level name
+                        lns = rec.split(b'\n', 2)
+                        lvl = lns[1].split(b':', 1)[0] if len(lns) > 1 else b''
+                        tmp = lg.getLevelName(lvl.decode("utf-8", "replace"))
+                        if not isinstance(tmp, int) or tmp < level:
+                            continue
+                    txt = rec.decode("utf-8", "replace")
+                    if pttrn is not None and not pttrn.search(txt):
+                        continue
+                    print(txt, end='')
+
     def LOG(self, varTable: dict[str, str], origPth: str, prevErr: int,
             cmd: str, args: dict[int, str], opts: dict[int, str],
             fullCmd: str, stream: ty.TextIO, op: str, debug: bool) -> int:
         "Manage the log file."
         optVals   = comm.LOWERLT(opts.values())
-        validOpts = {'c', 's', 'h', "-clear", "-size", "-help"}
+        validOpts = {'c', 's', 'h', "-clear", "-size", "-help", "-since",
+                     "-until", "-level", "-grep"}
         clear     = False
         size      = False
+        filtd     = False
+        since     = None
+        until     = None
+        level     = None
+        pttrn     = None
         err       = comm.ERR_SUCCESS
 
         if opts:
@@ -945,41 +1287,80 @@ class BuiltInCmds(HelpTxts):
                 print(comm.DECOMPSTR(self.helpLOG))
                 return comm.ERR_SUCCESS
 
-            for opt in optVals:
-                if opt in ('c', "-clear"):
-                    if size:
-                        comm.ERR("Cannot accept both clear and size options at the same time")
+            for pos in opts:
+                opt  = opts[pos]
+                optL = opt.lower()
+
+                if optL in ('c', "-clear"):
+                    if size or filtd:
+                        comm.ERR("Cannot accept clear with other options")
                         return comm.ERR_INCOPTUSAGE
                     clear = True
-                elif opt in ('s', "-size"):
-                    if clear:
-                        comm.ERR("Cannot accept both clear and size options at the same time")
+                elif optL in ('s', "-size"):
+                    if clear or filtd:
+                        comm.ERR("Cannot accept size with other options")
                         return comm.ERR_INCOPTUSAGE
                     size = True
 
+                else:
+                    if clear or size:
+                        comm.ERR("Cannot accept filters along with clear or size options")
+                        return comm.ERR_INCOPTUSAGE
+                    if pos + 1 not in args:
+                        comm.ERR(f"Expected argument after -{opt}")
+                        return comm.ERR_INCOPTUSAGE
+                    arg   = args[pos + 1]
+                    filtd = True
+                    args.pop(pos + 1)
+
+                    if optL in ("-since", "-until"):
+                        if (tmp := self._time_LOG_HELPER(arg)) is None:
+                            comm.ERR(f"Invalid time: '{arg}'")
+                            return self.ERR_INVLOGTIME
+                        if optL == "-since":
+                            since = tmp
+                        else:
+                            until = tmp
+                    elif optL == "-level":
+                        level = lg.getLevelName(arg.upper())
+                        if not isinstance(level, int):
+                            comm.ERR(f"Invalid log level: '{arg}'")
+                            return self.ERR_INVLOGLVL
+                    else:
+                        try:
+                            pttrn = re.compile(arg)
+                        except re.error as e:
+                            comm.ERR(f"Invalid pattern: '{arg}' ({e})")
+                            return self.ERR_INVLOGPTTRN
+
         if args:
             comm.ERR("Incorrect format")
             return comm.ERR_INCFORMAT
 
         if size:
             try:
-                print(os.path.getsize(comm.LOGFL))
+                print(sum(os.path.getsize(pth)
+                          for pth in comm.FLHDLER.segments()))
             except Exception:
                 comm.CRIT("Unhandled exception while attempting to get size of log file")
                 err = comm.ERR_UNKNOWN
 
         elif clear:
             try:
-                with open(comm.LOGFL, 'w', buffering=1) as f:
-                    f.truncate(0)
+                comm.FLHDLER.clear()
             except PermissionError:
                 comm.ERR(f"Access is denied: \"{comm.LOGFL}\"")
                 err = comm.ERR_PERMDENIED
+            except OSError as e:
+                comm.ERR(f"Could not clear the log: {e}")
+                err = comm.ERR_OSERR
 
         else:
             try:
-                with open(comm.LOGFL, 'r', buffering=1) as f:
-                    for ln in f:
+                if filtd:
+                    self._filt_LOG_HELPER(since, until, level, pttrn)
+                else:
+                    for ln in self._rd_LOG_HELPER():
                         print(ln, end='')
             except PermissionError:
                 comm.ERR(f"Access is denied: \"{comm.LOGFL}\"")
@@ -990,7 +1371,7 @@ class BuiltInCmds(HelpTxts):
                 # I've put this check, just in case, cause I'm incompetent
                 comm.ERR(f"Log file \"{comm.LOGFL}\" was not found. That is not supposed to happen")
                 err = comm.ERR_NOFL
-            except UnicodeDecodeError:
+            except (UnicodeDecodeError, gzip.BadGzipFile, EOFError):
                 comm.ERR(f"Does not appear to contain text: \"{comm.LOGFL}\"")
                 err = comm.ERR_CANTDECODE
 
@@ -1130,6 +1511,45 @@ class BuiltInCmds(HelpTxts):
 
         return comm.ERR_SUCCESS
 
+    def REPEAT(self, varTable: dict[str, str], origPth: str, prevErr: int,
+               cmd: str, args: dict[int, str], opts: dict[int, str],
+               fullCmd: str, stream: ty.TextIO, op: str, debug: bool) -> int:
+        "Runs a block a given number of times."
+        optVals   = comm.LOWERLT(opts.values())
+        validOpts = {'h', "-help"}
+        err       = comm.ERR_SUCCESS
+
+        if opts:
+            if tmp := (set(optVals) - validOpts):
+                comm.ERR(f"Unknown option(s): {comm.OPTSJOIN(tmp)}")
+                return comm.ERR_UNKNOPTS
+            if 'h' in optVals or "-help" in optVals:
+                print(comm.DECOMPSTR(self.helpREPEAT))
+                return comm.ERR_SUCCESS
+
+        argVals = [args[pos] for pos in sorted(args)]
+        if len(argVals) != 2 or not isinstance(argVals[1], par.Block):
+            comm.ERR("Incorrect format")
+            return comm.ERR_INCFORMAT
+
+        try:
+            count = int(argVals[0])
+            if count < 0:
+                raise ValueError
+        except ValueError:
+            comm.ERR(f"Invalid repeat count: '{argVals[0]}'")
+            return self.ERR_INVREPCNT
+
+        compiled = self.intrp.compile(argVals[1])
+        if isinstance(compiled, int):
+            return compiled
+
+        for _ in range(count):
+            tmp = self.intrp.runCompiled(compiled)
+            err = err or tmp
+
+        return err
+
     def RUNPATH(self, varTable: dict[str, str], origPth: str, prevErr: int,
                 cmd: str, args: dict[int, str], opts: dict[int, str],
                 fullCmd: str, stream: ty.TextIO, op: str, debug: bool) -> int:
@@ -1327,6 +1747,27 @@ class BuiltInCmds(HelpTxts):
 
         return comm.ERR_SUCCESS
 
+    def SYNC(self, varTable: dict[str, str], origPth: str, prevErr: int,
+             cmd: str, args: dict[int, str], opts: dict[int, str],
+             fullCmd: str, stream: ty.TextIO, op: str, debug: bool) -> int:
+        "Writes out and closes files kept open by output redirection."
+        optVals   = comm.LOWERLT(opts.values())
+        validOpts = {'h', "-help"}
+
+        if opts:
+            if tmp := (set(optVals) - validOpts):
+                comm.ERR(f"Unknown option(s): {comm.OPTSJOIN(tmp)}")
+                return comm.ERR_UNKNOPTS
+            if 'h' in optVals or "-help" in optVals:
+                print(comm.DECOMPSTR(self.helpSYNC))
+                return comm.ERR_SUCCESS
+
+        if args:
+            comm.ERR("Incorrect format")
+            return comm.ERR_INCFORMAT
+
+        return self.intrp.writers.sync()
+
     def TIME(self, varTable: dict[str, str], origPth: str, prevErr: int,
              cmd: str, args: dict[int, str], opts: dict[int, str],
              fullCmd: str, stream: ty.TextIO, op: str, debug: bool) -> int:
@@ -1478,3 +1919,38 @@ class BuiltInCmds(HelpTxts):
         if toPrn:
             print('\n'.join(f"{i[0]:<{padding}} {i[1]}" for i in toPrn))
         return err
+
+    def WHILE(self, varTable: dict[str, str], origPth: str, prevErr: int,
+              cmd: str, args: dict[int, str], opts: dict[int, str],
+              fullCmd: str, stream: ty.TextIO, op: str, debug: bool) -> int:
+        "Runs a block for as long as a condition block succeeds."
+        optVals   = comm.LOWERLT(opts.values())
+        validOpts = {'h', "-help"}
+        err       = comm.ERR_SUCCESS
+
+        if opts:
+            if tmp := (set(optVals) - validOpts):
+                comm.ERR(f"Unknown option(s): {comm.OPTSJOIN(tmp)}")
+                return comm.ERR_UNKNOPTS
+            if 'h' in optVals or "-help" in optVals:
+                print(comm.DECOMPSTR(self.helpWHILE))
+                return comm.ERR_SUCCESS
+
+        argVals = [args[pos] for pos in sorted(args)]
+        if len(argVals) != 2 \
+                or not all(isinstance(i, par.Block) for i in argVals):
+            comm.ERR("Incorrect format")
+            return comm.ERR_INCFORMAT
+
+        cond = self.intrp.compile(argVals[0])
+        if isinstance(cond, int):
+            return cond
+        body = self.intrp.compile(argVals[1])
+        if isinstance(body, int):
+            return body
+
+        while not self.intrp.runCompiled(cond):
+            tmp = self.intrp.runCompiled(body)
+            err = err or tmp
+
+        return err
@@ -10,7 +10,7 @@
 #              commands
 #
 
-import io
+import ast
 import os
 import sys
 import types
@@ -18,6 +18,7 @@ import contextlib     as cl
 import ctypes         as ct
 import importlib.util as ilu
 import pathlib        as pl
+import threading      as th
 import typing         as ty
 import builtInCmds    as bic
 import commons        as comm
@@ -35,6 +36,224 @@ funcTypeAnnot = ty.Callable[
 ]
 
 
+class UserFunc:
+    """
+    A user-defined function (ref. builtin func). Its body is compiled once,
+    when it is defined; a call sets its parameters as interpreter variables
+    and runs the compiled body. Calls nested deeper than FUNCDEPTHMAX (e.g.
+    by a function calling itself) fail instead of exhausting the stack.
+    """
+    def __init__(self, intrp: "Intrp", name: str, params: list[str],
+                 body: par.Compiled, saved: bool = False) -> None:
+        self.intrp  = intrp
+        self.name   = name
+        self.params = params
+        self.body   = body
+        self.saved  = saved
+
+    def definition(self) -> str:
+        """
+        > return: Definition of the function, as given to the func command
+        """
+        return ' '.join((self.name, *self.params, f"{{{self.body.src}}}"))
+
+    def __call__(self, varTable: dict[str, str], origPth: str, prevErr: int,
+                 cmd: str, args: dict[int, str], opts: dict[int, str],
+                 fullCmd: str, stream: ty.TextIO, op: str, debug: bool) -> int:
+        if opts:
+            comm.ERR(f"{self.name}: Unknown option(s): "
+                     f"{comm.OPTSJOIN(opts.values())}", raiser='c')
+            return comm.ERR_UNKNOPTS
+
+        if len(args) != len(self.params):
+            comm.ERR(f"{self.name}: Expected {len(self.params)} argument(s), "
+                     f"got {len(args)}", raiser='c')
+            return comm.ERR_INCFORMAT
+
+        if self.intrp.funcDepth >= comm.FUNCDEPTHMAX:
+            comm.ERR(f"{self.name}: Function calls nested too deeply (more "
+                     f"than {comm.FUNCDEPTHMAX})", raiser='c')
+            return comm.ERR_FUNCTOODEEP
+
+        prevVals: dict[str, str | None] = {}
+        for param, pos in zip(self.params, sorted(args)):
+            keys = comm.DICTSRCH(param, self.intrp.varTable, caseIn=True,
+                                 returnMode="keys")
+            key  = keys[0] if keys else param
+            prevVals[key]            = self.intrp.varTable.get(key)
+            self.intrp.varTable[key] = args[pos]
+
+        self.intrp.funcDepth += 1
+        try:
+            return self.intrp.runCompiled(self.body)
+        except RecursionError:
+            # Nested otherwise (e.g. through aliases or loops) deeply enough
+            # to exhaust the stack anyway; reported by the outermost call
+            if self.intrp.funcDepth > 1:
+                raise
+            comm.ERR(f"{self.name}: Function calls nested too deeply",
+                     raiser='c')
+            return comm.ERR_FUNCTOODEEP
+        finally:
+            self.intrp.funcDepth -= 1
+            for key, val in prevVals.items():
+                if val is None:
+                    self.intrp.varTable.pop(key, None)
+                else:
+                    self.intrp.varTable[key] = val
+
+
+class CmdIndex:
+    """
+    Index of the command names the interpreter resolves (ref.
+    Intrp.getFunc()): built-in commands, user-defined functions, commands in
+    src\\bin and aliases, in a trie for completion. refresh() brings it up to
+    date by adding and removing only the names that changed. The options of
+    a command are read from the validOpts set in its source, once per
+    version of the file. It is refreshed both by the completer's worker
+    thread and the highlighter, hence the lock.
+    """
+    def __init__(self, intrp: "Intrp") -> None:
+        self.intrp    = intrp
+        self.lock     = th.Lock()
+        self.trie     = comm.Trie()
+        self.funcs    : set[str] = set()
+        self.bins     : set[str] = set()
+        self.aliases  : set[str] = set()
+        self.binStamp = None
+        self.aliasVer = None
+        self.opts     : dict[str, tuple[int, list[str]]] = {}
+        self.bltInOpts: dict[str, list[str]] | None = None
+        # Changed whenever names are added or removed
+        self.version  = 0
+
+        for attr in dir(intrp.builtInCmds):
+            if attr.isupper() and not attr.startswith("ERR_") \
+                    and attr not in bic.HelpIndex.HIDDEN:
+                self.trie.add(attr)
+        self.refresh()
+
+    def _sync(self, known: set[str], found: set[str]) -> None:
+        """
+        Apply the changes to one source of names to the trie.
+        > param known: The names of the source in the trie; updated
+        > param found: The names of the source now
+        """
+        if known != found:
+            self.version += 1
+        for name in known - found:
+            self.trie.remove(name)
+        for name in found - known:
+            self.trie.add(name)
+        known.clear()
+        known.update(found)
+
+    def refresh(self) -> None:
+        "Bring the index up to date with functions, src\\bin and aliases."
+        with self.lock:
+            self._refresh()
+
+    def _refresh(self) -> None:
+        if len(self.funcs) != len(self.intrp.funcs) \
+                or not self.funcs.issuperset(self.intrp.funcs):
+            self._sync(self.funcs, set(self.intrp.funcs))
+
+        # Files added to, removed from or renamed in a directory change its
+        # modification time
+        try:
+            stamp = os.stat(comm.BINDIR).st_mtime_ns
+        except OSError:
+            stamp = None
+        if stamp != self.binStamp:
+            self.binStamp = stamp
+            found         = set()
+            try:
+                for fl in os.scandir(comm.BINDIR):
+                    nm, ext = os.path.splitext(fl.name)
+                    if ext.lower() in (".py", ".pyd") and fl.is_file():
+                        found.add(nm.lower())
+            except FileNotFoundError:
+                pass
+            self._sync(self.bins, found)
+
+        if comm.ALIASSTORE.version != self.aliasVer:
+            self.aliasVer = comm.ALIASSTORE.version
+            self._sync(self.aliases, set(comm.ALIASSTORE.names))
+
+    def complete(self, prefix: str) -> list[str]:
+        """
+        > param prefix: Start of a command name (case-insensitive)
+        > return: Sorted list of the command names starting with it
+        """
+        return self.trie.find(prefix)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.trie
+
+    def _validOpts(self, src: str) -> dict[str, list[str]]:
+        """
+        Get the validOpts sets of the command functions defined in a source.
+        > param src: Source of the module defining the commands
+        > return: Dictionary of function names and sorted lists of their
+                  options, as typed
+        """
+        found: dict[str, list[str]] = {}
+        try:
+            tree = ast.parse(src)
+        except (SyntaxError, ValueError):
+            return found
+
+        for node in ast.walk(tree):
+            if not isinstance(node, ast.FunctionDef) or not node.name.isupper():
+                continue
+            for stmt in ast.walk(node):
+                if isinstance(stmt, ast.Assign) \
+                        and any(isinstance(tgt, ast.Name)
+                                and tgt.id == "validOpts"
+                                for tgt in stmt.targets):
+                    try:
+                        found[node.name] = sorted(
+                            '-' + opt for opt in ast.literal_eval(stmt.value)
+                        )
+                    except ValueError:
+                        pass
+                    break
+        return found
+
+    def options(self, cmd: str) -> list[str]:
+        """
+        > param cmd: Name of a command (case-insensitive)
+        > return: Sorted list of the options of the command, as typed (e.g.
+                  -h, --help)
+        """
+        cmd = cmd.lower()
+        if hasattr(self.intrp.builtInCmds, cmd.upper()):
+            if self.bltInOpts is None:
+                try:
+                    with open(bic.__file__, encoding="utf-8") as f:
+                        self.bltInOpts = self._validOpts(f.read())
+                except OSError:
+                    self.bltInOpts = {}
+            return self.bltInOpts.get(cmd.upper(), [])
+
+        if cmd not in self.bins:
+            return []
+        pth = os.path.join(comm.BINDIR, cmd + ".py")
+        try:
+            stamp = os.stat(pth).st_mtime_ns
+        except OSError:
+            return []
+        if (entry := self.opts.get(cmd)) is not None and entry[0] == stamp:
+            return entry[1]
+        try:
+            with open(pth, encoding="utf-8") as f:
+                opts = self._validOpts(f.read()).get(cmd.upper(), [])
+        except OSError:
+            opts = []
+        self.opts[cmd] = stamp, opts
+        return opts
+
+
 class Intrp:
     def __init__(self, parser: par.Parser, settings: dict[str, str],
                  title: str, mainProgArgs: dict[str, ty.Any]) -> None:
@@ -58,24 +277,38 @@ class Intrp:
         self.mainProgArgs = mainProgArgs
         self.debug        = self.mainProgArgs["debug"]
         self.cache        = {}
+        self.writers      = comm.WriterPool()
+        self.scriptDepth  = 0
+        self.compiled     = {}
+        self.funcs        = {}
+        self.funcDepth    = 0
 
         self.shortHandCmds = {'?': "help", '!': "cmd"}
+        # Operators after which the o/p of a cmd is captured, not displayed
+        self.captureOps    = {'|', '>', ">>", ">!"}
 
         self.detPth()
         self.detCdToDirs()
         self.detExecScripts()
         self.detIntro()
         self.detCache()
+        self.detLog()
 
         os.chdir(self.path)
         ct.windll.kernel32.SetConsoleTitleW(self.title)
 
-        self.aliases = {}
+        # The alias store's own map, so that aliases set or removed by the
+        # alias command apply without reincarnating
+        self.aliases = comm.ALIASSTORE.aliases
         loadErr = self.loadAliases()
         if loadErr:
             comm.ERR("Could not load aliases")
         self.lAliases = [i.lower() for i in self.aliases]
 
+        loadErr = self.loadFuncs()
+        if loadErr:
+            comm.ERR("Could not load functions")
+
         execErr = self.runStartupScripts()
         if execErr:
             comm.ERR("Issues encountered with startup scripts")
@@ -161,40 +394,149 @@ class Intrp:
                      raiser='c')
             self.writeCache = "true"
 
+    def detLog(self) -> None:
+        """
+        Determine the parameters logsize (in MiB), logdays and logarchives's
+        values, and apply them to the log file handler.
+        """
+        vals = []
+        for param in ("logsize", "logdays", "logarchives"):
+            val = self.settings.get(param, '') or comm.DFLTSETT[param]
+            try:
+                num = int(val)
+                if num < 0:
+                    raise ValueError
+            except ValueError:
+                comm.ERR(f"(SETTINGS) Invalid value for '{param}': '{val}'",
+                         raiser='c')
+                num = int(comm.DFLTSETT[param])
+            vals.append(num)
+
+        comm.FLHDLER.configure(vals[0] << 20, vals[1] * 86400, vals[2])
+
     def loadAliases(self) -> int:
         """
-        Load aliases from _aliases.txt.
+        Load aliases from _aliases.txt and its journal (ref. AliasStore in
+        src\\core\\commons.py).
         > return: Error code (ref. src\\errCodes.txt)
         """
         try:
-            with open(os.path.join(self.origPth, "_aliases.txt"),
-                      buffering=1) as f:
+            comm.ALIASSTORE.load()
+
+        except PermissionError:
+            comm.ERR("(ALIASES) Access is denied to read or create file",
+                     raiser='c')
+            return comm.ERR_PERMDENIED
+
+        except UnicodeDecodeError:
+            comm.ERR("(ALIASES) Invalid data in file", raiser='c')
+            return comm.ERR_CANTDECODE
+
+        return comm.ERR_SUCCESS
+
+    def loadFuncs(self) -> int:
+        """
+        Load saved functions from _functions.txt. Every line holds the
+        definition of a function, as given to the func command.
+        > return: Error code (ref. src\\errCodes.txt)
+        """
+        try:
+            with open(os.path.join(self.origPth, "_functions.txt")) as f:
                 for i, ln in enumerate(f):
-                    alias, sep, value = ln.partition('=')
-                    if sep == '':
-                        comm.ERR(f"(ALIASES) Cannot parse line {i + 1}: \"{ln}\"",
-                                 raiser='c')
+                    if not ln.strip():
                         continue
-                    if not comm.PARAMOK(alias):
-                        comm.ERR(f"(ALIASES) Invalid name on line {i + 1}: '{alias}'",
+                    parsed = self.parse(ln.removesuffix('\n'))
+                    if isinstance(parsed, int) or len(parsed) != 1 \
+                            or parsed[0][2] or not parsed[0][1]:
+                        comm.ERR(f"(FUNCTIONS) Cannot parse line {i + 1}: \"{ln}\"",
                                  raiser='c')
                         continue
-                    self.aliases[alias] = value.removesuffix('\n')
+                    name, args, _ = parsed[0]
+                    argVals       = [args[pos] for pos in sorted(args)]
+                    if self.defFunc(name, argVals[:-1], argVals[-1], saved=True):
+                        comm.ERR(f"(FUNCTIONS) Invalid definition on line {i + 1}",
+                                 raiser='c')
 
         except FileNotFoundError:
-            try:
-                open(os.path.join(self.origPth, "_aliases.txt"), 'w').close()
-            except PermissionError:
-                comm.ERR("(ALIASES) Access is denied; unable to create file",
-                         raiser='c')
-                return comm.ERR_PERMDENIED
+            pass
 
         except PermissionError:
-            comm.ERR("(ALIASES) Access is denied to write to file", raiser='c')
+            comm.ERR("(FUNCTIONS) Access is denied to read file", raiser='c')
             return comm.ERR_PERMDENIED
 
+        except UnicodeDecodeError:
+            comm.ERR("(FUNCTIONS) File does not appear to contain valid UTF-8",
+                     raiser='c')
+            return comm.ERR_CANTDECODE
+
+        return comm.ERR_SUCCESS
+
+    def saveFuncs(self) -> int:
+        """
+        Write the definitions of saved functions to _functions.txt.
+        > return: Error code (ref. src\\errCodes.txt)
+        """
+        pth    = os.path.join(self.origPth, "_functions.txt")
+        tmpPth = pth + ".tmp"
+        try:
+            with open(tmpPth, 'w') as f:
+                for func in self.funcs.values():
+                    if func.saved:
+                        f.write(func.definition() + '\n')
+            os.replace(tmpPth, pth)
+
+        except PermissionError:
+            comm.ERR("(FUNCTIONS) Access is denied to write to file",
+                     raiser='c')
+            return comm.ERR_PERMDENIED
+
+        except OSError as e:
+            comm.ERR(f"(FUNCTIONS) Cannot write to file: {e}", raiser='c')
+            return comm.ERR_OSERR
+
         return comm.ERR_SUCCESS
 
+    def defFunc(self, name: str, params: list[str], body: str,
+                saved: bool = False) -> int:
+        """
+        Define a function, replacing any function of the same name.
+        > param name: Name of the function
+        > param params: Names of the parameters
+        > param body: Source of the body
+        > param saved: Is the function saved to _functions.txt?
+        > return: Error code (ref. src\\errCodes.txt)
+        """
+        if not isinstance(body, par.Block) or not comm.PARAMOK(name) \
+                or hasattr(self.builtInCmds, name.upper()):
+            return comm.ERR_INVFUNCDEF
+
+        lParams = [param.lower() for param in params]
+        if not all(comm.PARAMOK(param) for param in params) \
+                or len(set(lParams)) != len(lParams) \
+                or {"error", "ud"} & set(lParams):
+            return comm.ERR_INVFUNCDEF
+
+        compiled = self.compile(body)
+        if isinstance(compiled, int):
+            return compiled
+
+        self.rmFunc(name)
+        self.funcs[name.lower()] = UserFunc(self, name, params, compiled,
+                                            saved)
+        return comm.ERR_SUCCESS
+
+    def rmFunc(self, name: str) -> UserFunc | None:
+        """
+        Remove a function. Cached commands of the same name are dropped too,
+        so that the next lookup goes through self.getFunc() again.
+        > param name: Name of the function
+        > return: The function removed, or None if there was no such function
+        """
+        for key in comm.DICTSRCH(name, self.cache, caseIn=True,
+                                 returnMode="keys") or ():
+            self.cache.pop(key)
+        return self.funcs.pop(name.lower(), None)
+
     def runStartupScripts(self) -> int:
         """
         Execute startup scripts.
@@ -224,6 +566,7 @@ class Intrp:
             comm.ERR(f"Access is denied: \"{pth}\"; Cannot execute startup script(s)")
             err = err or comm.ERR_SUCCESS
 
+        self.writers.sync()
         return err
 
     def setErrCode(self, code: int) -> int:
@@ -281,7 +624,8 @@ class Intrp:
 
     def getFunc(self, cmd: str) -> tuple[funcTypeAnnot, int] | int | None:
         """
-        Get the function to be called from the modules in directory "src\\bin".
+        Get the function to be called: a built-in command, a user-defined
+        function or a command from the modules in directory "src\\bin".
         > param cmd: Command name
         > return: A function object (if everything went well), an integer
                   error code (if something started acting up) or None (if
@@ -299,16 +643,17 @@ class Intrp:
             func = getattr(self.builtInCmds, cmd.upper())
             return func
 
+        if (userFunc := self.funcs.get(cmd.lower())) is not None:
+            return userFunc
+
         try:
             mod, _ = self.loadMod(cmd)
 
             func = getattr(mod, cmd.upper())
 
         except (AttributeError, ImportError, FileNotFoundError):
-            for alias in self.aliases:
-                if alias.lower() == cmd.lower():
-                    func = self.aliases[cmd]
-                    break
+            if (alias := comm.ALIASSTORE.get(cmd)) is not None:
+                func = alias
 
         except ValueError:
             # Raised if path is too long
@@ -319,6 +664,13 @@ class Intrp:
 
         return func
 
+    def idle(self) -> None:
+        """
+        Called by the main program when the interpreter goes idle, i.e. is
+        about to wait for input. Flushes and closes redirection targets.
+        """
+        self.writers.sync()
+
     def _before(self) -> None:
         "Called before every execution of execute()"
         pass
@@ -354,12 +706,15 @@ class Intrp:
 
         return command[0], tempArgs, tempOpts
 
-    def _redir_execute_HELPER(self, command: str, redirOut: str) -> int:
+    def _redir_execute_HELPER(self, command: str, redirOut: comm.PipeData,
+                              redirOp: str) -> int:
         err = comm.ERR_SUCCESS
 
+        # Targets are kept open in the writer pool until the script ends, the
+        # interpreter goes idle or `sync` is run
         try:
-            with open(command, 'a') as f:
-                f.write(redirOut)
+            self.writers.write(command, redirOut.bytes(),
+                               truncate=(redirOp == ">!"))
         except PermissionError:
             comm.ERR(f"Is a directory or access is denied: "
                      f"\"{pl.Path(command).resolve()}\"", raiser='c')
@@ -373,8 +728,8 @@ class Intrp:
 
     def _call_execute_HELPER(
             self, func: funcTypeAnnot, command: str, args: dict[int, str],
-            opts: dict[int, str], line: str, oldStdOut, op: str, pipeOut: str,
-            capture: ty.TextIO
+            opts: dict[int, str], line: str, oldStdOut, op: str,
+            pipeOut: comm.PipeData | None, capture: comm.PipeCapture | None
         ) -> tuple[ty.TextIO, int]:
 
         # o/p of previous cmd piped to current cmd; add prev o/p to args of
@@ -384,7 +739,29 @@ class Intrp:
                 maxPos = max(list(args) + list(opts)) + 1
             except ValueError:
                 maxPos = 0
-            args[maxPos] = pipeOut
+            # Decode only for cmds that want text; byte-oriented cmds (marked
+            # with commons.RAWPIPE) get the raw payload
+            args[maxPos] = (pipeOut if getattr(func, "rawPipe", False)
+                            else pipeOut.text())
+
+        # No capture: o/p is bound for the terminal (or for whatever stdout
+        # currently is, e.g. a subcmd's capture), so pass it through as it is
+        # written instead of holding all of it until the cmd returns
+        if capture is None:
+            # Already passing through for an enclosing cmd (e.g. a loop whose
+            # body this cmd is in); its buffer is shared
+            if isinstance(sys.stdout, comm.FlushingWriter):
+                return sys.stdout, func(self.varTable, self.origPth, self.err,
+                                        command, args, opts, line, oldStdOut,
+                                        op, self.debug)
+            capture = comm.FlushingWriter(sys.stdout)
+            with cl.redirect_stdout(capture):
+                try:
+                    err = func(self.varTable, self.origPth, self.err, command,
+                               args, opts, line, oldStdOut, op, self.debug)
+                finally:
+                    capture.close()
+            return capture, err
 
         # Capture o/p of current cmd, to decide its fate
         with cl.redirect_stdout(capture):
@@ -408,16 +785,62 @@ class Intrp:
         > return: Integer error code (ref. src\\errCodes.txt)
         """
         self._before() if before else None
-        output   = ''
-        pipeOut  = None
-        redirOut = None
-        parsed   = self.parse(line)
-        err      = comm.ERR_SUCCESS
+        parsed = self.parse(line)
         comm.DEBUG(f"Parsed input line: {parsed}") if self.debug else None
 
         if isinstance(parsed, int):
             return parsed
 
+        return self.run(parsed, line, before=before, after=after)
+
+    def compile(self, src: str) -> par.Compiled | int:
+        """
+        Compile a block body (ref. Parser.compile()). Compiled bodies are kept
+        by their source, so a body is parsed only once however many times it
+        is run or defined.
+        > param src: Source of the body
+        > return: Compiled body or integer error code (ref. src\\errCodes.txt)
+        """
+        if (compiled := self.compiled.get(src)) is not None:
+            return compiled
+
+        compiled = self.parser.compile(src)
+        if isinstance(compiled, int):
+            return compiled
+
+        if len(self.compiled) >= comm.COMPILEDCACHESZ:
+            self.compiled.clear()
+        self.compiled[src] = compiled
+        return compiled
+
+    def runCompiled(self, compiled: par.Compiled) -> int:
+        """
+        Run a compiled body once.
+        > param compiled: Compiled body (ref. self.compile())
+        > return: Integer error code (ref. src\\errCodes.txt)
+        """
+        parsed = compiled.bind(self.parser, self.varTable)
+        if isinstance(parsed, int):
+            return parsed
+        return self.run(parsed, compiled.src, after=False)
+
+    def run(self, parsed: list[tuple[str, dict[int, str], dict[int, str]] | str],
+            line: str, before: bool = True, after: bool = True) -> int:
+        """
+        Run a parsed line; get the run function for each command, and call
+        it.
+        > param parsed: Parsed line (ref. self.parse()); consumed by the run
+        > param line: The line that was parsed
+        > param before: Passed on to the lines of scripts run
+        > param after: Boolean to inform if function self._after() needs to
+                       be executed at the end
+        > return: Integer error code (ref. src\\errCodes.txt)
+        """
+        pipeOut  = None
+        redirOut = None
+        redirOp  = ''
+        err      = comm.ERR_SUCCESS
+
         while parsed:
             args: dict[int, str]
             opts: dict[int, str]
@@ -435,6 +858,20 @@ class Intrp:
                     return comm.ERR_UNKNOWN
                 op = tmp
 
+            # Redirection targets are closed before any cmd that could read,
+            # move or remove them runs. Only the target being written to, or
+            # about to be written to by this cmd (e.g. again and again in a
+            # loop), is kept open
+            if self.writers:
+                if redirOut is not None:
+                    keep = cmd
+                elif op in self.captureOps and op != '|' and parsed:
+                    keep = parsed[0][0]
+                else:
+                    keep = None
+                tmp = self.writers.sync(keep)
+                err = err or tmp
+
             if self.debug:
                 comm.DEBUG("Initial command, arguments, options and operation: "
                            f"'{cmd}', {args}, {opts} and '{op}'")
@@ -470,14 +907,13 @@ class Intrp:
                                f"'{op}'")
 
             func      = self.getFunc(cmd)
-            capture   = io.StringIO()
             oldStdOut = sys.__stdout__
 
             # Redirect output
             if redirOut is not None:
                 if self.debug:
                     comm.DEBUG("Redirection block executing")
-                tmp      = self._redir_execute_HELPER(cmd, redirOut)
+                tmp      = self._redir_execute_HELPER(cmd, redirOut, redirOp)
                 err      = err or tmp
                 redirOut = None
 
@@ -486,8 +922,10 @@ class Intrp:
                 if self.debug:
                     comm.DEBUG("Command block executing")
 
+                # Only pipes and redirections need the o/p in hand
                 capture, err = self._call_execute_HELPER(
-                    func, cmd, args, opts, line, oldStdOut, op, pipeOut, capture
+                    func, cmd, args, opts, line, oldStdOut, op, pipeOut,
+                    comm.PipeCapture() if op in self.captureOps else None
                 )
 
                 res = comm.DICTSRCH(cmd, self.cache, caseIn=True)
@@ -496,18 +934,17 @@ class Intrp:
 
                 pipeOut  = None
                 redirOut = None
-                output   = capture.getvalue()
 
                 if op in ('', '^', '&', ';'):
-                    print(output, end='')
                     if op == '&' and err:
                         return err
                 elif op == '|':
                     if err:
                         return err
-                    pipeOut = output
-                elif op == '>':
-                    redirOut = output
+                    pipeOut = capture.payload()
+                elif op in ('>', ">>", ">!"):
+                    redirOut = capture.payload()
+                    redirOp  = op
 
             # Execute an alias
             elif isinstance(func, str):
@@ -534,6 +971,7 @@ class Intrp:
                     comm.ERR(f"Is a file: \"{cmd}\"", raiser='c')
                     err = err or comm.ERR_ISAFL
                 else:
+                    self.scriptDepth += 1
                     try:
                         with open(cmd) as f:
                             for line in f:
@@ -550,6 +988,14 @@ class Intrp:
                                 f"\"{pl.Path(cmd).resolve()}\"",
                                 raiser='c')
                         err = err or comm.ERR_PERMDENIED
+                    finally:
+                        self.scriptDepth -= 1
+
+                    # Script is done; write out what it redirected, unless it
+                    # was run by another script, whose targets are still open
+                    if not self.scriptDepth:
+                        tmp2 = self.writers.sync()
+                        err  = err or tmp2
 
             # Change dir on passing dir name instead of a cmd
             elif os.path.isdir(cmd):
@@ -586,7 +1032,7 @@ class Intrp:
                     comm.ERR(f"Bad command: \"{cmd}\"", raiser='c')
                 if func == comm.ERR_CMDTOOLONG:
                     comm.ERR("Command too long", raiser='c')
-                if op in ('&', '>'):
+                if op in ('&', '>', ">>", ">!"):
                     break
 
         self.lastCmd = line
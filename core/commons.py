@@ -9,8 +9,15 @@
 #              program (common code)
 #
 
+import atexit
+import bisect
+import contextlib
+import gzip
+import io
 import os
 import sys
+import threading
+import time
 import types
 import ctypes         as ct
 import datetime       as dt
@@ -19,7 +26,9 @@ import importlib      as il
 import importlib.util as ilu
 import msvcrt         as ms
 import logging        as lg
+import logging.handlers as lh
 import platform       as pf
+import queue          as qu
 import shutil         as sh
 import traceback      as tb
 import typing         as ty
@@ -52,6 +61,15 @@ class CustomLogger(lg.getLoggerClass()):
     def __init__(self, name: str, level: int | str = lg.NOTSET) -> None:
         super().__init__(name, level)
         lg.addLevelName(FATAL, "FATAL")
+        # Set by INITLOGGERS(); the caller is looked up only if needed
+        self.needsCaller = True
+
+    def findCaller(self, stack_info: bool = False, stacklevel: int = 1) \
+            -> tuple[str, int, str, str | None]:
+        if not self.needsCaller:
+            return "(unknown file)", 0, "(unknown function)", None
+        # One more level, for this very frame
+        return super().findCaller(stack_info, stacklevel + 1)
 
     def info(self, msg: str, sl: int = 3, *args: ty.Any, **kwargs: ty.Any) -> None:
         if self.isEnabledFor(lg.INFO):
@@ -96,6 +114,13 @@ class CustomLogFormatter(lg.Formatter):
         }
         super().__init__(fmt, datefmt, style, validate, defaults=defaults)
 
+    def usesCaller(self) -> bool:
+        """
+        > return: True if the format needs the caller of the logging call
+        """
+        return any(f"%({attr})" in self._fmt for attr in
+                   ("funcName", "module", "lineno", "filename", "pathname"))
+
     def format(self, record: lg.LogRecord) -> str:
         record.msg        = record.getMessage().strip()
         record.funcName   = record.funcName.lower()
@@ -103,16 +128,257 @@ class CustomLogFormatter(lg.Formatter):
         return super().format(record)
 
 
+class RotatingLogHandler(lh.BaseRotatingHandler):
+    """
+    Handler for the log file. The file is rolled over into gzip-compressed
+    archives (<log file>.1.gz being the newest) once it grows past maxSz
+    bytes, or its first record gets older than maxAge seconds; only the
+    newest `archives` archives are kept. A limit of 0 turns that kind of
+    rollover off.
+    """
+    def __init__(self, filename: str, maxSz: int, maxAge: float,
+                 archives: int) -> None:
+        super().__init__(filename, 'a', encoding="utf-8")
+        self.maxSz     = maxSz
+        self.maxAge    = maxAge
+        self.archives  = archives
+        self.startTime = self._firstRecTime()
+
+    def configure(self, maxSz: int, maxAge: float, archives: int) -> None:
+        """
+        Change the rollover limits (ref. RotatingLogHandler).
+        """
+        self.acquire()
+        try:
+            self.maxSz    = maxSz
+            self.maxAge   = maxAge
+            self.archives = archives
+        finally:
+            self.release()
+
+    def archivePth(self, num: int) -> str:
+        """
+        > param num: Number of the archive; 1 is the newest
+        > return: Path of the archive
+        """
+        return f"{self.baseFilename}.{num}.gz"
+
+    def segments(self) -> list[str]:
+        """
+        > return: Paths of the archives and the log file, oldest first
+        """
+        segs = []
+        num  = 1
+        while os.path.exists(self.archivePth(num)):
+            segs.append(self.archivePth(num))
+            num += 1
+        segs.reverse()
+        if os.path.exists(self.baseFilename):
+            segs.append(self.baseFilename)
+        return segs
+
+    def _firstRecTime(self) -> float | None:
+        """
+        > return: Time of the first record in the log file, or None if there
+                  is none
+        """
+        try:
+            with open(self.baseFilename, encoding="utf-8",
+                      errors="replace") as f:
+                return LOGRECTIME(f.readline())
+        except OSError:
+            return None
+
+    def shouldRollover(self, record: lg.LogRecord) -> bool:
+        if self.stream is None:
+            self.stream = self._open()
+        if self.maxSz and self.stream.tell() >= self.maxSz:
+            return True
+        return bool(self.maxAge and self.startTime is not None
+                    and record.created >= self.startTime + self.maxAge)
+
+    def doRollover(self) -> None:
+        if self.stream:
+            self.stream.close()
+            self.stream = None
+
+        try:
+            if self.archives:
+                for num in range(self.archives - 1, 0, -1):
+                    if os.path.exists(self.archivePth(num)):
+                        os.replace(self.archivePth(num),
+                                   self.archivePth(num + 1))
+                tmpPth = self.archivePth(1) + ".tmp"
+                with open(self.baseFilename, 'rb') as src, \
+                        gzip.open(tmpPth, 'wb') as dst:
+                    sh.copyfileobj(src, dst)
+                os.replace(tmpPth, self.archivePth(1))
+
+            # Archives beyond the limit, e.g. after it was lowered
+            num = self.archives + 1
+            while os.path.exists(self.archivePth(num)):
+                os.remove(self.archivePth(num))
+                num += 1
+
+            open(self.baseFilename, 'w').close()
+
+        except OSError:
+            # Keep on logging to the same file; it is tried again next time
+            pass
+
+        self.stream    = self._open()
+        self.startTime = self._firstRecTime()
+
+    def emit(self, record: lg.LogRecord) -> None:
+        super().emit(record)
+        if self.startTime is None:
+            self.startTime = record.created
+
+    def clear(self) -> None:
+        """
+        Remove the archives and empty the log file.
+        """
+        self.acquire()
+        try:
+            if self.stream:
+                self.stream.close()
+                self.stream = None
+            for pth in self.segments()[:-1]:
+                os.remove(pth)
+            open(self.baseFilename, 'w').close()
+        finally:
+            self.stream    = self._open()
+            self.startTime = None
+            self.release()
+
+
+class LogIndex:
+    """
+    Sparse index of the log file: the offsets and times of the records met
+    while binary searching it, so that later searches start from narrower
+    bounds. It is kept for as long as the file only grows.
+    """
+    def __init__(self) -> None:
+        self.key   : tuple[int, int, float | None] | None = None
+        self.size   = 0
+        self.offs  : list[int]   = []
+        self.stamps: list[float] = []
+
+    def _check(self, f: ty.BinaryIO) -> int:
+        """
+        Drop the index if the file was replaced, truncated or rolled over.
+        > param f: The log file, opened in binary mode
+        > return: Size of the file
+        """
+        stat = os.fstat(f.fileno())
+        f.seek(0)
+        key  = (stat.st_dev, stat.st_ino,
+                LOGRECTIME(f.readline().decode("utf-8", "replace")))
+        if key != self.key or stat.st_size < self.size:
+            self.key    = key
+            self.offs   = []
+            self.stamps = []
+        self.size = stat.st_size
+        return stat.st_size
+
+    def _probe(self, f: ty.BinaryIO, pos: int) -> tuple[int, float | None]:
+        """
+        Find the first record starting at or after an offset, and add it to
+        the index.
+        > param f: The log file, opened in binary mode
+        > param pos: The offset
+        > return: Offset and time of the record, or the size of the file and
+                  None if there is no such record
+        """
+        # Rest of the line the offset is in, unless it starts a line
+        f.seek(pos - 1 if pos else 0)
+        if pos:
+            f.readline()
+
+        while ln := f.readline():
+            if ln[:1] == b'[' and (stamp := LOGRECTIME(
+                    ln.decode("utf-8", "replace"))) is not None:
+                start = f.tell() - len(ln)
+                i     = bisect.bisect_left(self.offs, start)
+                if i == len(self.offs) or self.offs[i] != start:
+                    self.offs.insert(i, start)
+                    self.stamps.insert(i, stamp)
+                return start, stamp
+        return self.size, None
+
+    def seek(self, f: ty.BinaryIO, since: float) -> int:
+        """
+        Binary search the log file for the records from a given time on.
+        > param f: The log file, opened in binary mode
+        > param since: The time
+        > return: Offset of a record at or before the first record from that
+                  time on; no record from before it is at a later offset
+        """
+        size = self._check(f)
+        i    = bisect.bisect_left(self.stamps, since)
+        lo   = self.offs[i - 1] + 1 if i else 0
+        hi   = self.offs[i] if i < len(self.offs) else size
+
+        while hi - lo > LOGIDXBLK:
+            mid          = (lo + hi) // 2
+            start, stamp = self._probe(f, mid)
+            if stamp is None or start >= hi:
+                hi = mid
+            elif stamp < since:
+                lo = start + 1
+            else:
+                hi = start
+
+        return self._probe(f, lo)[0]
+
+
+class LogMsg:
+    """
+    Message passed to the loggers by DEBUG(), ERR(), etc. It is escaped only
+    when a handler actually formats it.
+    """
+    __slots__ = ("msg",)
+
+    def __init__(self, msg: str | Exception) -> None:
+        self.msg = msg
+
+    def __str__(self) -> str:
+        return repr(str(self.msg))[1:-1]
+
+
+def LOGRECTIME(line: str) -> float | None:
+    """
+    Get the time of a record in the log file from its first line (ref. the
+    file formatter in INITLOGGERS()).
+    > param line: The line
+    > return: POSIX timestamp, or None if the line does not start a record
+    """
+    line = line.strip()
+    if not (line.startswith('[') and line.endswith(']')):
+        return None
+    try:
+        return dt.datetime.strptime(line[1:-1],
+                                    LOGDATEFMT + ".%f").timestamp()
+    except ValueError:
+        return None
+
+
 def INITLOGGERS() -> tuple[lg.Logger, lg.Logger, lg.Logger, lg.Logger,
-                           lg.Logger, lg.Logger]:
+                           lg.Logger, lg.Logger, lh.QueueListener]:
     """
     Initialise logging components and logger.
-    > return: Logger object after applying formatting rules and adding handlers
+    > return: Logger object after applying formatting rules and adding
+              handlers, and the listener writing the log file
     NOTE: Please note that the Logger class is set in this function with
           the function logging.setLogger
     """
     lg.captureWarnings(True)
     lg.setLoggerClass(CustomLogger)
+    # None of the formats use these
+    lg.logThreads         = False
+    lg.logProcesses       = False
+    lg.logMultiprocessing = False
+    lg.logAsyncioTasks    = False
 
     # > cnCometLgr handles logging to console from the interpreter itself,
     #   above WARN. Will be used by ERR(), CRIT() and FATAL();
@@ -124,7 +390,9 @@ def INITLOGGERS() -> tuple[lg.Logger, lg.Logger, lg.Logger, lg.Logger,
     # > cnDebugLgr handles logging to console, from commands, of DEBUG,
     #   INFO, and anything above this. Will be used by DEBUG() and INFO();
     # > flLgr handles logging to a log file (log.log) of CRIT and above. Will
-    #   be used by CRIT() and FATAL();
+    #   be used by CRIT() and FATAL(). Records are put on a queue, and written
+    #   to the file by a listener thread, so that logging never waits on the
+    #   disk;
     lgr             = lg.getLogger(__name__)
     cnCometLgr      = lgr.getChild("COMET")
     cnLgr           = lgr.getChild("STDERR")
@@ -152,14 +420,19 @@ def INITLOGGERS() -> tuple[lg.Logger, lg.Logger, lg.Logger, lg.Logger,
     flFormatter           = CustomLogFormatter(
         fmt=("[%(asctime)s.%(msecs)03d]\n%(levelname)s:%(module)s:"
             "%(funcName)s:\n%(message)s\n--------"),
-        datefmt="%z/%d-%m-%Y/%H:%M:%S"
+        datefmt=LOGDATEFMT
     )
 
     cnHdlerComet      = lg.StreamHandler()
     cnHdler           = lg.StreamHandler()
     cnHdlerDebug      = lg.StreamHandler()
     cnCometHdlerDebug = lg.StreamHandler()
-    flHdler           = lg.FileHandler(LOGFL, 'a', encoding="utf-8")
+    flHdler           = RotatingLogHandler(LOGFL, LOGMAXSZ, LOGMAXAGE,
+                                           LOGARCHIVES)
+    flQueue           = qu.SimpleQueue()
+    flQHdler          = lh.QueueHandler(flQueue)
+    flLstnr           = lh.QueueListener(flQueue, flHdler,
+                                         respect_handler_level=True)
 
     cnHdlerComet.setFormatter(cnCometFormatter)
     cnHdler.setFormatter(cnFormatter)
@@ -172,14 +445,26 @@ def INITLOGGERS() -> tuple[lg.Logger, lg.Logger, lg.Logger, lg.Logger,
     cnHdlerDebug.setLevel(lg.DEBUG)
     cnCometHdlerDebug.setLevel(lg.DEBUG)
     flHdler.setLevel(lg.CRITICAL)
+    flLgr.setLevel(lg.CRITICAL)
 
     cnCometLgr.addHandler(cnHdlerComet)
     cnLgr.addHandler(cnHdler)
-    flLgr.addHandler(flHdler)
+    flLgr.addHandler(flQHdler)
     cnDebugLgr.addHandler(cnHdlerDebug)
     cnCometDebugLgr.addHandler(cnCometHdlerDebug)
 
-    return lgr, cnCometLgr, cnLgr, cnDebugLgr, cnCometDebugLgr, flLgr
+    cnCometLgr.needsCaller      = cnCometFormatter.usesCaller()
+    cnLgr.needsCaller           = cnFormatter.usesCaller()
+    cnDebugLgr.needsCaller      = cnDebugFormatter.usesCaller()
+    cnCometDebugLgr.needsCaller = cnCometDebugFormatter.usesCaller()
+    flLgr.needsCaller           = flFormatter.usesCaller()
+
+    # Stopping the listener writes out what is left in the queue
+    flLstnr.start()
+    atexit.register(flLstnr.stop)
+
+    return (lgr, cnCometLgr, cnLgr, cnDebugLgr, cnCometDebugLgr, flLgr,
+            flLstnr)
 
 
 def ANSIOK() -> bool:
@@ -278,9 +563,9 @@ def DEBUG(msg: str | Exception, sl: int = 3, raiser: str = "notc") -> int:
     > return: None
     """
     if raiser == "notc":
-        CNDEBUGLGR.debug(repr(str(msg))[1:-1], sl=sl)
+        CNDEBUGLGR.debug(LogMsg(msg), sl=sl)
     elif raiser == 'c':
-        CNCOMETDEBUGLGR.debug(repr(str(msg))[1:-1], sl=sl)
+        CNCOMETDEBUGLGR.debug(LogMsg(msg), sl=sl)
     return 0
 
 
@@ -291,25 +576,25 @@ def INFO(msg: str | Exception, sl: int = 3, raiser: str = "notc") -> int:
     > return: None
     """
     if raiser == "notc":
-        CNDEBUGLGR.info(repr(str(msg))[1:-1], sl=sl)
+        CNDEBUGLGR.info(LogMsg(msg), sl=sl)
     elif raiser == 'c':
-        CNCOMETDEBUGLGR.info(repr(str(msg))[1:-1], sl=sl)
+        CNCOMETDEBUGLGR.info(LogMsg(msg), sl=sl)
     return 0
 
 
 def WARN(msg: str | Exception, sl: int = 3, raiser: str = "notc") -> int:
     if raiser == "notc":
-        CNDEBUGLGR.warning(repr(str(msg))[1:-1], sl=sl)
+        CNDEBUGLGR.warning(LogMsg(msg), sl=sl)
     elif raiser == 'c':
-        CNCOMETDEBUGLGR.warning(repr(str(msg))[1:-1], sl=sl)
+        CNCOMETDEBUGLGR.warning(LogMsg(msg), sl=sl)
     return 0
 
 
 def ERR(msg: str | Exception, sl: int = 3, raiser: str = "notc") -> int:
     if raiser == "notc":
-        CNLGR.error(repr(str(msg))[1:-1], sl=sl)
+        CNLGR.error(LogMsg(msg), sl=sl)
     elif raiser == 'c':
-        CNCOMETLGR.error(repr(str(msg))[1:-1], sl=sl)
+        CNCOMETLGR.error(LogMsg(msg), sl=sl)
     return 1
 
 
@@ -318,9 +603,9 @@ def CRIT(msg: str | Exception, logTxt: str = '', sl: int = 3,
     if logTxt == '':
         logTxt = str(msg)
     if raiser == "notc":
-        CNLGR.critical(repr(str(msg))[1:-1], sl=sl)
+        CNLGR.critical(LogMsg(msg), sl=sl)
     elif raiser == 'c':
-        CNCOMETLGR.critical(repr(str(msg))[1:-1], sl=sl)
+        CNCOMETLGR.critical(LogMsg(msg), sl=sl)
     FLLGR.critical(logTxt, sl=sl)
     return 2
 
@@ -339,9 +624,9 @@ def UNERR(msg: str | Exception, logTxt: str = '', sl: int = 3,
     if logTxt == '':
         logTxt = str(msg)
     if raiser == "notc":
-        CNLGR.fatal(repr(str(msg))[1:-1], sl=sl)
+        CNLGR.fatal(LogMsg(msg), sl=sl)
     elif raiser == 'c':
-        CNCOMETLGR.fatal(repr(str(msg))[1:-1], sl=sl)
+        CNCOMETLGR.fatal(LogMsg(msg), sl=sl)
     FLLGR.fatal(logTxt, sl=sl)
     return -1
 
@@ -409,36 +694,20 @@ def _PROCDATA_RDSETT(line: str, i: int) \
 
 def RDSETT() -> dict[str, ty.Any]:
     """
-    Read Clash settings from file src\\_settings.txt.
+    Read Clash settings from file src\\_settings.txt. The file is parsed
+    again only if it changed since it was last read (ref. SettStore).
     > return: Settings dictionary or None if invalid or other errors.
     """
-    settings: dict[str, ty.Any] = {"path": USRDIR}
-
     try:
-        with open(SETTFL, 'r') as f:
-            for i, line in enumerate(f):
-                pair, err = _PROCDATA_RDSETT(line, i)
-                if pair is None:
-                    continue
-
-                if err == 0:
-                    settings[pair[0].lower()] = pair[1]
-                elif err == 1:
-                    ERR(f"Cannot parse line {i+1} in settings file", raiser='c')
-                elif err == 2:
-                    ERR(f"(SETTINGS) Unknown parameter on line {i+1}: '{pair[0]}'",
-                        raiser='c')
-
-    except FileNotFoundError:
-        try:
-            open(SETTFL, 'w').close()
-        except PermissionError:
-            ERR("Access is denied: Unable to create settings file")
+        return SETTSTORE.settings()
+
+    except PermissionError:
+        ERR("Access is denied: Unable to read or create settings file")
 
     except (SyntaxError, UnicodeDecodeError):
         ERR(f"Invalid data in settings file", raiser='c')
 
-    return settings
+    return {"path": USRDIR}
 
 
 def DICTSRCH(fndKey: ty.Any, givenDict: dict[ty.Any, ty.Any],
@@ -519,54 +788,30 @@ def PARAMOK(param: str) -> int:
 
 def SETSETT(param: str, value: str) -> int:
     """
-    Sets an attribute's value in the settings file.
-    > param dirname: Clash root directory
+    Sets an attribute's value in the settings file. Inside a SETTSTORE.batch()
+    the file is written only when the batch ends.
     > param param: Attribute to be set
     > param value: Value to be set to attribute
-    > param howMany: Number of values to be set
     > return: Error code
         0: Success
         1: Attribute not found
         2: Invalid parameter name
+        5: Access denied
+        6: Other OS error
     """
-    reqLn = param + '=' + value + '\n'
-
     if not PARAMOK(param):
         return 2
 
     try:
-        foundLn = False
-        sh.copyfile(SETTFL, SETTTMP)
-
-        with open(SETTFL, 'w') as f, open(SETTTMP, 'r') as g:
-            for line in g:
-                linePar = line.partition('=')
-                if linePar[1] == '':
-                    f.write(line)
-                    continue
-                if linePar[0].lower() == param.lower():
-                    f.write(reqLn)
-                    foundLn = True
-                else:
-                    f.write(line)
-
-            if not foundLn:
-                f.write(reqLn)
-
-        os.remove(SETTTMP)
+        SETTSTORE.set(param, value)
         return 0
 
-    except FileNotFoundError:
-        try:
-            with open(SETTFL, 'w') as f:
-                f.write(reqLn)
-            return 0
-        except PermissionError:
-            return 5
-
     except PermissionError:
         return 5
 
+    except OSError:
+        return 6
+
 
 def RDPREVCHAR(fd: ty.TextIO) -> str | Exception:
     """
@@ -580,27 +825,676 @@ def RDPREVCHAR(fd: ty.TextIO) -> str | Exception:
     return fd.read(1)
 
 
-def SORTTWOARRS(arr1: list[ty.Any], arr2: list[ty.Any]) \
-        -> tuple[list[ty.Any], list[ty.Any], int]:
-    ERR_DIFFLENS = 1
-
-    if len(arr1) != len(arr2):
-        return [], [], ERR_DIFFLENS
-
-    lenArr1 = len(arr1)
-    i       = 1
+class FlushingWriter(io.TextIOBase):
+    """
+    Buffered text stream for output that goes straight to the terminal.
+    Writes are collected and handed to the underlying stream once the buffer
+    grows past FLUSHSZ characters or FLUSHINTVL seconds have passed since the
+    last flush, so that long-running commands show their output as they go
+    without paying for a console write on every print(). What was written
+    just before the command falls silent is flushed by FLUSHER, for as long
+    as the writer is open (until close()).
+    """
+    def __init__(self, stream: ty.TextIO, limit: int | None = None,
+                 interval: float | None = None) -> None:
+        super().__init__()
+        self.stream    = stream
+        self.limit     = FLUSHSZ    if limit    is None else limit
+        self.interval  = FLUSHINTVL if interval is None else interval
+        self.buf       = []
+        self.bufSz     = 0
+        self.lastFlush = time.monotonic()
+        self.lock      = threading.RLock()
+        FLUSHER.add(self)
+
+    def writable(self) -> bool:
+        return True
+
+    def isatty(self) -> bool:
+        return self.stream.isatty()
+
+    def fileno(self) -> int:
+        return self.stream.fileno()
+
+    def write(self, txt: str) -> int:
+        with self.lock:
+            self.buf.append(txt)
+            self.bufSz += len(txt)
+            if (self.bufSz >= self.limit
+                or time.monotonic() - self.lastFlush >= self.interval):
+                self.flush()
+        return len(txt)
+
+    @property
+    def buffer(self) -> ty.BinaryIO:
+        # Raw writes must not overtake text still sitting in the buffer
+        self.flush()
+        return self.stream.buffer
+
+    def flush(self) -> None:
+        with self.lock:
+            if self.buf:
+                self.stream.write(''.join(self.buf))
+                self.buf.clear()
+                self.bufSz = 0
+            self.stream.flush()
+            self.lastFlush = time.monotonic()
+
+    def flushStale(self) -> None:
+        "Flushes the buffer if it has waited for the interval; ref. Flusher."
+        with self.lock:
+            if self.buf and time.monotonic() - self.lastFlush >= self.interval:
+                self.flush()
+
+    def close(self) -> None:
+        "Flushes the buffer for the last time; the stream is left open."
+        FLUSHER.discard(self)
+        self.flush()
+
+
+class Flusher:
+    """
+    Flushes open FlushingWriters whose output has been waiting for their
+    interval, from a single thread that is started once and sleeps while no
+    writer is open.
+    """
+    def __init__(self, interval: float) -> None:
+        self.interval = interval
+        self.writers  : set[FlushingWriter] = set()
+        self.lock     = threading.Lock()
+        self.active   = threading.Event()
+        self.thread   = None
+
+    def add(self, writer: FlushingWriter) -> None:
+        with self.lock:
+            self.writers.add(writer)
+            self.active.set()
+            if self.thread is None:
+                self.thread = threading.Thread(target=self._run, daemon=True)
+                self.thread.start()
+
+    def discard(self, writer: FlushingWriter) -> None:
+        with self.lock:
+            self.writers.discard(writer)
+            if not self.writers:
+                self.active.clear()
+
+    def _run(self) -> None:
+        while True:
+            self.active.wait()
+            time.sleep(self.interval)
+            with self.lock:
+                writers = list(self.writers)
+            for writer in writers:
+                try:
+                    writer.flushStale()
+                except (OSError, ValueError):
+                    # The stream went away under a writer being closed
+                    pass
+
+
+class PipeData:
+    """
+    Output of a pipeline stage, as handed to the next stage. Backed by the
+    raw bytes the stage wrote; slicing returns views into the same buffer,
+    and the payload is decoded to text only when text() is first called.
+    """
+    __slots__ = ("buf", "start", "end", "encoding", "_txt")
+
+    def __init__(self, buf: bytes | bytearray, start: int = 0,
+                 end: int | None = None, encoding: str = "utf-8") -> None:
+        self.buf      = buf
+        self.start    = start
+        self.end      = len(buf) if end is None else end
+        self.encoding = encoding
+        self._txt     = None
+
+    def __len__(self) -> int:
+        return self.end - self.start
+
+    def __getitem__(self, idx: slice) -> "PipeData":
+        start, stop, step = idx.indices(len(self))
+        if step != 1:
+            raise ValueError("PipeData slices must be contiguous")
+        return PipeData(self.buf, self.start + start,
+                        self.start + max(start, stop), self.encoding)
+
+    def __str__(self) -> str:
+        return self.text()
+
+    def bytes(self) -> memoryview:
+        """
+        > return: Read-only view of the raw payload (no copy)
+        """
+        return memoryview(self.buf)[self.start:self.end].toreadonly()
+
+    def text(self) -> str:
+        """
+        > return: The payload decoded as text (decoded once, then cached)
+        """
+        if self._txt is None:
+            self._txt = str(self.bytes(), self.encoding, "replace")
+        return self._txt
+
+    def count(self, sub: bytes) -> int:
+        """
+        > param sub: Byte string to count
+        > return: Number of non-overlapping occurrences of sub
+        """
+        return self.buf.count(sub, self.start, self.end)
+
+    def find(self, sub: bytes, pos: int = 0) -> int:
+        """
+        > param sub: Byte string to look for
+        > param pos: Offset (relative to this payload) to start looking from
+        > return: Offset of the first occurrence of sub, or -1
+        """
+        idx = self.buf.find(sub, self.start + pos, self.end)
+        return -1 if idx == -1 else idx - self.start
+
+    def lines(self) -> ty.Generator["PipeData", None, None]:
+        """
+        > return: Generator of views of each line, without the line endings
+        """
+        pos  = 0
+        len_ = len(self)
+        while pos < len_:
+            nl = self.find(b'\n', pos)
+            if nl == -1:
+                yield self[pos:]
+                return
+            end = nl - 1 if nl > pos and self.buf[self.start + nl - 1] == 13 \
+                  else nl
+            yield self[pos:end]
+            pos = nl + 1
+
+
+class PipeCapture(io.TextIOWrapper):
+    """
+    Capture for the output of a command whose output is piped, redirected
+    or used in a subcommand. Text and raw bytes (written to .buffer) land in
+    the same byte buffer, with no newline translation.
+    """
+    def __init__(self) -> None:
+        super().__init__(io.BytesIO(), encoding="utf-8", newline='\n',
+                         write_through=True)
 
-    while i < lenArr1:
-        j = i
+    def payload(self) -> PipeData:
+        """
+        > return: Everything written so far, as a PipeData
+        """
+        self.flush()
+        # BytesIO.getvalue() hands over its internal bytes object when it
+        # can, so this does not copy the output
+        return PipeData(self.buffer.getvalue())
 
-        while j > 0 and arr1[j - 1] > arr1[j]:
-            arr1[j - 1], arr1[j] = arr1[j], arr1[j - 1]
-            arr2[j - 1], arr2[j] = arr2[j], arr2[j - 1]
-            j -= 1
+    def getvalue(self) -> str:
+        return self.payload().text()
 
-        i += 1
 
-    return arr1, arr2, ERR_SUCCESS
+class WriterPool:
+    """
+    Keeps the targets of output redirections open, with large buffers, so
+    that repeated redirections to the same file (e.g. from a loop) do not
+    open and close it every time. Writers are flushed and closed by sync(),
+    all but the one still being written to, before any other command runs,
+    so that it finds the files complete and not held open.
+    """
+    def __init__(self, bufSz: int | None = None) -> None:
+        self.bufSz   = REDIRBUFSZ if bufSz is None else bufSz
+        self.writers = {}
+
+    def __len__(self) -> int:
+        return len(self.writers)
+
+    @staticmethod
+    def _key(path: str) -> str:
+        return os.path.normcase(os.path.abspath(path))
+
+    def write(self, path: str, data: bytes | memoryview,
+              truncate: bool = False) -> None:
+        """
+        Write to a redirection target, opening it if it is not open yet.
+        > param path: Path of the target file
+        > param data: Data to be written
+        > param truncate: Truncate the file before writing
+        """
+        key = self._key(path)
+        fl  = self.writers.get(key)
+
+        if fl is None:
+            fl = open(path, 'wb' if truncate else 'ab', buffering=self.bufSz)
+            self.writers[key] = fl
+        elif truncate:
+            fl.seek(0)
+            fl.truncate()
+
+        fl.write(data)
+
+    def sync(self, keep: str | None = None) -> int:
+        """
+        Flush and close open writers.
+        > param keep: Path of a target to be left open, if it is open
+        > return: Error code (ref. src\\errCodes.txt)
+        """
+        keepKey = None if keep is None else self._key(keep)
+        err     = ERR_SUCCESS
+        for key in [key for key in self.writers if key != keepKey]:
+            try:
+                # Flushes what is left first
+                self.writers.pop(key).close()
+            except OSError:
+                ERR(f"Could not write to \"{key}\"; disc full or file "
+                    "removed?", raiser='c')
+                err = err or ERR_OSERR
+        return err
+
+
+class Trie:
+    """
+    Prefix tree of names (lowercase). Every node keeps the sorted names below
+    it, so that the names starting with a prefix are found by walking down
+    the prefix alone. A name added more than once stays until it is removed
+    as many times.
+    """
+    def __init__(self) -> None:
+        self.root  : tuple[dict[str, ty.Any], list[str]] = ({}, [])
+        self.counts: dict[str, int] = {}
+
+    def add(self, name: str) -> None:
+        """
+        Add a name.
+        > param name: The name
+        """
+        name = name.lower()
+        if self.counts.get(name, 0):
+            self.counts[name] += 1
+            return
+        self.counts[name] = 1
+
+        node = self.root
+        bisect.insort(node[1], name)
+        for char in name:
+            node = node[0].setdefault(char, ({}, []))
+            bisect.insort(node[1], name)
+
+    def remove(self, name: str) -> None:
+        """
+        Remove a name.
+        > param name: The name
+        """
+        name = name.lower()
+        if not self.counts.get(name, 0):
+            return
+        self.counts[name] -= 1
+        if self.counts[name]:
+            return
+        del self.counts[name]
+
+        path = [self.root]
+        for char in name:
+            path.append(path[-1][0][char])
+        for node in path:
+            del node[1][bisect.bisect_left(node[1], name)]
+        # Prune the branches left empty
+        for i in range(len(name), 0, -1):
+            if path[i][1]:
+                break
+            del path[i - 1][0][name[i - 1]]
+
+    def find(self, prefix: str) -> list[str]:
+        """
+        The names starting with a prefix. The list must not be changed.
+        > param prefix: The prefix (case-insensitive)
+        > return: Sorted list of names
+        """
+        node = self.root
+        for char in prefix.lower():
+            if (node := node[0].get(char)) is None:
+                return []
+        return node[1]
+
+    def __contains__(self, name: str) -> bool:
+        return name.lower() in self.counts
+
+
+class SettStore:
+    """
+    In-memory copy of the settings file. Lines are kept as they are in the
+    file, and re-read only when the file's modification time changes.
+    Changes made inside batch() are written out once, when it ends, through a
+    temporary file that replaces the settings file.
+    """
+    def __init__(self, path: str, tmpPath: str) -> None:
+        self.path    = path
+        self.tmpPath = tmpPath
+        self.stamp   : tuple[int, int] | None = None
+        self.lines   : list[str] = []
+        self.parsed  : dict[str, ty.Any] | None = None
+        self.depth   = 0
+        self.dirty   = False
+
+    def reload(self) -> bool:
+        """
+        Re-read the settings file if it changed since it was last read or
+        written. A missing settings file is created empty.
+        > return: True if the file was re-read, False otherwise
+        """
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            open(self.path, 'w').close()
+            stat = os.stat(self.path)
+
+        stamp = (stat.st_mtime_ns, stat.st_size)
+        if stamp == self.stamp:
+            return False
+
+        with open(self.path, 'r') as f:
+            self.lines = f.read().splitlines()
+        self.stamp  = stamp
+        self.parsed = None
+        return True
+
+    def items(self) -> ty.Iterator[tuple[str, str]]:
+        """
+        The attribute names and values in the settings file, as they are in
+        it; invalid lines are skipped.
+        > return: Generator of attribute name and value pairs
+        """
+        self.reload()
+        for line in self.lines:
+            attr, val = GETATTRFRMSETTFL(line)
+            if attr is not None and val is not None:
+                yield attr, val
+
+    def settings(self) -> dict[str, ty.Any]:
+        """
+        The known settings, processed as in RDSETT(). Errors in the file are
+        reported only when it is (re-)read.
+        > return: Settings dictionary
+        """
+        self.reload()
+        if self.parsed is not None:
+            return dict(self.parsed)
+
+        settings: dict[str, ty.Any] = {"path": USRDIR}
+        for i, line in enumerate(self.lines):
+            pair, err = _PROCDATA_RDSETT(line, i)
+            if pair is None:
+                continue
+            if err == 0:
+                settings[pair[0].lower()] = pair[1]
+            elif err == 1:
+                ERR(f"Cannot parse line {i+1} in settings file", raiser='c')
+            elif err == 2:
+                ERR(f"(SETTINGS) Unknown parameter on line {i+1}: '{pair[0]}'",
+                    raiser='c')
+
+        self.parsed = settings
+        return dict(settings)
+
+    def set(self, param: str, value: str) -> None:
+        """
+        Set an attribute, replacing every line that sets it, or adding one.
+        > param param: Attribute to be set
+        > param value: Value to be set to the attribute
+        """
+        with self.batch():
+            reqLn   = param + '=' + value
+            foundLn = False
+            for i, line in enumerate(self.lines):
+                attr, val = GETATTRFRMSETTFL(line)
+                if attr is not None and attr.lower() == param.lower():
+                    self.lines[i] = reqLn
+                    foundLn       = True
+            if not foundLn:
+                self.lines.append(reqLn)
+            self.dirty = True
+
+    def remove(self, param: str) -> bool:
+        """
+        Remove every line that sets an attribute.
+        > param param: Attribute to be removed
+        > return: True if the attribute was set, False otherwise
+        """
+        with self.batch():
+            before     = len(self.lines)
+            self.lines = [line for line in self.lines
+                          if (tmp := GETATTRFRMSETTFL(line)[0]) is None
+                          or tmp.lower() != param.lower()]
+            found      = len(self.lines) != before
+            self.dirty = self.dirty or found
+        return found
+
+    def replace(self, pairs: ty.Iterable[tuple[str, str]]) -> None:
+        """
+        Replace the whole settings file.
+        > param pairs: Attribute names and values to be written
+        """
+        with self.batch():
+            self.lines = [attr + '=' + val for attr, val in pairs]
+            self.dirty = True
+
+    @contextlib.contextmanager
+    def batch(self) -> ty.Iterator[None]:
+        """
+        Group changes so that the settings file is written once, when the
+        outermost batch ends. If an exception is raised in the batch, its
+        changes are dropped.
+        """
+        if not self.depth:
+            self.reload()
+        saved = self.lines[:]
+        self.depth += 1
+        try:
+            yield
+        except BaseException:
+            self.lines = saved
+            raise
+        finally:
+            self.depth -= 1
+        if not self.depth and self.dirty:
+            self.save()
+
+    def save(self) -> None:
+        """
+        Write the settings file: to a temporary file, which then replaces it.
+        """
+        try:
+            with open(self.tmpPath, 'w') as f:
+                f.writelines(line + '\n' for line in self.lines)
+            os.replace(self.tmpPath, self.path)
+        except OSError:
+            # Keep the file and the copy in memory in agreement
+            self.stamp = None
+            self.dirty = False
+            try:
+                os.remove(self.tmpPath)
+            except OSError:
+                pass
+            raise
+        stat        = os.stat(self.path)
+        self.stamp  = (stat.st_mtime_ns, stat.st_size)
+        self.parsed = None
+        self.dirty  = False
+
+
+class AliasStore:
+    """
+    The aliases, kept in memory. Changes are appended to a journal file
+    instead of rewriting the alias file, so that setting or removing an
+    alias costs one short write however many aliases there are. The journal
+    is folded into the alias file (compacted) on a background thread once it
+    grows long, and whenever aliases are loaded with a non-empty journal.
+    Journal lines are alias file lines ("name=command"), or "-name" for a
+    removal.
+    """
+    def __init__(self, path: str, jnlPath: str, tmpPath: str) -> None:
+        self.path     = path
+        self.jnlPath  = jnlPath
+        self.tmpPath  = tmpPath
+        self.aliases  : dict[str, str] = {}
+        self.names    : dict[str, str] = {}
+        self.jnlLen   = 0
+        self.lock     = threading.Lock()
+        self.compactr : threading.Thread | None = None
+        # Bumped on every change, for those keeping track of the aliases
+        self.version  = 0
+
+    def _apply(self, line: str, where: str, i: int) -> None:
+        """
+        Apply a line of the alias file or the journal to the aliases.
+        > param line: The line, without the newline
+        > param where: Name of the file, for error reporting
+        > param i: The (zero-indexed) line number, for error reporting
+        """
+        if not line or line.isspace():
+            return
+        if line[0] == '-':
+            self._drop(line[1:])
+            return
+
+        alias, sep, value = line.partition('=')
+        if sep == '':
+            ERR(f"(ALIASES) Cannot parse line {i + 1} of {where}: \"{line}\"",
+                raiser='c')
+        elif not PARAMOK(alias):
+            ERR(f"(ALIASES) Invalid name on line {i + 1} of {where}: '{alias}'",
+                raiser='c')
+        else:
+            self._drop(alias)
+            self.aliases[alias]       = value
+            self.names[alias.lower()] = alias
+
+    def _drop(self, alias: str) -> bool:
+        """
+        Remove an alias from memory.
+        > param alias: Name of the alias (case-insensitive)
+        > return: True if the alias existed, False otherwise
+        """
+        if (name := self.names.pop(alias.lower(), None)) is None:
+            return False
+        del self.aliases[name]
+        return True
+
+    def load(self) -> None:
+        """
+        (Re-)read the alias file and replay the journal over it. A missing
+        alias file is created empty.
+        """
+        with self.lock:
+            self.aliases.clear()
+            self.names.clear()
+            self.jnlLen   = 0
+            self.version += 1
+            try:
+                with open(self.path, 'r') as f:
+                    for i, line in enumerate(f):
+                        self._apply(line.removesuffix('\n'), "alias file", i)
+            except FileNotFoundError:
+                open(self.path, 'w').close()
+            try:
+                with open(self.jnlPath, 'r') as f:
+                    for i, line in enumerate(f):
+                        self._apply(line.removesuffix('\n'), "alias journal",
+                                    i)
+                        self.jnlLen += 1
+            except FileNotFoundError:
+                pass
+        if self.jnlLen:
+            self.compact()
+
+    def get(self, alias: str) -> str | None:
+        """
+        Look an alias up.
+        > param alias: Name of the alias (case-insensitive)
+        > return: The aliased command, or None if there is no such alias
+        """
+        name = self.names.get(alias.lower())
+        return None if name is None else self.aliases[name]
+
+    def _log(self, line: str) -> None:
+        """
+        Append a line to the journal. Must be called with the lock held.
+        > param line: The line, without the newline
+        """
+        with open(self.jnlPath, 'a') as f:
+            f.write(line + '\n')
+        self.jnlLen += 1
+
+    def set(self, alias: str, cmd: str) -> None:
+        """
+        Set an alias, replacing any alias of the same name.
+        > param alias: Name of the alias
+        > param cmd: Command to be aliased
+        """
+        with self.lock:
+            self._log(alias + '=' + cmd)
+            self._drop(alias)
+            self.aliases[alias]       = cmd
+            self.names[alias.lower()] = alias
+            self.version             += 1
+        if self.jnlLen >= ALIASJNLMAX:
+            self.compact()
+
+    def remove(self, alias: str) -> bool:
+        """
+        Remove an alias.
+        > param alias: Name of the alias (case-insensitive)
+        > return: True if the alias existed, False otherwise
+        """
+        with self.lock:
+            if alias.lower() not in self.names:
+                return False
+            self._log('-' + alias)
+            self._drop(alias)
+            self.version += 1
+        if self.jnlLen >= ALIASJNLMAX:
+            self.compact()
+        return True
+
+    def compact(self, wait: bool = False) -> None:
+        """
+        Fold the journal into the alias file on a background thread, unless
+        one is already doing so.
+        > param wait: Wait for the compaction to finish
+        """
+        if self.compactr is None or not self.compactr.is_alive():
+            self.compactr = threading.Thread(target=self._compact,
+                                             daemon=True)
+            self.compactr.start()
+        if wait:
+            self.compactr.join()
+
+    def _compact(self) -> None:
+        """
+        Write the aliases to a temporary file that replaces the alias file,
+        then empty the journal. Should it stop halfway, the journal is only
+        replayed over aliases that already include it, which changes nothing.
+        """
+        with self.lock:
+            try:
+                with open(self.tmpPath, 'w') as f:
+                    f.writelines(f"{alias}={cmd}\n"
+                                 for alias, cmd in self.aliases.items())
+                os.replace(self.tmpPath, self.path)
+                open(self.jnlPath, 'w').close()
+                self.jnlLen = 0
+            except OSError as e:
+                ERR(f"(ALIASES) Could not compact the alias journal: {e}",
+                    raiser='c')
+
+
+def RAWPIPE(func: ty.Callable[..., int]) -> ty.Callable[..., int]:
+    """
+    Mark a command function as taking piped input as a PipeData object
+    (raw bytes) instead of a decoded string.
+    > param func: The command function
+    > return: The same function
+    """
+    func.rawPipe = True
+    return func
 
 
 class SIGREINCARNATE(Exception):
@@ -614,6 +1508,19 @@ class SIGREINCARNATE(Exception):
 
 # NOTE: STDOUT and STDERR are unused as of now...
 
+# Pass-through output (ref. FlushingWriter): flush after this many characters
+# or after this many seconds, whichever comes first
+FLUSHSZ    = 1 << 16
+FLUSHINTVL = 0.05
+FLUSHER    = Flusher(FLUSHINTVL)
+# Buffer size of kept-open redirection targets (ref. WriterPool)
+REDIRBUFSZ = 1 << 20
+# Compiled block bodies kept by the interpreter (ref. Intrp.compile())
+COMPILEDCACHESZ = 256
+# Nested calls of user-defined functions allowed (ref. UserFunc), well within
+# Python's own recursion limit
+FUNCDEPTHMAX    = 64
+
 FATAL       = 60
 GETEXC      = tb.format_exc
 COMETHELP   = ("The Comet interpreter, version 1.0", '', "OPTIONS",
@@ -628,8 +1535,33 @@ ORIGPTH = os.path.dirname(os.path.dirname(__file__))
 BINDIR  = os.path.join(ORIGPTH, "bin")
 COREDIR = os.path.join(ORIGPTH, "core")
 LOGFL   = os.path.join(ORIGPTH, "comet.log")
+# Log file rollover (ref. RotatingLogHandler); changed by the logsize,
+# logdays and logarchives settings
+LOGMAXSZ    = 10 << 20
+LOGMAXAGE   = 30 * 86400
+LOGARCHIVES = 5
+LOGDATEFMT  = "%z/%d-%m-%Y/%H:%M:%S"
+# Bytes of the log file below which binary searching it (ref. LogIndex)
+# gives way to reading it through
+LOGIDXBLK   = 1 << 16
 SETTFL  = os.path.join(ORIGPTH, "_settings.txt")
 SETTTMP = os.path.join(ORIGPTH, "bin", "_settings.tmp")
+SETTSTORE = SettStore(SETTFL, SETTTMP)
+ALIASFL    = os.path.join(ORIGPTH, "_aliases.txt")
+ALIASJNL   = os.path.join(ORIGPTH, "_aliases.jnl")
+ALIASTMP   = os.path.join(ORIGPTH, "bin", "_aliases.tmp")
+# Journal entries past which it is folded into the alias file
+# (ref. AliasStore)
+ALIASJNLMAX = 256
+ALIASSTORE  = AliasStore(ALIASFL, ALIASJNL, ALIASTMP)
+HISTFL      = os.path.join(ORIGPTH, "_history.txt")
+HISTTMP     = os.path.join(ORIGPTH, "bin", "_history.tmp")
+# Size (in characters) past which the history file is pruned to its newest
+# entries, the share of it kept then, and the number of newest entries
+# browsed with the arrow keys (ref. HistStore in src\\main.py)
+HISTMAXSZ   = 16 << 20
+HISTKEEP    = 0.75
+HISTLOADMAX = 1000
 
 # Colour codes
 ANSI          = ANSIOK()
@@ -653,6 +1585,8 @@ CNLGR           = ALLLGRS[2]
 CNDEBUGLGR      = ALLLGRS[3]
 CNCOMETDEBUGLGR = ALLLGRS[4]
 FLLGR           = ALLLGRS[5]
+FLLSTNR         = ALLLGRS[6]
+FLHDLER         = FLLSTNR.handlers[0]
 STDOUT          = ''
 STDERR          = ''
 
@@ -694,6 +1628,9 @@ ERR_STARTUPPTHNOEXIST = 64
 ERR_SUPPLDPTHNOEXIST  = 65
 ERR_INVSETTPARAMVAL   = 66
 ERR_INVALIASNMLN      = 67
+ERR_UNCLOSEDBLOCK     = 68
+ERR_INVFUNCDEF        = 69
+ERR_FUNCTOODEEP       = 70
 
 # Default settings
 DFLTSETT = {
@@ -704,7 +1641,11 @@ DFLTSETT = {
     "execscripts": "false",
     "title"      : '',
     "intro"      : "true",
-    "cache"      : "true"
+    "cache"      : "true",
+    "logsize"    : "10",
+    "logdays"    : "30",
+    "logarchives": "5",
+    "promptasync": ''
 }
 
 # Comet repr mappings
@@ -734,6 +1675,40 @@ PROMPTCODES = {
     '8': ANSIHEADER,
     '9': ANSIRESET
 }
+# For prompt codes computed on worker threads, as chosen by the promptasync
+# setting (ref. AsyncSeg in src\\main.py): seconds for which a value is
+# cached per working directory, and seconds after which a value still being
+# computed is shown as timed out
+PROMPTASYNCTTL  = 1.0
+PROMPTASYNCTOUT = 2.0
+# Seconds for which the prompt waits on such a code before it is rendered
+# without the value, and what is shown while there is no value
+PROMPTWAIT    = 0.02
+PROMPTPENDING = "..."
+# Directories whose listings are kept for path completion, and entries
+# passed on to it at a time while a directory is being read (ref. DirCache
+# in src\\main.py)
+COMPLDIRS     = 64
+COMPLBATCH    = 256
+# Seconds completion waits for more entries of a directory being read before
+# giving up on the rest
+COMPLWAIT     = 5.0
+# Styles of the kinds of tokens highlighted at the prompt (ref. parser.Lexer
+# and CmdLexer in src\\main.py); "badcmd" is a command that is not found
+LEXSTYLE      = {
+    "cmd"   : "ansibrightgreen",
+    "badcmd": "ansibrightred",
+    "opt"   : "ansibrightcyan",
+    "str"   : "ansibrightyellow",
+    "var"   : "ansibrightmagenta",
+    "sub"   : "ansibrightblue",
+    "block" : "bold",
+    "op"    : "bold",
+    "open"  : "ansibrightred underline"
+}
+# Bytes of a help string decompressed at a time while looking for its usage
+# line (ref. HelpIndex in src\\core\\builtInCmds.py)
+HELPHEADSZ    = 256
 
 # Known settings (config) parameters
 KNOWNSETTPARAMS = {
@@ -743,5 +1718,9 @@ KNOWNSETTPARAMS = {
     "execscripts",
     "title",
     "intro",
-    "cache"
+    "cache",
+    "logsize",
+    "logdays",
+    "logarchives",
+    "promptasync"
 }
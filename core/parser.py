@@ -9,7 +9,8 @@
 # Description: Contains the parser for the interpreter
 #
 
-import io
+import bisect
+import re
 import sys
 import contextlib as cl
 import typing     as ty
@@ -18,6 +19,143 @@ if ty.TYPE_CHECKING:
     import comet
 
 
+# Characters that may follow a backslash in an argument, and what they stand
+# for (ref. Parser._rdUnquotedArg() and Parser._rdQuotedCommOrArg()); a
+# backslash followed by anything else is kept as is
+ESCAPES = {
+    '\\': '\\',
+    'n' : '\n',
+    't' : '\t',
+    'r' : '\r',
+    '"' : '"',
+    '\'': '\'',
+    '`' : '`'
+}
+
+
+def unescPartial(word: str) -> tuple[str, str]:
+    """
+    Read a partly typed argument as the parser would, without requiring the
+    closing quote.
+    > param word: The argument, as typed so far
+    > return: Tuple of the value of the argument and its opening quote ('' if
+              it is unquoted)
+    """
+    quote = word[0] if word[:1] in ('"', '\'') else ''
+    word  = word[len(quote):]
+    if quote and word.endswith(quote) and not word.endswith('\\' + quote):
+        word = word[:-1]
+
+    chars = []
+    i     = 0
+    while i < len(word):
+        if word[i] == '\\' and i < len(word) - 1 and word[i + 1] in ESCAPES:
+            chars.append(ESCAPES[word[i + 1]])
+            i += 2
+            continue
+        chars.append(word[i])
+        i += 1
+    return ''.join(chars), quote
+
+
+def escArg(value: str, quote: str = '', close: bool = True) -> str:
+    """
+    Write a value as an argument that the parser reads back as the value.
+    Values with whitespace or operators in them, or that would be read as an
+    option, are quoted.
+    > param value: The value
+    > param quote: Quote to be used, if any
+    > param close: Add the closing quote, if quoted
+    > return: The argument
+    """
+    if not quote and (value[:1] == '-' or any(
+            char.isspace() or char in "&^|;>`@'\"{" for char in value)):
+        quote = '"'
+
+    chars = []
+    for i, char in enumerate(value):
+        nxt = value[i + 1] if i < len(value) - 1 else ''
+        if char == '\\' and (nxt in ESCAPES or not nxt):
+            chars.append("\\\\")
+        elif char == quote:
+            chars.append('\\' + char)
+        else:
+            chars.append(char)
+    return quote + ''.join(chars) + (quote if quote and close else '')
+
+
+# Characters that end a command, option or unquoted argument (ref.
+# Parser.spChars), and an escaped character, for the patterns of Lexer
+LEXEND = "&^|;>`"
+LEXESC = "\\\\[" + re.escape(''.join(ESCAPES)) + ']'
+# Commands taking blocks ({ ... }) as arguments; for any other command, '{'
+# is read as part of an unquoted argument
+BLOCKCMDS = {"for", "func", "repeat", "while"}
+
+
+class Block(str):
+    """
+    Raw text of a block ({ ... }) argument. It is left unparsed, to be
+    compiled by the command that takes the block (ref. Parser.compile()).
+    """
+
+
+class Deferred(str):
+    """
+    A variable access (@name@) or subcommand (`cmd`) in a compiled body,
+    resolved each time the body is run (ref. Compiled.bind()).
+    """
+    def __new__(cls, txt: str, kind: str) -> "Deferred":
+        self      = super().__new__(cls, txt)
+        self.kind = kind
+        return self
+
+
+class Compiled:
+    """
+    A body parsed once by Parser.compile(). The positions of its deferred
+    arguments are recorded, so that binding it for a run only copies the
+    segments and fills those in.
+    """
+    def __init__(self, src: str,
+                 parsed: list[tuple[str, dict[int, str], dict[int, str]] | str]) \
+            -> None:
+        self.src    = src
+        self.parsed = parsed
+        self.slots  = [(segPos, argPos)
+                       for segPos, seg in enumerate(parsed)
+                       if isinstance(seg, tuple)
+                       for argPos, arg in seg[1].items()
+                       if isinstance(arg, Deferred)]
+
+    def bind(self, parser: "Parser", varTable: dict[str, str]) \
+            -> list[tuple[str, dict[int, str], dict[int, str]] | str] | int:
+        """
+        Get a fresh parsed list (ref. Parser.parse()) for a run of the body,
+        with variable accesses and subcommands resolved.
+        > param parser: Parser used to evaluate subcommands
+        > param varTable: Variable table
+        > return: Parsed list or integer error code (ref. src\\errCodes.txt)
+        """
+        parsed = [(seg[0], seg[1].copy(), seg[2].copy())
+                  if isinstance(seg, tuple) else seg for seg in self.parsed]
+        for segPos, argPos in self.slots:
+            slot = parsed[segPos][1][argPos]
+            if slot.kind == "var":
+                matches = comm.DICTSRCH(slot, varTable, caseIn=True)
+                if not matches:
+                    comm.ERR(f"No such variable: '{slot}'")
+                    return comm.ERR_NOSUCHINTPRVAR
+                parsed[segPos][1][argPos] = matches[0]
+            else:
+                output, err = parser._evalCommands(slot)
+                if err:
+                    comm.ERR("Subcommand execution failed", raiser='c')
+                    return comm.ERR_SUBCMDEXECFAILED
+                parsed[segPos][1][argPos] = output
+        return parsed
+
+
 class Parser:
     """
     # TODO: Complete this comment!
@@ -26,6 +164,8 @@ class Parser:
     | - PIPE
     ; - SEPARATOR
     > - STDOUT REDIRECTION
+    >> - STDOUT REDIRECTION (APPEND)
+    >! - STDOUT REDIRECTION (TRUNCATE)
     @ - STDERR REDIRECTION
     < - (?)
     """
@@ -51,6 +191,8 @@ class Parser:
             "\\n" : '\n',
         }
 
+        self.deferring = False
+
         self.ERR_NOSUCHVAR = 2
 
         self._rdChar()
@@ -71,6 +213,18 @@ class Parser:
             return self.src[self.pos+1]
         return '\0'
 
+    def _rdOp(self) -> str:
+        """
+        Read an operator. '>' may be followed by '>' (append redirection) or
+        '!' (truncate redirection).
+        > return: The operator
+        """
+        op = self.char
+        if op == '>' and self._pkChar() in ('>', '!'):
+            self._rdChar()
+            op += self.char
+        return op
+
     def _rdUnquotedArg(self) -> str:
         """
         Read an unquoted argument.
@@ -142,6 +296,38 @@ class Parser:
 
         return self.src[startPos+1:self.pos]
 
+    def _rdBlock(self) -> str | int:
+        """
+        Read a block ({ ... }). Nested blocks, quoted text and escaped
+        characters are skipped over; the text is returned as is.
+        > return: The text between the braces or integer error code
+            1: Unexpected end of line while parsing the block, i.e. missing
+               closing brace
+        """
+        startPos = self.pos
+        depth    = 0
+        quote    = ''
+        while True:
+            if self.char == '\0':
+                return 1
+
+            if self.char == '\\':
+                self._rdChar()
+            elif quote:
+                if self.char == quote:
+                    quote = ''
+            elif self.char in ('"', '\'', '`') and (self.pastChar.isspace()
+                    or self.pastChar == '{' or self.pastChar in self.spChars):
+                quote = self.char
+            elif self.char == '{':
+                depth += 1
+            elif self.char == '}':
+                depth -= 1
+                if not depth:
+                    return self.src[startPos+1:self.pos]
+
+            self._rdChar()
+
     def _rdOpt(self) -> str:
         """
         > return: The parsed option
@@ -181,18 +367,48 @@ class Parser:
 
     def _evalCommands(self, line: str) -> tuple[str, int]:
         """
-        Execute commands.
+        Execute commands. The state of the parse in progress is kept, since
+        executing them parses with this same parser.
         """
-        capture   = io.StringIO()
-
-        with cl.redirect_stdout(capture):
-            err = self.intrp.execute(line)
+        capture   = comm.PipeCapture()
+        state     = (self.src, self.char, self.pastChar, self.pos,
+                     self.deferring)
+        self.deferring = False
+
+        try:
+            with cl.redirect_stdout(capture):
+                err = self.intrp.execute(line)
+        finally:
+            (self.src, self.char, self.pastChar, self.pos,
+             self.deferring) = state
 
         if err == 0:
             return capture.getvalue(), err
 
         return '', err
 
+    def compile(self, src: str) -> Compiled | int:
+        """
+        Parse a body once, to be run any number of times. Variable accesses
+        and subcommands are left in place as deferred arguments (ref.
+        Compiled.bind()).
+        > param src: Source of the body
+        > return: Compiled body or integer error code (ref. src\\errCodes.txt)
+        """
+        state          = (self.src, self.char, self.pastChar, self.pos,
+                          self.deferring)
+        self.src       = src
+        self.deferring = True
+        try:
+            parsed = self.parse({})
+        finally:
+            (self.src, self.char, self.pastChar, self.pos,
+             self.deferring) = state
+
+        if isinstance(parsed, int):
+            return parsed
+        return Compiled(src, parsed)
+
     def parse(self, varTable: dict[str, str]) \
             -> list[tuple[str, dict[int, str], dict[int, str]] | str] | int:
         """
@@ -223,6 +439,7 @@ class Parser:
                 return comm.ERR_UNCLOSEDQUOTEDCMD
             # Fatal unhandled case
             return comm.ERR_UNKNOWN
+        blocks = command.lower() in BLOCKCMDS
 
         while self.char != '\0':
             if self.char.isspace():
@@ -242,12 +459,20 @@ class Parser:
                 if self.char == '`':
                     self._rdChar()
 
-                output, err = self._evalCommands(res)
-                if err:
-                    comm.ERR("Subcommand execution failed", raiser='c')
-                    return comm.ERR_SUBCMDEXECFAILED
+                if self.deferring:
+                    args[count] = Deferred(res, "sub")
+                else:
+                    output, err = self._evalCommands(res)
+                    if err:
+                        comm.ERR("Subcommand execution failed", raiser='c')
+                        return comm.ERR_SUBCMDEXECFAILED
 
-                args[count] = output
+                    args[count] = output
+
+                # The closing '`' is already read, so the arg ends here, as a
+                # quoted one does
+                count += 1
+                continue
 
             # Var access
             elif self.char == '@':
@@ -260,21 +485,28 @@ class Parser:
                 if self.char == '@':
                     self._rdChar()
 
-                matches = comm.DICTSRCH(res, varTable, caseIn=True)
-                if not matches:
-                    comm.ERR(f"No such variable: '{res}'")
-                    return comm.ERR_NOSUCHINTPRVAR
-                elif len(matches) > 1:
-                    comm.UNERR("That's not supposed to happen... WE GOT MORE "
-                               "THAN ONE MATCH WHILE SEARCHING FOR THE "
-                               "VARIABLE!", raiser='c')
-                    return comm.ERR_UNKNOWN
-
-                args[count] = matches[0]
+                if self.deferring:
+                    args[count] = Deferred(res, "var")
+                else:
+                    matches = comm.DICTSRCH(res, varTable, caseIn=True)
+                    if not matches:
+                        comm.ERR(f"No such variable: '{res}'")
+                        return comm.ERR_NOSUCHINTPRVAR
+                    elif len(matches) > 1:
+                        comm.UNERR("That's not supposed to happen... WE GOT "
+                                   "MORE THAN ONE MATCH WHILE SEARCHING FOR "
+                                   "THE VARIABLE!", raiser='c')
+                        return comm.ERR_UNKNOWN
+
+                    args[count] = matches[0]
+
+                # Same as above, for the closing '@'
+                count += 1
+                continue
 
             # Operations like piping, redirn, cmd separation, etc.
             elif self.char in self.spChars:
-                curSpChar   = self.char
+                curSpChar   = self._rdOp()
                 self.src    = self.src[self.pos+1:]
 
                 subCmdParse = self.parse(varTable)
@@ -295,6 +527,17 @@ class Parser:
                     return comm.ERR_UNKNOWN
                 args[count] = arg
 
+            # Blocks
+            elif self.char == '{' and blocks:
+                block = self._rdBlock()
+                if isinstance(block, int):
+                    if block == 1:
+                        comm.ERR("Unclosed block", raiser='c')
+                        return comm.ERR_UNCLOSEDBLOCK
+                    # Fatal unhandled case
+                    return comm.ERR_UNKNOWN
+                args[count] = Block(block)
+
             # Opts
             elif self.char == '-' and not self._pkChar().isspace() \
                     and self._pkChar() != '\0':
@@ -310,7 +553,7 @@ class Parser:
             # to account for cases such as when sp char is present just after
             # an opt without any whitespace, etc.
             if self.char in self.spChars:
-                curSpChar      = self.char
+                curSpChar      = self._rdOp()
                 self.src       = self.src[self.pos+1:]
 
                 otherCmdsParse = self.parse(varTable)
@@ -325,3 +568,171 @@ class Parser:
 
         full.append((command, args, opts))
         return full
+
+
+class Lexer:
+    """
+    Splits a line into tokens as the parser would read it, without executing
+    subcommands or resolving variables, to highlight the line as it is typed.
+    Tokens are tuples of start, end and kind:
+        cmd   - command name
+        opt   - option
+        arg   - unquoted argument
+        str   - quoted argument
+        var   - variable access (@name@)
+        sub   - subcommand (`cmd`)
+        block - braces of a block; its body is split into tokens too
+        op    - operator
+        open  - unclosed quoted argument, variable access, subcommand or block
+    The state of the lexer at the start of each token outside blocks is
+    kept, so that lexing a changed line resumes from the last token before
+    the change.
+    """
+    SPACE  = re.compile(r"\s+")
+    CMD    = re.compile(f"\\S[^\\s{re.escape(LEXEND)}]*")
+    OPT    = re.compile(f"-[^\\s{re.escape(LEXEND)}]*")
+    ARG    = re.compile(f"(?:{LEXESC}|[^\\s{re.escape(LEXEND)}])+")
+    OP     = re.compile(r">[>!]?|[&^|;>`]")
+    QUOTED = {
+        char: re.compile(f"{re.escape(char)}(?:{LEXESC}|[^{re.escape(char)}])*"
+                         f"({re.escape(char)})?")
+        for char in ('"', '\'', '@', '`')
+    }
+    KINDS  = {'"': "str", '\'': "str", '@': "var", '`': "sub"}
+
+    def __init__(self) -> None:
+        self.src    = ''
+        self.tokens : list[tuple[int, int, str]] = []
+        # Start of each token outside blocks, number of tokens before it,
+        # whether a command is expected, whether a '`' there is read as an
+        # operator and whether the command takes blocks
+        self.marks  : list[tuple[int, int, bool, bool, bool]] = []
+        self.starts : list[int] = []
+        # Number of tokens kept from the previous line by the last lex()
+        self.kept   = 0
+
+    def lex(self, src: str) -> list[tuple[int, int, str]]:
+        """
+        > param src: The line
+        > return: List of tokens, in order; the list must not be changed
+        """
+        same = 0
+        lim  = min(len(src), len(self.src))
+        while same < lim and src[same] == self.src[same]:
+            same += 1
+        if same == len(src) == len(self.src):
+            self.kept = len(self.tokens)
+            return self.tokens
+
+        # The tokens before the last mark ahead of the change are unaffected
+        idx = bisect.bisect_left(self.starts, same) - 1
+        if idx >= 0:
+            pos, count, cmd, glued, blocks = self.marks[idx]
+            del self.tokens[count:], self.marks[idx:], self.starts[idx:]
+        else:
+            pos, count, cmd, glued, blocks = 0, 0, True, False, False
+            self.tokens, self.marks, self.starts = [], [], []
+        self.kept = count
+
+        self.src = src
+        self._scan(src, pos, len(src), cmd, glued, blocks, True)
+        return self.tokens
+
+    def _scan(self, src: str, pos: int, end: int, cmd: bool, glued: bool,
+              blocks: bool, top: bool) -> None:
+        """
+        Split part of a line into tokens, adding them to self.tokens.
+        > param src: The line
+        > param pos: Position to start from
+        > param end: Position to stop at
+        > param cmd: Whether a command is expected at pos
+        > param glued: Whether a '`' at pos is read as an operator
+        > param blocks: Whether the command before pos takes blocks
+        > param top: Whether the part is outside blocks; marks are kept only
+                     then
+        """
+        tokens = self.tokens
+        while pos < end:
+            if (match := self.SPACE.match(src, pos, end)):
+                pos   = match.end()
+                glued = False
+                continue
+            if top:
+                self.marks.append((pos, len(tokens), cmd, glued, blocks))
+                self.starts.append(pos)
+
+            char = src[pos]
+            # An operator ends an argument read directly before it, '`'
+            # included (ref. Parser.parse()); a redirection is followed by
+            # its target, not a command
+            if glued and char == '`' or not cmd and char in LEXEND \
+                    and char != '`':
+                match = self.OP.match(src, pos, end)
+                tokens.append((pos, match.end(), "op"))
+                pos, cmd, glued = match.end(), char != '>', False
+                continue
+
+            # Quoted command names are read as quoted arguments
+            if char in self.QUOTED and (not cmd or char in ('"', '\'')):
+                match = self.QUOTED[char].match(src, pos, end)
+                kind  = "open" if match.group(1) is None \
+                        else "cmd" if cmd else self.KINDS[char]
+                tokens.append((pos, match.end(), kind))
+                if cmd:
+                    blocks = src[pos + 1:match.end() - 1].lower() in BLOCKCMDS
+                pos, cmd, glued = match.end(), False, char in ('@', '`')
+                continue
+
+            if cmd:
+                match  = self.CMD.match(src, pos, end)
+                kind   = "cmd"
+                blocks = match.group().lower() in BLOCKCMDS
+            elif char == '{' and blocks:
+                pos, glued = self._block(src, pos, end), False
+                continue
+            elif char == '-' and pos < end - 1 and not src[pos + 1].isspace():
+                match = self.OPT.match(src, pos, end)
+                kind  = "opt"
+            else:
+                match = self.ARG.match(src, pos, end)
+                kind  = "arg"
+            tokens.append((pos, match.end(), kind))
+            pos, cmd, glued = match.end(), False, kind != "cmd"
+
+    def _block(self, src: str, pos: int, end: int) -> int:
+        """
+        Read a block, skipping over nested blocks, quoted text and escaped
+        characters as Parser._rdBlock() does, and split its body into tokens.
+        > param src: The line
+        > param pos: Position of the opening brace
+        > param end: Position to stop at
+        > return: Position after the block
+        """
+        opening = len(self.tokens)
+        self.tokens.append((pos, pos + 1, "block"))
+        depth = 0
+        quote = ''
+        i     = pos
+        while i < end:
+            char = src[i]
+            if char == '\\':
+                i += 1
+            elif quote:
+                if char == quote:
+                    quote = ''
+            elif char in ('"', '\'', '`') and (src[i - 1].isspace()
+                    or src[i - 1] in '{' + LEXEND):
+                quote = char
+            elif char == '{':
+                depth += 1
+            elif char == '}':
+                depth -= 1
+                if not depth:
+                    self._scan(src, pos + 1, i, True, False, False, False)
+                    self.tokens.append((i, i + 1, "block"))
+                    return i + 1
+            i += 1
+
+        self.tokens[opening] = (pos, pos + 1, "open")
+        self._scan(src, pos + 1, end, True, False, False, False)
+        return end
@@ -0,0 +1,134 @@
+#
+# Comet 1 source code
+# Infinite Inc.
+# Copyright (c) 2025 Infinite Inc.
+# Written by Thiruvalluvan Kamaraj
+# Licenced under the Apache-2.0 Licence
+#
+# Filename: src\\dev\\duTest.py
+# Description: Checks that du counts a file with several hard links once,
+#              both from directory entries with link counts and from ones
+#              without (as on Windows), with and without the index
+#
+
+import os
+import sys
+import shutil   as sh
+import tempfile as tf
+import typing   as ty
+
+# Add src\\bin to sys.path
+sys.path.insert(1, os.path.join(os.path.dirname(os.path.dirname(
+    os.path.abspath(__file__))), "bin"))
+import du
+sys.path.pop(1)
+
+
+failed = 0
+
+
+def check(name: str, got: ty.Any, expected: ty.Any) -> None:
+    """
+    Print the result of a check.
+    > param name: Name of the check
+    > param got: Value got
+    > param expected: Value expected
+    """
+    global failed
+    if got == expected:
+        print(f"ok    {name}")
+    else:
+        failed += 1
+        print(f"FAIL  {name}\n      got     : {got!r}\n"
+              f"      expected: {expected!r}")
+
+
+class NoLinksEntry:
+    """
+    A directory entry whose stat() carries no link count, device or inode,
+    as those on Windows do.
+    """
+    def __init__(self, entry: os.DirEntry) -> None:
+        self.entry = entry
+
+    def __getattr__(self, name: str) -> ty.Any:
+        return getattr(self.entry, name)
+
+    def stat(self, follow_symlinks: bool = True) -> os.stat_result:
+        st = self.entry.stat(follow_symlinks=follow_symlinks)
+        return os.stat_result((st.st_mode, 0, 0, 0, st.st_uid, st.st_gid,
+                               st.st_size, st.st_atime, st.st_mtime,
+                               st.st_ctime))
+
+
+class NoLinksScandir:
+    "os.scandir() giving NoLinksEntry entries."
+    def __init__(self, scandir: ty.Callable) -> None:
+        self.scandir = scandir
+
+    def __call__(self, path: str) -> ty.ContextManager:
+        outer = self
+
+        class Entries:
+            def __enter__(self) -> ty.Iterator[NoLinksEntry]:
+                self.it = outer.scandir(path)
+                return (NoLinksEntry(entry) for entry in self.it.__enter__())
+
+            def __exit__(self, *exc: ty.Any) -> None:
+                self.it.__exit__(*exc)
+
+        return Entries()
+
+
+def main() -> int:
+    root = tf.mkdtemp()
+    try:
+        for sub in ('a', 'b', 'c'):
+            os.mkdir(os.path.join(root, sub))
+        linked = os.path.join(root, 'a', "linked")
+        with open(linked, 'wb') as f:
+            f.write(b'x' * 1000)
+        os.link(linked, os.path.join(root, 'a', "link1"))
+        os.link(linked, os.path.join(root, 'b', "link2"))
+        with open(os.path.join(root, 'c', "single"), 'wb') as f:
+            f.write(b'y' * 500)
+        open(os.path.join(root, 'c', "empty"), 'wb').close()
+
+        idxPath = os.path.join(root, "c", "_du.db")
+        scandir = os.scandir
+        for name, listing in (("link counts", scandir),
+                              ("no link counts", NoLinksScandir(scandir))):
+            os.scandir = listing
+            try:
+                totals, snags = du.DUScanner().scan(root)
+                check(f"{name}: linked file counted once", totals[root],
+                      1500)
+                check(f"{name}: nothing skipped", snags, [])
+
+                totals, _ = du.DUScanner(depth=1).scan(root)
+                check(f"{name}: counted in one directory only",
+                      totals[os.path.join(root, 'a')]
+                      + totals[os.path.join(root, 'b')], 1000)
+
+                for run in ("indexing", "from the index"):
+                    index = du.DUIndex(idxPath)
+                    try:
+                        totals, _ = du.DUScanner().scan(
+                            os.path.join(root, 'a'), index
+                        )
+                    finally:
+                        index.close()
+                    check(f"{name}: {run}", totals[os.path.join(root, 'a')],
+                          1000)
+                os.remove(idxPath)
+            finally:
+                os.scandir = scandir
+    finally:
+        sh.rmtree(root)
+
+    print("all passed" if not failed else f"{failed} failed")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,77 @@
+#
+# Comet 1 source code
+# Infinite Inc.
+# Copyright (c) 2025 Infinite Inc.
+# Written by Thiruvalluvan Kamaraj
+# Licenced under the Apache-2.0 Licence
+#
+# Filename: src\\dev\\logBench.py
+# Description: Measures the overhead of the logging functions in commons, as
+#              called in tight loops
+#
+
+import os
+import sys
+import logging  as lg
+import tempfile as tf
+import timeit   as ti
+import typing   as ty
+
+# Add src\\core to sys.path
+sys.path.insert(1, os.path.join(os.path.dirname(os.path.dirname(
+    os.path.abspath(__file__))), "core"))
+import commons as comm
+sys.path.pop(1)
+
+
+def bench(name: str, func: ty.Callable[[], ty.Any], number: int) -> None:
+    """
+    Time a logging call and print the time taken per call.
+    > param name: Name of the benchmark
+    > param func: The call to be timed
+    > param number: Number of calls
+    """
+    best = min(ti.repeat(func, number=number, repeat=5))
+    print(f"{name:<32} {best / number * 1e6:>8.2f} us/call")
+
+
+def main() -> None:
+    number = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+
+    # Console output goes nowhere; the log file to a temporary file, so that
+    # the real one is not flooded
+    devNull = open(os.devnull, 'w')
+    for lgr in comm.ALLLGRS[:6]:
+        for hdler in lgr.handlers:
+            if type(hdler) is lg.StreamHandler:
+                hdler.setStream(devNull)
+
+    tmpDir   = tf.mkdtemp()
+    tmpLog   = os.path.join(tmpDir, "bench.log")
+    flHdler  = comm.FLLSTNR.handlers[0]
+    tmpHdler = lg.FileHandler(tmpLog, 'a', encoding="utf-8")
+    tmpHdler.setFormatter(flHdler.formatter)
+    tmpHdler.setLevel(flHdler.level)
+    comm.FLLSTNR.handlers = (tmpHdler,)
+
+    print(f"{number} calls per run, best of 5")
+    bench("ERR (caller looked up)", lambda: comm.ERR("benchmark"), number)
+    bench("ERR, raiser 'c' (no lookup)",
+          lambda: comm.ERR("benchmark", raiser='c'), number)
+    bench("DEBUG", lambda: comm.DEBUG("benchmark"), number)
+    bench("CRIT (console and file queue)",
+          lambda: comm.CRIT("benchmark"), number)
+    bench("FLLGR.warning (level disabled)",
+          lambda: comm.FLLGR.warning("benchmark"), number)
+
+    comm.FLLSTNR.stop()
+    comm.FLLSTNR.handlers = (flHdler,)
+    comm.FLLSTNR.start()
+    tmpHdler.close()
+    os.remove(tmpLog)
+    os.rmdir(tmpDir)
+    devNull.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+#
+# Comet 1 source code
+# Infinite Inc.
+# Copyright (c) 2025 Infinite Inc.
+# Written by Thiruvalluvan Kamaraj
+# Licenced under the Apache-2.0 Licence
+#
+# Filename: src\\dev\\parseTest.py
+# Description: Checks that a line parsed at the prompt and the same line
+#              compiled as a loop or function body give the same tokens
+#
+
+import os
+import sys
+import pathlib as pl
+
+# Add src\\core to sys.path
+sys.path.insert(1, os.path.join(os.path.dirname(os.path.dirname(
+    os.path.abspath(__file__))), "core"))
+import comet
+import commons as comm
+import parser  as par
+sys.path.pop(1)
+
+
+# Line and the tokens expected of it; None for a line only checked for
+# being the same both ways
+LINES = (
+    ("echo @a@",              [("echo", {0: '1'}, {})]),
+    ("echo @a@ @b@",          [("echo", {0: '1', 1: "two"}, {})]),
+    ("echo @a@x",             [("echo", {0: '1', 1: 'x'}, {})]),
+    ("echo x@a@",             None),
+    ("echo @a@@b@",           [("echo", {0: '1', 1: "two"}, {})]),
+    ("echo @a@\"q\"",         [("echo", {0: '1', 1: 'q'}, {})]),
+    ("echo @a@-o y",          [("echo", {0: '1', 2: 'y'}, {1: 'o'})]),
+    ("echo @a@;echo @b@",     [("echo", {0: '1'}, {}), ';',
+                               ("echo", {0: "two"}, {})]),
+    ("echo @a@ | echo @b@",   [("echo", {0: '1'}, {}), '|',
+                               ("echo", {0: "two"}, {})]),
+    ("echo `echo s`",         [("echo", {0: "s\n"}, {})]),
+    ("echo `echo s`x",        [("echo", {0: "s\n", 1: 'x'}, {})]),
+    ("echo `echo s``echo t`", [("echo", {0: "s\n", 1: "t\n"}, {})]),
+    ("echo `echo s`;echo @a@", [("echo", {0: "s\n"}, {}), ';',
+                                ("echo", {0: '1'}, {})]),
+    ("repeat 2 {echo @a@x}",  None),
+)
+
+
+def main() -> int:
+    parser = par.Parser()
+    intrp  = comet.Intrp(
+        parser,
+        comm.DFLTSETT if (tmp := comm.RDSETT()) is None else tmp,
+        str(pl.Path(sys.argv[0]).resolve()),
+        {"debug": False, "workingdirectory": None}
+    )
+    parser.setIntrp(intrp)
+    intrp.varTable.update({"a": '1', "b": "two"})
+
+    failed = 0
+    for line, expected in LINES:
+        atPrompt = intrp.parse(line)
+        compiled = parser.compile(line)
+        if isinstance(compiled, int):
+            inBody = compiled
+        else:
+            inBody = compiled.bind(parser, intrp.varTable)
+
+        if atPrompt == inBody and expected in (None, atPrompt):
+            print(f"ok    {line}")
+        else:
+            failed += 1
+            print(f"FAIL  {line}\n      prompt  : {atPrompt!r}\n"
+                  f"      body    : {inBody!r}\n"
+                  f"      expected: {expected!r}")
+
+    print(f"{len(LINES) - failed}/{len(LINES)} passed")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
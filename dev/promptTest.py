@@ -0,0 +1,124 @@
+#
+# Comet 1 source code
+# Infinite Inc.
+# Copyright (c) 2025 Infinite Inc.
+# Written by Thiruvalluvan Kamaraj
+# Licenced under the Apache-2.0 Licence
+#
+# Filename: src\\dev\\promptTest.py
+# Description: Checks that prompt codes in the promptasync setting are
+#              computed asynchronously (ref. AsyncSeg in src\\main.py), and
+#              how such a code behaves when fast, slow, hung or failing
+#
+
+import os
+import sys
+import threading as th
+import time
+import pathlib   as pl
+import typing    as ty
+
+# Add src and src\\core to sys.path
+srcDir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(1, srcDir)
+sys.path.insert(2, os.path.join(srcDir, "core"))
+import comet
+import commons as comm
+import main
+import parser  as par
+sys.path.pop(2)
+sys.path.pop(1)
+
+
+failed = 0
+
+
+def check(name: str, got: ty.Any, expected: ty.Any) -> None:
+    """
+    Print the result of a check.
+    > param name: Name of the check
+    > param got: Value got
+    > param expected: Value expected
+    """
+    global failed
+    if got == expected:
+        print(f"ok    {name}")
+    else:
+        failed += 1
+        print(f"FAIL  {name}\n      got     : {got!r}\n"
+              f"      expected: {expected!r}")
+
+
+def main_() -> int:
+    parser = par.Parser()
+    intrp  = comet.Intrp(
+        parser,
+        comm.DFLTSETT if (tmp := comm.RDSETT()) is None else tmp,
+        str(pl.Path(sys.argv[0]).resolve()),
+        {"debug": False, "workingdirectory": None}
+    )
+    parser.setIntrp(intrp)
+    intrp.settings = dict(intrp.settings)
+
+    intrp.settings["promptasync"] = ''
+    segs = main.prmptCmpl(intrp, "%t %d")
+    check("no code async by default",
+          [type(seg[1]) is main.AsyncSeg for seg in segs
+           if isinstance(seg, tuple)], [False, False])
+
+    intrp.settings["promptasync"] = 'T'
+    segs = main.prmptCmpl(intrp, "%t %d")
+    check("only the codes in promptasync async",
+          [type(seg[1]) is main.AsyncSeg for seg in segs
+           if isinstance(seg, tuple)], [True, False])
+
+    updates = th.Semaphore(0)
+    onUpdate = updates.release
+
+    seg = main.AsyncSeg('x', lambda: "fast", 60.0, 1.0, onUpdate)
+    check("fast code in the same render", seg(), "fast")
+
+    def slow() -> str:
+        time.sleep(0.2)
+        return "slow"
+
+    # Left by the fast code resolving
+    while updates.acquire(blocking=False):
+        pass
+    seg = main.AsyncSeg('x', slow, 60.0, 1.0, onUpdate)
+    check("slow code pending at first", seg(), comm.PROMPTPENDING)
+    check("prompt refreshed once it is in", updates.acquire(timeout=2), True)
+    check("slow code in the next render", seg(), "slow")
+    check("cached value used", seg(), "slow")
+
+    release = th.Event()
+    calls   = []
+
+    def hung() -> str:
+        calls.append(None)
+        release.wait()
+        return "late"
+
+    seg = main.AsyncSeg('x', hung, 60.0, 0.1, onUpdate)
+    seg()
+    check("prompt refreshed on a timeout", updates.acquire(timeout=2), True)
+    check("hung code timed out", seg(), "[TIMEOUT]")
+    seg()
+    check("tried again after a timeout", len(calls), 2)
+    release.set()
+    updates.acquire(timeout=2)
+    updates.acquire(timeout=2)
+    check("value of the retry kept", seg(), "late")
+
+    def fail() -> str:
+        raise OSError("no")
+
+    seg = main.AsyncSeg('x', fail, 60.0, 1.0, onUpdate)
+    check("failing code", seg(), "[FAIL]")
+
+    print("all passed" if not failed else f"{failed} failed")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main_())
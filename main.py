@@ -8,11 +8,24 @@
 # Description: The main program
 #
 
+import bisect
 import os
+import re
 import sys
+import threading      as th
+import time
 import pathlib        as pl
 import platform       as pf
+import typing         as ty
 import prompt_toolkit as pt
+import prompt_toolkit.auto_suggest   as pta
+import prompt_toolkit.completion     as ptc
+import prompt_toolkit.document       as ptd
+import prompt_toolkit.formatted_text as ptf
+import prompt_toolkit.history        as pth
+import prompt_toolkit.key_binding    as ptk
+import prompt_toolkit.lexers         as ptl
+import prompt_toolkit.styles         as pts
 
 # Add src\\core to sys.path
 sys.path.insert(1, os.path.dirname(__file__) + os.sep + "core")
@@ -69,69 +82,665 @@ def parseArgs() -> dict[str, bool | str]:
     return toReturn
 
 
-def prmptUpdtr(intpr: comet.Intrp, prompt: str) -> str:
+def winVer() -> str:
     """
-    Updates the Clash dynamic prompt.
-    > param intr: The interpreter object
-    > param prompt: The raw prompt string
-    > return: The updated prompt string
+    Gets the Windows release, with Windows 11 (which reports itself as
+    release 10) told apart by its build number.
+    > return: The release
     """
-    i      = 0
-    len_   = len(prompt)
-    retStr = ''
+    release = pf.release()
+    try:
+        if release == "10" and int(pf.version().split('.')[2]) > 22000:
+            release = "11"
+    except (IndexError, ValueError):
+        comm.WARN("What the hell is that version?!")
+    return release
 
-    while i < len_ - 1:
-        toAdd  = prompt[i]
-        nxtChr = prompt[i + 1].lower()
-        skip   = 1
 
-        if toAdd == '%' and nxtChr in "cdenopstuvw0123456789%":
-            if comm.PROMPTCODES.get(nxtChr) is not None:
-                toAdd = comm.PROMPTCODES[nxtChr]
-                if callable(toAdd):
-                    try:
-                        toAdd = toAdd()
-                    except Exception as e:
-                        comm.WARN(f"Prompt code %{nxtChr} or %{nxtChr.upper()} failed",
-                                  raiser='c')
-                        toAdd = "[FAIL]"
+class AsyncSeg:
+    """
+    A dynamic prompt code computed on a worker thread, so that a slow code
+    does not hold up the prompt. Values are cached per working directory for
+    a while; when there is no fresh value, the last known value (or a
+    placeholder) is shown until the new one arrives, and the prompt is
+    refreshed then.
+    """
+    def __init__(self, code: str, func: ty.Callable[[], str], ttl: float,
+                 timeout: float, onUpdate: ty.Callable[[], None]) -> None:
+        self.code     = code
+        self.func     = func
+        self.ttl      = ttl
+        self.timeout  = timeout
+        self.onUpdate = onUpdate
+        self.cache    : dict[str, tuple[str, float]] = {}
+        self.last     = comm.PROMPTPENDING
+        self.pending  : th.Event | None = None
+        self.started  = 0.0
+        self.lock     = th.Lock()
+
+    def _resolve(self, key: str, done: th.Event, timer: th.Timer) -> None:
+        """
+        Computes the value on the worker thread.
+        > param key: Working directory the value is computed for
+        > param done: Event set once the value is in
+        > param timer: Timer refreshing the prompt on a timeout
+        """
+        try:
+            value = self.func()
+        except Exception as e:
+            # Printing would garble the prompt being edited; log it instead
+            comm.FLLGR.critical(f"Prompt code %{self.code} failed: {e!r}",
+                                sl=2)
+            value = "[FAIL]"
+
+        timer.cancel()
+        with self.lock:
+            # A value given up on (ref. __call__()) that arrives late must
+            # not replace one computed afresh since
+            if self.pending is not done and key in self.cache:
+                return
+            if len(self.cache) >= 64:
+                self.cache.clear()
+            self.cache[key] = (value, time.monotonic())
+            self.last       = value
+            if self.pending is done:
+                self.pending = None
+        done.set()
+        self.onUpdate()
+
+    def __call__(self) -> str:
+        key = os.getcwd()
+        now = time.monotonic()
+        with self.lock:
+            if (entry := self.cache.get(key)) is not None \
+                    and now - entry[1] < self.ttl:
+                return entry[0]
+
+            if self.pending is None:
+                self.pending = th.Event()
+                self.started = now
+                timer        = th.Timer(self.timeout, self.onUpdate)
+                timer.daemon = True
+                timer.start()
+                th.Thread(target=self._resolve,
+                          args=(key, self.pending, timer),
+                          daemon=True).start()
+            done = self.pending
+
+        # Fast codes make it into this very render
+        if done.wait(comm.PROMPTWAIT):
+            with self.lock:
+                return self.cache.get(key, (self.last,))[0]
+        if time.monotonic() - self.started >= self.timeout:
+            # Given up on, so that a later render tries again
+            with self.lock:
+                if self.pending is done:
+                    self.pending = None
+            return "[TIMEOUT]"
+        return self.last
+
+
+class Prmpt:
+    """
+    The compiled prompt as a prompt_toolkit message. It is rendered once for
+    every prompt, and again only when an asynchronous prompt code (ref.
+    AsyncSeg) resolves or times out.
+    """
+    def __init__(self, intrp: comet.Intrp, prompt: str) -> None:
+        self.app  : pt.application.Application[str] | None = None
+        self.msg   = pt.ANSI('')
+        self.stale = True
+        self.segs  = prmptCmpl(intrp, prompt, self.update)
+
+    def render(self) -> None:
+        "Renders the prompt afresh."
+        # Cleared first, so that an update during rendering is not lost
+        self.stale = False
+        self.msg   = pt.ANSI(prmptUpdtr(self.segs))
+
+    def update(self) -> None:
+        "Marks the prompt for rendering again; called from worker threads."
+        self.stale = True
+        if self.app is not None:
+            self.app.invalidate()
+
+    def __call__(self) -> pt.ANSI:
+        if self.stale:
+            self.render()
+        return self.msg
+
+
+class HistStore(pth.History):
+    """
+    Persistent command history: an append-only file with one entry per line,
+    newlines and backslashes in entries escaped. In memory the entries are
+    one string, each preceded by a newline, so that the most recent entry
+    starting with or containing a string is found by a single reverse search
+    of it, which keeps suggestions and reverse search (ref. histBindings())
+    quick over hundreds of thousands of entries. Only the newest entries are
+    handed to prompt_toolkit for browsing. The file is pruned to its newest
+    entries once it grows past commons.HISTMAXSZ.
+    """
+    def __init__(self, path: str, tmpPath: str) -> None:
+        super().__init__()
+        self.path    = path
+        self.tmpPath = tmpPath
+        self.blob    = ''
+        self.srch    : tuple[str, int, str] | None = None
 
-            elif nxtChr == 'e':
-                toAdd = ('x' if intpr.err else '.')
+        try:
+            with open(path, 'r', encoding="utf-8", errors="replace") as f:
+                txt = f.read()
+        except FileNotFoundError:
+            txt = ''
+        if txt:
+            self.blob = '\n' + txt.removesuffix('\n')
+        if len(self.blob) > comm.HISTMAXSZ:
+            self.prune()
+
+    @staticmethod
+    def _esc(entry: str) -> str:
+        "Escapes an entry into a line of the history file."
+        return entry.replace('\\', "\\\\").replace('\n', "\\n")
+
+    @staticmethod
+    def _unesc(line: str) -> str:
+        "Reverses _esc()."
+        if '\\' not in line:
+            return line
+        return re.sub(r"\\(.)",
+                      lambda m: '\n' if m[1] == 'n' else m[1], line)
+
+    def find(self, query: str, prefix: bool, before: int | None = None) \
+            -> tuple[int, str] | None:
+        """
+        Finds the most recent entry starting with or containing a string.
+        > param query: The string
+        > param prefix: True if the entry must start with the string
+        > param before: Find only entries older than the one at this position
+        > return: Position and text of the entry, or None if there is none
+        """
+        # Suggestions are looked for on a worker thread (ref. main())
+        blob   = self.blob
+        needle = ('\n' if prefix else '') + self._esc(query)
+        end    = len(blob) if before is None else before
+        if not needle and before is not None:
+            # An empty string is found at the end itself, i.e. at the start
+            # of the entry found before; step back past it
+            end = before - 1
+            if end < 0:
+                return None
+
+        while (pos := blob.rfind(needle, 0, end)) != -1:
+            start = pos if prefix else blob.rfind('\n', 0, pos + 1)
+            stop  = blob.find('\n', pos + 1)
+            entry = self._unesc(blob[start + 1:
+                                     len(blob) if stop == -1 else stop])
+            # A match across an escape sequence is no match
+            if prefix or query in entry:
+                return start, entry
+            end = pos + len(needle) - 1
+        return None
+
+    def suggest(self, text: str) -> str | None:
+        """
+        Finds the most recent entry that starts with, and is longer than, a
+        string.
+        > param text: The string
+        > return: The entry, or None if there is none
+        """
+        before = None
+        while (res := self.find(text, True, before)) is not None:
+            if len(res[1]) > len(text):
+                return res[1]
+            before = res[0]
+        return None
+
+    def revSearch(self, buf: pt.buffer.Buffer) -> None:
+        """
+        Replaces the text being edited with the most recent entry containing
+        it. Done again on the entry it found, finds the next older entry
+        containing the same text.
+        > param buf: The buffer being edited
+        """
+        if self.srch is not None and buf.text == self.srch[2]:
+            query, before = self.srch[0], self.srch[1]
+        else:
+            query, before = buf.text, None
+
+        if (res := self.find(query, False, before)) is None:
+            return
+        self.srch    = (query, res[0], res[1])
+        buf.document = ptd.Document(res[1], len(res[1]))
+
+    def load_history_strings(self) -> ty.Iterable[str]:
+        end = len(self.blob)
+        for _ in range(comm.HISTLOADMAX):
+            if (start := self.blob.rfind('\n', 0, end)) == -1:
+                break
+            yield self._unesc(self.blob[start + 1:end])
+            end = start
+
+    def store_string(self, string: str) -> None:
+        if not string or string.isspace():
+            return
+        line = self._esc(string)
+        if self.blob.endswith('\n' + line):
+            # Same as the last entry
+            return
+
+        self.blob += '\n' + line
+        try:
+            with open(self.path, 'a', encoding="utf-8") as f:
+                f.write(line + '\n')
+        except OSError:
+            comm.FLLGR.critical(f"Could not write to the history file: "
+                                f"\"{self.path}\"", sl=2)
+        if len(self.blob) > comm.HISTMAXSZ:
+            self.prune()
+
+    def prune(self) -> None:
+        "Prunes the history (and its file) down to its newest entries."
+        cut = self.blob.find('\n',
+                             len(self.blob) - int(comm.HISTMAXSZ * comm.HISTKEEP))
+        self.blob = self.blob[cut:] if cut != -1 else ''
+        self.srch = None
+        try:
+            with open(self.tmpPath, 'w', encoding="utf-8") as f:
+                f.write(self.blob[1:] + '\n' if self.blob else '')
+            os.replace(self.tmpPath, self.path)
+        except OSError:
+            comm.FLLGR.critical(f"Could not prune the history file: "
+                                f"\"{self.path}\"", sl=2)
+
+
+class HistSuggest(pta.AutoSuggest):
+    "Suggests the most recent history entry starting with the input."
+    def __init__(self, hist: HistStore) -> None:
+        self.hist = hist
+
+    def get_suggestion(self, buffer: pt.buffer.Buffer,
+                       document: ptd.Document) -> pta.Suggestion | None:
+        text = document.text
+        if not text or '\n' in text:
+            return None
+        if (entry := self.hist.suggest(text)) is None:
+            return None
+        return pta.Suggestion(entry[len(text):])
+
+
+def histBindings(hist: HistStore) -> ptk.KeyBindings:
+    """
+    Key bindings for the history: ^R searches it (ref. HistStore.revSearch()).
+    > param hist: The history
+    > return: The key bindings
+    """
+    bindings = ptk.KeyBindings()
 
-            elif nxtChr == 'n':
-                toAdd = '\n'
+    @bindings.add("c-r")
+    def _(event: ptk.KeyPressEvent) -> None:
+        hist.revSearch(event.current_buffer)
 
-            elif nxtChr == 'p':
-                toAdd = intpr.path
+    return bindings
 
-            elif nxtChr == 's':
-                toAdd = ' '
 
-            elif nxtChr in "vV":
-                toAdd = comm.PROMPTCODES[nxtChr]
-                ver   = pf.version().split('.')[2]
-                try:
-                    ver = int(ver)
-                    if toAdd == "10" and ver > 22000:
-                        toAdd = "11"
-                except ValueError:
-                    comm.WARN("What the hell is that version?!")
+def cmdWords(text: str) -> list[str]:
+    """
+    Splits the last command of a partly typed line into its words, as typed.
+    Quoted text and escaped characters do not end a word, and operators
+    start a new command.
+    > param text: The line up to the cursor
+    > return: The words; the last one is empty if the line ends in
+              whitespace
+    """
+    words = ['']
+    quote = ''
+    i     = 0
+    while i < len(text):
+        char = text[i]
+        if char == '\\' and i < len(text) - 1:
+            words[-1] += text[i:i + 2]
+            i         += 2
+            continue
+        if quote:
+            quote = '' if char == quote else quote
+        elif char in ('"', '\'', '`', '@'):
+            quote = char
+        elif char in "&^|;>":
+            words = ['']
+            i    += 1
+            continue
+        elif char.isspace():
+            if words[-1]:
+                words.append('')
+            i += 1
+            continue
+        words[-1] += char
+        i         += 1
+    return words
+
 
-            elif nxtChr == '%':
-                toAdd = '%'
+class DirListing:
+    """
+    Entries of a directory, as read so far (ref. DirCache): their names in
+    normal case (ref. os.path.normcase()), names and whether they are
+    directories. Once all are read, a sorted copy is kept as well, to be
+    searched by prefix.
+    """
+    def __init__(self, stamp: int) -> None:
+        self.stamp  = stamp
+        self.names  : list[tuple[str, str, bool]] = []
+        self.done   = False
+        self.sorted : list[tuple[str, str, bool]] = []
+        self.keys   : list[str] = []
+
+    def find(self, prefix: str) -> list[tuple[str, str, bool]]:
+        """
+        The entries starting with a prefix; only once all are read.
+        > param prefix: The prefix, in normal case
+        > return: Sorted list of entries
+        """
+        lo = bisect.bisect_left(self.keys, prefix)
+        hi = bisect.bisect_left(self.keys, prefix + chr(0x10ffff), lo)
+        return self.sorted[lo:hi]
+
+
+class DirCache:
+    """
+    Listings of directories for path completion, kept until the directory's
+    modification time changes. A directory is read on a worker thread, so
+    that the first entries of a huge directory can be completed while the
+    rest are still being read.
+    """
+    def __init__(self) -> None:
+        self.lock    = th.Lock()
+        self.changed = th.Condition(self.lock)
+        self.dirs    : dict[str, DirListing] = {}
+
+    def get(self, path: str) -> DirListing | None:
+        """
+        Get the listing of a directory, starting to read it if it is not
+        cached or has changed.
+        > param path: Path of the directory
+        > return: The listing, or None if there is no such directory
+        """
+        try:
+            stamp = os.stat(path).st_mtime_ns
+        except OSError:
+            return None
+
+        key = os.path.normcase(os.path.abspath(path))
+        with self.lock:
+            listing = self.dirs.get(key)
+            if listing is None or listing.stamp != stamp:
+                if len(self.dirs) >= comm.COMPLDIRS:
+                    self.dirs.clear()
+                listing = self.dirs[key] = DirListing(stamp)
+                th.Thread(target=self._read, args=(path, listing),
+                          daemon=True).start()
+        return listing
+
+    def _read(self, path: str, listing: DirListing) -> None:
+        """
+        Reads a directory on the worker thread.
+        > param path: Path of the directory
+        > param listing: Listing to be filled in
+        """
+        batch: list[tuple[str, str, bool]] = []
+        try:
+            self._scan(path, listing, batch)
+        finally:
+            # Whatever stopped the read, waiting completions are let go
+            with self.changed:
+                listing.names.extend(batch)
+            # No more entries are added; sorted outside the lock
+            srtd = sorted(listing.names)
+            keys = [entry[0] for entry in srtd]
+            with self.changed:
+                listing.sorted = srtd
+                listing.keys   = keys
+                listing.done   = True
+                self.changed.notify_all()
+
+    def _scan(self, path: str, listing: DirListing,
+              batch: list[tuple[str, str, bool]]) -> None:
+        """
+        Reads the entries of a directory into a listing, in batches.
+        > param path: Path of the directory
+        > param listing: Listing to be filled in
+        > param batch: Entries read but not yet added to the listing
+        """
+        try:
+            with os.scandir(path) as entries:
+                for entry in entries:
+                    try:
+                        isDir = entry.is_dir()
+                    except OSError:
+                        isDir = False
+                    batch.append((os.path.normcase(entry.name), entry.name,
+                                  isDir))
+                    if len(batch) >= comm.COMPLBATCH:
+                        with self.changed:
+                            listing.names.extend(batch)
+                            self.changed.notify_all()
+                        batch.clear()
+        except OSError:
+            pass
 
-            skip = 2
+    def entries(self, listing: DirListing, prefix: str) \
+            -> ty.Iterator[tuple[str, str, bool]]:
+        """
+        Yields the entries of a listing starting with a prefix, waiting for
+        those still being read. The lock is never held while yielding, as
+        the completion may be abandoned partway.
+        > param listing: The listing
+        > param prefix: The prefix, in normal case
+        > return: Generator of entries (ref. DirListing)
+        """
+        i = 0
+        while True:
+            with self.changed:
+                if listing.done and not i:
+                    found = listing.find(prefix)
+                else:
+                    found = None
+                    self.changed.wait_for(
+                        lambda: i < len(listing.names) or listing.done,
+                        comm.COMPLWAIT
+                    )
+                    new  = listing.names[i:]
+                    # Stalled; the rest is left out
+                    done = listing.done or not new
+            if found is not None:
+                yield from found
+                return
+            i += len(new)
+            yield from (entry for entry in new if entry[0].startswith(prefix))
+            if done:
+                return
+
+
+class CmdCompleter(ptc.Completer):
+    """
+    Completes command names (ref. comet.CmdIndex) as the first word of a
+    command, the options of the command and paths after it. Paths are read
+    and written following the parser's quoting and escaping rules.
+    """
+    def __init__(self, cmdIdx: comet.CmdIndex) -> None:
+        self.cmdIdx = cmdIdx
+        self.dirs   = DirCache()
+
+    def _paths(self, word: str) -> ty.Iterator[ptc.Completion]:
+        """
+        Completes a path.
+        > param word: The path, as typed so far
+        > return: Generator of completions
+        """
+        value, quote = par.unescPartial(word)
+        cut          = max(value.rfind('/'), value.rfind('\\')) + 1
+        dirNm, base  = value[:cut], os.path.normcase(value[cut:])
+
+        if (listing := self.dirs.get(dirNm or os.curdir)) is None:
+            return
+        for _, name, isDir in self.dirs.entries(listing, base):
+            name += os.sep if isDir else ''
+            yield ptc.Completion(par.escArg(dirNm + name, quote, not isDir),
+                                 -len(word), display=name)
+
+    def get_completions(self, document: ptd.Document,
+                        complete_event: ptc.CompleteEvent) \
+            -> ty.Iterator[ptc.Completion]:
+        words = cmdWords(document.text_before_cursor)
+        word  = words[-1]
+
+        if len(words) == 1 and not any(sep in word for sep in "/\\"):
+            if word[:1] in ('"', '\''):
+                return
+            self.cmdIdx.refresh()
+            for name in self.cmdIdx.complete(word):
+                yield ptc.Completion(name, -len(word))
+
+        elif word.startswith('-'):
+            wordL = word.lower()
+            for opt in self.cmdIdx.options(words[0]):
+                if opt.startswith(wordL):
+                    yield ptc.Completion(opt, -len(word))
+
+        elif word[:1] not in ('@', '`', '{'):
+            yield from self._paths(word)
+
+
+class CmdLexer(ptl.Lexer):
+    """
+    Highlights the line as it is typed (ref. parser.Lexer). Command names
+    that are not found are flagged: those not in the command index (ref.
+    comet.CmdIndex), not shorthand commands and not existing files or
+    directories (ref. Intrp.execute()). The fragments of the tokens the
+    lexer keeps from the previous line are reused, unless the command index
+    has changed since.
+    """
+    def __init__(self, cmdIdx: comet.CmdIndex) -> None:
+        self.cmdIdx  = cmdIdx
+        self.lexer   = par.Lexer()
+        self.version = -1
+        self.frags   : ptf.StyleAndTextTuples = []
+        # Index of the first fragment of each token
+        self.firsts  : list[int] = []
+
+    def _found(self, cmd: str) -> bool:
+        """
+        > param cmd: The command name, as typed
+        > return: Whether the command would be found
+        """
+        cmd = par.unescPartial(cmd)[0]
+        return cmd in self.cmdIdx or cmd.startswith(('!', '?')) \
+            or os.path.exists(cmd)
+
+    def lex_document(self, document: ptd.Document) \
+            -> ty.Callable[[int], ptf.StyleAndTextTuples]:
+        text   = document.text
+        frags  = self.frags
+        firsts = self.firsts
+        found  = {}
+        self.cmdIdx.refresh()
+        tokens = self.lexer.lex(text)
+        kept   = self.lexer.kept if self.version == self.cmdIdx.version else 0
+        self.version = self.cmdIdx.version
+
+        del frags[firsts[kept] if kept < len(firsts) else len(frags):]
+        del firsts[kept:]
+        pos = tokens[kept - 1][1] if kept else 0
+        for i in range(kept, len(tokens)):
+            start, end, kind = tokens[i]
+            firsts.append(len(frags))
+            if start > pos:
+                frags.append(('', text[pos:start]))
+            if kind == "cmd":
+                cmd = text[start:end]
+                if cmd not in found:
+                    found[cmd] = self._found(cmd)
+                kind = "cmd" if found[cmd] else "badcmd"
+            frags.append(("class:" + kind, text[start:end]))
+            pos = end
+        frags = frags + [('', text[pos:])] if pos < len(text) else frags[:]
+
+        lines = list(ptf.split_lines(frags)) if '\n' in text else [frags]
+        return lambda lineNo: lines[lineNo] if lineNo < len(lines) else []
+
+
+def prmptCmpl(intrp: comet.Intrp, prompt: str,
+              onUpdate: ty.Callable[[], None] = lambda: None) \
+        -> list[str | tuple[str, ty.Callable[[], str]]]:
+    """
+    Compiles the raw prompt string once, into static strings and the
+    dynamic prompt codes. Adjacent static strings are merged, so that
+    rendering the prompt only has to evaluate the dynamic codes. Codes in
+    the promptasync setting are computed asynchronously (ref. AsyncSeg).
+    > param intrp: The interpreter object
+    > param prompt: The raw prompt string
+    > param onUpdate: Called when an asynchronous code resolves
+    > return: List of static strings and tuples of prompt code and callable
+    """
+    segs   : list[str | tuple[str, ty.Callable[[], str]]]
+    statics: list[str]
+    dynamic = {
+        'e': lambda: 'x' if intrp.err else '.',
+        'p': lambda: intrp.path
+    }
+    static  = {'n': '\n', 's': ' ', 'v': winVer(), '%': '%'}
+    async_  = set((intrp.settings.get("promptasync") or '').lower())
+    segs    = []
+    statics = []
+    i       = 0
+    len_    = len(prompt)
+
+    while i < len_:
+        code = prompt[i + 1].lower() if i < len_ - 1 else ''
+        if prompt[i] != '%' or not code \
+                or code not in "cdenopstuvw0123456789%":
+            statics.append(prompt[i])
+            i += 1
+            continue
 
-        retStr += toAdd
-        i      += skip
+        seg = comm.PROMPTCODES.get(code, dynamic.get(code, static.get(code)))
+        if callable(seg) and code in async_:
+            seg = AsyncSeg(code, seg, comm.PROMPTASYNCTTL,
+                           comm.PROMPTASYNCTOUT, onUpdate)
+        if callable(seg):
+            if statics:
+                segs.append(''.join(statics))
+                statics = []
+            segs.append((code, seg))
+        else:
+            statics.append(seg)
+        i += 2
+
+    if statics:
+        segs.append(''.join(statics))
+    return segs
+
+
+def prmptUpdtr(segs: list[str | tuple[str, ty.Callable[[], str]]]) -> str:
+    """
+    Renders the Clash dynamic prompt.
+    > param segs: The compiled prompt (ref. prmptCmpl())
+    > return: The updated prompt string
+    """
+    parts = []
+    for seg in segs:
+        if isinstance(seg, str):
+            parts.append(seg)
+            continue
 
-    # Edge case (literally too): One char is left at end, i.e. two chars were
-    # to be substituted and one char was left at end.
-    if i == len_ - 1:
-        retStr += prompt[i]
+        code, func = seg
+        try:
+            parts.append(func())
+        except Exception:
+            comm.WARN(f"Prompt code %{code} or %{code.upper()} failed",
+                      raiser='c')
+            parts.append("[FAIL]")
 
-    return retStr
+    return ''.join(parts)
 
 
 def main() -> None:
@@ -140,6 +749,9 @@ def main() -> None:
     Handles fatal errors, and logs them to a file before exiting.
     Refer to src\\errCodes.txt for the error codes returned by the interpreter.
     """
+    # Kept across reincarnations
+    hist = HistStore(comm.HISTFL, comm.HISTTMP)
+
     # Reincarnation loop: Restart interpreter on SIGREINCARNATE
     while True:
         if not comm.ANSIOK():
@@ -158,8 +770,24 @@ def main() -> None:
             )
             parser.setIntrp(intrp)
 
-            prompt  = intrp.settings.get("prompt", comm.DFLTSETT["prompt"])
-            session = pt.PromptSession()
+            prompt  = Prmpt(intrp, intrp.settings.get(
+                "prompt", comm.DFLTSETT["prompt"]
+            ))
+            cmdIdx  = comet.CmdIndex(intrp)
+            session = pt.PromptSession(history=hist,
+                                       auto_suggest=pta.ThreadedAutoSuggest(
+                                           HistSuggest(hist)
+                                       ),
+                                       completer=ptc.ThreadedCompleter(
+                                           CmdCompleter(cmdIdx)
+                                       ),
+                                       complete_while_typing=False,
+                                       lexer=CmdLexer(cmdIdx),
+                                       style=pts.Style.from_dict(
+                                           comm.LEXSTYLE
+                                       ),
+                                       key_bindings=histBindings(hist))
+            prompt.app = session.app
 
         except Exception as e:
             comm.ERR("Fatal error; could not initialise the interpreter; see "
@@ -172,7 +800,9 @@ def main() -> None:
         try:
             while True:
                 try:
-                    inpLn = session.prompt(pt.ANSI(prmptUpdtr(intrp, prompt)))
+                    intrp.idle()
+                    prompt.render()
+                    inpLn = session.prompt(prompt)
                     code  = intrp.execute(inpLn)
                     intrp.setErrCode(code)
 
@@ -184,10 +814,12 @@ def main() -> None:
                     raise comm.SIGREINCARNATE()
 
         except EOFError:
+            intrp.writers.sync()
             print(f"{comm.ANSIGREEN}Bye{comm.ANSIRESET}")
             sys.exit(0)
 
         except comm.SIGREINCARNATE:
+            intrp.writers.sync()
             continue
         
         except KeyboardInterrupt: